@@ -0,0 +1,60 @@
+"""
+Measure memory used by netlist of generated design and peak of memory
+during its synthesis
+
+usage: python benchmarks/netlistMemory.py [number of registers]
+"""
+import sys
+import tracemalloc
+
+from hwt.code import If
+from hwt.hdl.types.bits import Bits
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
+
+
+def memoryBenchmark(size=10000):
+    """
+    Measure memory used by netlist of generated design
+    (chain of size registers with if-elif-else logic)
+    and peak of memory during its synthesis
+    """
+    tracemalloc.start()
+    n = RtlNetlist()
+    t = Bits(8)
+    clk = n.sig("clk")
+    en = n.sig("en")
+    a = n.sig("a", t)
+    prev = a
+    for i in range(size):
+        r = n.sig("r%d" % i, t, clk=clk, defVal=0)
+        If(en & prev[0],
+           r(prev + a)
+        ).Elif(prev._eq(a),
+           r((prev ^ a) & r)
+        ).Else(
+           r(r - 1)
+        )
+        prev = r
+    o = n.sig("o", t)
+    o(prev)
+
+    netlistMem = tracemalloc.get_traced_memory()[0]
+    sigCnt = len(n.signals)
+    stmCnt = len(n.statements)
+    tracemalloc.reset_peak()
+    n.synthesize("memoryBenchmark", [clk, en, a, o], DummyPlatform())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print("%d signals, %d statements" % (sigCnt, stmCnt))
+    print("netlist          %8.1f MB (%d B per signal)" % (
+        netlistMem / 1e6, netlistMem // sigCnt))
+    print("synthesis peak   %8.1f MB" % (peak / 1e6))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        memoryBenchmark(int(sys.argv[1]))
+    else:
+        memoryBenchmark()
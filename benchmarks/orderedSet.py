@@ -0,0 +1,62 @@
+"""
+Compare OrderedSet with UniqList on operations used by netlist and simulator
+
+usage: python benchmarks/orderedSet.py
+"""
+from timeit import timeit
+
+from hwt.pyUtils.orderedSet import OrderedSet
+from hwt.pyUtils.uniqList import UniqList
+
+
+def benchmark(n=100000, repeat=3):
+    """
+    Compare OrderedSet with UniqList on operations used by netlist
+    and simulator
+    """
+    items = [object() for _ in range(n)]
+    small = items[:16]
+
+    def fill(cls):
+        c = cls()
+        for i in items:
+            c.append(i)
+        return c
+
+    # removal from UniqList is O(n), use smaller number of items for it
+    toRemove = items[:n // 10]
+
+    def removeAll(cls):
+        c = cls(toRemove)
+        for i in reversed(toRemove):
+            c.discard(i)
+
+    def queue(cls):
+        # delta steps of simulator, fill small queue, iterate and reset it
+        c = cls()
+        for _ in range(n // len(small)):
+            for i in small:
+                c.append(i)
+            for _ in c:
+                pass
+            c.clear()
+
+    def contains(cls):
+        c = cls(small)
+        for i in items:
+            i in c
+
+    print("%-12s %12s %12s" % ("", "UniqList", "OrderedSet"))
+    for name, fn in [("append", fill),
+                     ("remove", removeAll),
+                     ("queue", queue),
+                     ("contains", contains)]:
+        res = []
+        for cls in (UniqList, OrderedSet):
+            res.append(min(timeit(lambda: fn(cls), number=1)
+                           for _ in range(repeat)))
+        print("%-12s %11.4fs %11.4fs" % (name, res[0], res[1]))
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,32 @@
+"""
+Measure import time of modules which use serializers
+(serializers and their templates are loaded lazily)
+
+usage: python benchmarks/serializerImportTime.py
+"""
+import subprocess
+import sys
+
+
+def importTimeBenchmark(modules=("hwt.synthesizer.utils",
+                                 "hwt.simulator.shortcuts",
+                                 "hwt.simulator.simTestCase",
+                                 "hwt.serializer.vhdl.serializer",
+                                 "hwt.serializer.simModel.serializer"),
+                        repeat=5):
+    """
+    Measure time of import of modules (each in new python process)
+    and print min time for each of them
+    """
+    code = ("import time; t = time.perf_counter(); import %s;"
+            " print(time.perf_counter() - t)")
+    for m in modules:
+        times = []
+        for _ in range(repeat):
+            out = subprocess.check_output([sys.executable, "-c", code % m])
+            times.append(float(out))
+        print("%-40s %8.1f ms" % (m, min(times) * 1e3))
+
+
+if __name__ == "__main__":
+    importTimeBenchmark()
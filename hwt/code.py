@@ -29,6 +29,7 @@ class If(IfContainer):
     :ivar _now_is_event_dependent: flag if current scope of if is event dependent
         (is used to mark statements as event dependent)
     """
+    __slots__ = []
 
     def __init__(self, cond, *statements):
         """
@@ -87,6 +88,7 @@ class Switch(SwitchContainer):
     """
     Switch statement generator
     """
+    __slots__ = []
 
     def __init__(self, switchOn):
         switchOn = _intfToSig(switchOn)
@@ -246,6 +248,7 @@ class FsmBuilder(Switch):
     """
     :ivar stateReg: register with state
     """
+    __slots__ = ["stateReg"]
 
     def __init__(self, parent, stateT, stateRegName="st"):
         """
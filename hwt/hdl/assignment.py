@@ -20,6 +20,7 @@ class Assignment(HdlStatement):
     :ivar _instId: internaly used only for intuitive sorting of statements
     """
     __instCntr = 0
+    __slots__ = ["src", "dst", "indexes", "_instId"]
 
     def __init__(self, src, dst, indexes=None, virtualOnly=False,
                  parentStm=None,
@@ -5,6 +5,7 @@ class HdlObject():
     Base Hdl object class for object which can be directly serialized
     to target HDL language
     """
+    __slots__ = []
 
     def __repr__(self):
         from hwt.serializer.hwt.serializer import HwtSerializer
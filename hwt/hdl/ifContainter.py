@@ -23,6 +23,9 @@ class IfContainer(HdlStatement):
     :ivar _elIfs_enclosed_for: list of sets of enclosed signals for each elif
     :ivar _ifFalse_enclosed_for: set of enclosed signals for ifFalse branch
     """
+    __slots__ = ["cond", "ifTrue", "elIfs", "ifFalse",
+                 "_ifTrue_enclosed_for", "_elIfs_enclosed_for",
+                 "_ifFalse_enclosed_for"]
 
     def __init__(self, cond, ifTrue=None, ifFalse=None, elIfs=None,
                  parentStm=None, is_completly_event_dependent=False):
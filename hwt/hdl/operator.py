@@ -1,7 +1,7 @@
 from typing import Generator, Union
 
 from hwt.hdl.hdlObject import HdlObject
-from hwt.hdl.operatorDefs import isEventDependentOp
+from hwt.hdl.operatorDefs import isEventDependentOp, isCommutativeOp
 from hwt.hdl.sensitivityCtx import SensitivityCtx
 from hwt.hdl.value import Value
 from hwt.pyUtils.arrayQuery import arr_all
@@ -18,6 +18,23 @@ def getCtxFromOps(operands):
                     "(value operators should be already resolved)")
 
 
+@internal
+def _operandKey(o):
+    """
+    :return: key of operand for hash-consing of operators,
+        signals are compared by identity, values by type and value
+    """
+    if isinstance(o, Value):
+        v = o.val
+        if isinstance(v, tuple):
+            # slice
+            v = tuple(map(_operandKey, v))
+        return (o._dtype, v, o.vldMask)
+    else:
+        # signals use hash and equality of object
+        return o
+
+
 def isConst(item):
     """
     :return: True if expression is constant
@@ -34,6 +51,7 @@ class Operator(HdlObject):
     :ivar operator: OpDefinition instance
     :ivar result: result signal of this operator
     """
+    __slots__ = ["operands", "operator", "result"]
 
     def __init__(self, operator, operands):
         self.operands = tuple(operands)
@@ -59,12 +77,17 @@ class Operator(HdlObject):
                     " only signal or values got:%r" % (o))
 
     @internal
-    def staticEval(self):
+    def staticEval(self, _epoch=None):
         """
         Recursively statistically evaluate result of this operator
+
+        :param _epoch: epoch of evaluation (see RtlSignal.staticEval)
         """
+        if _epoch is None:
+            _epoch = RtlSignal._nextStaticEvalEpoch()
         for o in self.operands:
-            o.staticEval()
+            if not isinstance(o, Value):
+                o.staticEval(_epoch)
         self.result._val = self.evalFn()
     
     @internal
@@ -109,14 +132,36 @@ class Operator(HdlObject):
     @staticmethod
     def withRes(opDef, operands, resT, outputs=[]):
         """
-        Create operator with result signal
+        Create operator with result signal, if structurally same operator
+        already exists in netlist of operands its result is returned instead
+        (commutative operators are matched regardless of order of operands)
 
         :ivar resT: data type of result signal
         :ivar outputs: iterable of singnals which are outputs
             from this operator
         """
+        ctx = getCtxFromOps(operands)
+        if ctx is None or outputs:
+            opCache = None
+        else:
+            # structurally same operator may already exist in netlist
+            opCache = ctx._opCache
+            try:
+                k = [_operandKey(o) for o in operands]
+                if isCommutativeOp(opDef):
+                    k.sort(key=hash)
+                k = (opDef, resT, *k)
+                out = opCache.get(k, None)
+            except TypeError:
+                # value of operand is not hashable (e.g. array value)
+                opCache = None
+            else:
+                if out is not None:
+                    ctx.sharedOpCnt += 1
+                    return out
+
         op = Operator(opDef, operands)
-        out = RtlSignal(getCtxFromOps(operands), None, resT)
+        out = RtlSignal(ctx, None, resT)
         out._const = arr_all(op.operands, isConst)
         out.drivers.append(op)
         out.origin = op
@@ -124,6 +169,8 @@ class Operator(HdlObject):
         op.registerSignals(outputs)
         if out._const:
             out.staticEval()
+        if opCache is not None:
+            opCache[k] = out
         return out
     
     @internal
@@ -51,6 +51,12 @@ def isEventDependentOp(operator):
     return operator in (AllOps.RISING_EDGE, AllOps.FALLING_EDGE)
 
 
+def isCommutativeOp(operator):
+    return operator in (AllOps.AND, AllOps.OR, AllOps.XOR,
+                        AllOps.ADD, AllOps.MUL,
+                        AllOps.EQ, AllOps.NEQ)
+
+
 def onRisingEdgeFn(a, now):
     return a._onRisingEdge(now)
 
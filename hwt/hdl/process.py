@@ -1,7 +1,7 @@
 from typing import List, Set
 
 from hwt.hdl.hdlObject import HdlObject
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 
 
 class HWProcess(HdlObject):
@@ -24,7 +24,7 @@ class HWProcess(HdlObject):
 
     def __init__(self, name: str, statements: List['HdlStatement'],
                  sensitivityList: Set["RtlSignal"],
-                 inputs: UniqList, outputs: UniqList):
+                 inputs: OrderedSet, outputs: OrderedSet):
         self.name = name
         self.statements = statements
         self.sensitivityList = sensitivityList
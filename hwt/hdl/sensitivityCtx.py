@@ -1,26 +1,27 @@
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 from hwt.doc_markers import internal
 
 
-class SensitivityCtx(UniqList):
+class SensitivityCtx(OrderedSet):
     """
     Sensitivity list used for resolution of sensitivity for statements nad HWProcess instances
     
     :ivar contains_ev_dependency: True if this contains event dependent
         sensitivity
     """
+    __slots__ = ["contains_ev_dependency"]
 
     def __init__(self, initSeq=None):
-        UniqList.__init__(self, initSeq=initSeq)
+        OrderedSet.__init__(self, initSeq=initSeq)
         self.contains_ev_dependency = False
 
     @internal
     def extend(self, items):
-        UniqList.extend(self, items)
+        OrderedSet.extend(self, items)
         if isinstance(items, SensitivityCtx):
             self.contains_ev_dependency |= items.contains_ev_dependency
 
     @internal
     def clear(self):
-        UniqList.clear(self)
+        OrderedSet.clear(self)
         self.contains_ev_dependency = False
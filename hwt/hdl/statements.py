@@ -5,7 +5,7 @@ from hwt.hdl.hdlObject import HdlObject
 from hwt.hdl.sensitivityCtx import SensitivityCtx
 from hwt.hdl.value import Value
 from hwt.pyUtils.arrayQuery import flatten, groupedby
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 from hwt.synthesizer.rtlLevel.mainBases import RtlSignalBase
 from hwt.doc_markers import internal
 
@@ -26,23 +26,26 @@ class HdlStatement(HdlObject):
          any cobinational statement
     :ivar _now_is_event_dependent: statement is event (clk) dependent
     :ivar parentStm: parent isnstance of HdlStatement or None
-    :ivar _inputs: UniqList of input signals for this statement
-    :ivar _outputs: UniqList of output signals for this statement
-    :ivar _sensitivity: UniqList of input signals
+    :ivar _inputs: OrderedSet of input signals for this statement
+    :ivar _outputs: OrderedSet of output signals for this statement
+    :ivar _sensitivity: SensitivityCtx of input signals
         or (rising/falling) operator
     :ivar _enclosed_for: set of outputs for which this statement is enclosed
         (for which there is not any unused branch)
     :ivar rank: number of used branches in statement, used as prefilter
         for statement comparing
     """
+    __slots__ = ["_is_completly_event_dependent", "_now_is_event_dependent",
+                 "parentStm", "_inputs", "_outputs", "_enclosed_for",
+                 "_sensitivity", "rank"]
 
     def __init__(self, parentStm=None, sensitivity=None,
                  is_completly_event_dependent=False):
         self._is_completly_event_dependent = is_completly_event_dependent
         self._now_is_event_dependent = is_completly_event_dependent
         self.parentStm = parentStm
-        self._inputs = UniqList()
-        self._outputs = UniqList()
+        self._inputs = OrderedSet()
+        self._outputs = OrderedSet()
         self._enclosed_for = None
 
         self._sensitivity = sensitivity
@@ -237,8 +240,8 @@ class HdlStatement(HdlObject):
         else:
             # parent has to update it's inputs/outputs
             if io_changed:
-                self._inputs = UniqList()
-                self._outputs = UniqList()
+                self._inputs = OrderedSet()
+                self._outputs = OrderedSet()
                 self._collect_io()
 
     @internal
@@ -24,6 +24,8 @@ class SwitchContainer(HdlStatement):
     :ivar _case_enclosed_for: list of sets of enclosed signal for each case branch
     :ivar _default_enclosed_for: set of enclosed signals for branch default
     """
+    __slots__ = ["switchOn", "cases", "default", "_case_value_index",
+                 "_case_enclosed_for", "_default_enclosed_for"]
 
     def __init__(self, switchOn: RtlSignal,
                  cases: List[Tuple[Value, List[HdlStatement]]],
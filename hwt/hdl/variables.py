@@ -7,6 +7,7 @@ class SignalItem(HdlObject):
     """
     basic hdl signal used to design circuits
     """
+    __slots__ = ["name", "_dtype", "virtualOnly", "defVal", "_val", "_oldVal"]
 
     def __init__(self, name, dtype, defVal=None, virtualOnly=False):
         """
@@ -5,6 +5,7 @@ class WaitStm(HdlStatement):
     """
     Structural container of wait statemnet for hdl rendering
     """
+    __slots__ = ["isTimeWait", "waitForWhat"]
 
     def __init__(self, waitForWhat):
         self.isTimeWait = isinstance(waitForWhat, int)
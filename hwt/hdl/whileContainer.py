@@ -6,6 +6,7 @@ class WhileContainer(HdlStatement):
     """
     Structural container of while statement for hdl rendering
     """
+    __slots__ = ["cond", "body"]
 
     def __init__(self, cond, body):
         self.cond = cond
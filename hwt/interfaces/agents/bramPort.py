@@ -48,10 +48,7 @@ class BramPort_withoutClkAgent(SyncAgentBase):
             raise NotImplementedError(rw)
 
         intf = self.intf
-        w = sim.write
-        w(rw, intf.we)
-        w(addr, intf.addr)
-        w(wdata, intf.din)
+        sim.writeMany((rw, addr, wdata), (intf.we, intf.addr, intf.din))
 
     def onReadReq(self, sim, addr):
         """
@@ -66,9 +63,10 @@ class BramPort_withoutClkAgent(SyncAgentBase):
         self.requests.append((WRITE, addr, data))
 
     def monitor(self, sim):
-        intf = self.intf
+        sim.callOnCombUpdate(self.monitorOnCombUpdate)
 
-        yield sim.waitOnCombUpdate()
+    def monitorOnCombUpdate(self, sim):
+        intf = self.intf
         # now we are after clk edge
         if self.notReset(sim):
             en = sim.read(intf.en)
@@ -98,37 +96,36 @@ class BramPort_withoutClkAgent(SyncAgentBase):
 
     def driver(self, sim):
         intf = self.intf
-        w = sim.write
+        w = sim.writeMany
+        en_we = (intf.en, intf.we)
         if self.requireInit:
-            w(0, intf.en)
-            w(0, intf.we)
+            w((0, 0), en_we)
             self.requireInit = False
 
-#        yield s.wait(2000)
         readPending = self.readPending
         if self.requests and self.notReset(sim):
             req = self.requests.popleft()
             if req is NOP:
-                w(0, intf.en)
-                w(0, intf.we)
+                w((0, 0), en_we)
                 self.readPending = False
             else:
                 self.doReq(sim, req)
-                w(1, intf.en)
+                sim.write(1, intf.en)
         else:
-            w(0, intf.en)
-            w(0, intf.we)
+            w((0, 0), en_we)
             self.readPending = False
 
         if readPending:
-            yield sim.waitOnCombUpdate()
-            # now we are after clk edge
-            d = sim.read(intf.dout)
-            self.readed.append(d)
-            if self._debugOutput is not None:
-                self._debugOutput.write("%s, on %r read_data: %d\n" % (
-                                        self.intf._getFullName(),
-                                        sim.now, d.val))
+            sim.callOnCombUpdate(self.driverOnCombUpdate)
+
+    def driverOnCombUpdate(self, sim):
+        # now we are after clk edge
+        d = sim.read(self.intf.dout)
+        self.readed.append(d)
+        if self._debugOutput is not None:
+            self._debugOutput.write("%s, on %r read_data: %d\n" % (
+                                    self.intf._getFullName(),
+                                    sim.now, d.val))
 
 
 class BramPortAgent(BramPort_withoutClkAgent):
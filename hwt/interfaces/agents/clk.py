@@ -24,16 +24,11 @@ class OscilatorAgent(AgentBase):
         self.monitor = CallbackLoop(self.intf, self.monitor, self.getEnable)
 
     def driver(self, sim):
-        sig = self.intf
-        sim.write(0, sig)
-        halfPeriod = self.period / 2
-        yield sim.wait(self.initWait)
-
-        while True:
-            yield sim.wait(halfPeriod)
-            sim.write(1, sig)
-            yield sim.wait(halfPeriod)
-            sim.write(0, sig)
+        # clock is driven by ClockDomain of simulator (edge to edge,
+        # all clocks with same period in single event)
+        sim.addClk(self.intf, self.period, self.initWait)
+        return
+        yield
 
     def getMonitors(self):
         self.last = (-1, None)
@@ -42,7 +37,9 @@ class OscilatorAgent(AgentBase):
         return [self.monitor]
 
     def monitor(self, sim):
-        yield sim.waitOnCombUpdate()
+        sim.callOnCombUpdate(self.monitorOnCombUpdate)
+
+    def monitorOnCombUpdate(self, sim):
         v = sim.read(self.intf)
         if not v.vldMask:
             v = None
@@ -1,5 +1,6 @@
 from collections import deque
 
+from hwt.doc_markers import internal
 from hwt.simulator.agentBase import SyncAgentBase
 from hwt.simulator.shortcuts import OnRisingCallbackLoop
 from hwt.interfaces.agents.signal import DEFAULT_CLOCK
@@ -8,6 +9,10 @@ from hwt.interfaces.agents.signal import DEFAULT_CLOCK
 class FifoReaderAgent(SyncAgentBase):
     """
     Simulation agent for FifoReader interface
+
+    :note: monitor/driver are plain callbacks called on clk edge
+        (not generators, see :class:`SyncAgentBase`), dataWriter
+        is a generator because it has to wait for time
     """
 
     def __init__(self, intf, allowNoReset=False):
@@ -47,12 +52,14 @@ class FifoReaderAgent(SyncAgentBase):
 
     def dataReader(self, sim):
         if self.readPending:
-            yield sim.waitOnCombUpdate()
-            d = sim.read(self.intf.data)
-            self.data.append(d)
+            sim.callOnCombUpdate(self.dataReaderOnCombUpdate)
+
+    def dataReaderOnCombUpdate(self, sim):
+        d = sim.read(self.intf.data)
+        self.data.append(d)
 
-            if self.readPending_invalidate:
-                self.readPending = False
+        if self.readPending_invalidate:
+            self.readPending = False
 
     def getMonitors(self):
         self.dataReader = OnRisingCallbackLoop(self.clk,
@@ -63,21 +70,19 @@ class FifoReaderAgent(SyncAgentBase):
                 [self.dataReader])
 
     def monitor(self, sim):
-        intf = self.intf
-        r = sim.read
-
         if self.notReset(sim):
             # speculative en set
-            yield sim.waitOnCombUpdate()
-            wait = r(intf.wait)
-            assert wait.vldMask, (sim.now, intf, "wait signal in invalid state")
-            rd = not wait.val
-            sim.write(rd, intf.en)
-
+            sim.callOnCombUpdate(self.monitorOnCombUpdate)
         else:
-            sim.write(0, intf.en)
-            rd = False
+            sim.write(0, self.intf.en)
+            self.readPending = False
 
+    def monitorOnCombUpdate(self, sim):
+        intf = self.intf
+        wait = sim.read(intf.wait)
+        assert wait.vldMask, (sim.now, intf, "wait signal in invalid state")
+        rd = not wait.val
+        sim.write(rd, intf.en)
         self.readPending = rd
 
     def getDrivers(self):
@@ -114,21 +119,28 @@ class FifoReaderAgent(SyncAgentBase):
         w(wait, intf.wait)
 
         if rst_n:
-            yield sim.waitOnCombUpdate()
-            # wait for potential update of en
-            yield sim.waitOnCombUpdate()
-            # check if write can be performed and if it possible do real write
+            sim.callOnCombUpdate(self.driverOnCombUpdate)
+
+    def driverOnCombUpdate(self, sim):
+        # wait for potential update of en
+        sim.callOnCombUpdate(self.driverOnEnUpdate)
 
-            en = sim.read(intf.en)
-            assert en.vldMask, (sim.now, intf, "en signal in invalid state")
-            if en.val:
-                assert self.data, (sim.now, intf, "underflow")
-                self.lastData = self.data.popleft()
+    def driverOnEnUpdate(self, sim):
+        # check if write can be performed and if it possible do real write
+        intf = self.intf
+        en = sim.read(intf.en)
+        assert en.vldMask, (sim.now, intf, "en signal in invalid state")
+        if en.val:
+            assert self.data, (sim.now, intf, "underflow")
+            self.lastData = self.data.popleft()
 
 
 class FifoWriterAgent(SyncAgentBase):
     """
     Simulation agent for FifoWriter interface
+
+    :note: driver is a plain callback called on clk edge
+        (not generator, see :class:`SyncAgentBase`)
     """
 
     def __init__(self, intf, allowNoReset=False):
@@ -156,6 +168,7 @@ class FifoWriterAgent(SyncAgentBase):
     def monitor(self, sim):
         # set wait signal
         # if en == 1 take data
+        # (generator because of the delay before read of data)
         intf = self.intf
         sim.write(0, intf.wait)
 
@@ -171,22 +184,25 @@ class FifoWriterAgent(SyncAgentBase):
 
     def driver(self, sim):
         # if wait == 0 set en=1 and set data
+        if self.notReset(sim) and self.data:
+            sim.callOnCombUpdate(self.driverOnCombUpdate)
+        else:
+            self._writeNoData(sim)
+
+    def driverOnCombUpdate(self, sim):
         intf = self.intf
-        w = sim.write
+        wait = sim.read(intf.wait)
+        assert wait.vldMask, (sim.now, intf, "wait signal in invalid state")
+        if wait.val:
+            self._writeNoData(sim)
+        else:
+            d = self.data.popleft()
+            sim.writeMany((d, 1), (intf.data, intf.en))
 
-        if self.notReset(sim) and self.data:
-            yield sim.waitOnCombUpdate()
-
-            wait = sim.read(intf.wait)
-            assert wait.vldMask, (sim.now, intf, "wait signal in invalid state")
-            if not wait.val:
-                d = self.data.popleft()
-                w(d, intf.data)
-                w(1, intf.en)
-                return
-
-        w(None, intf.data)
-        w(0, intf.en)
+    @internal
+    def _writeNoData(self, sim):
+        intf = self.intf
+        sim.writeMany((None, 0), (intf.data, intf.en))
 
     def getDrivers(self):
         return SyncAgentBase.getDrivers(self) + [self.driver_init]
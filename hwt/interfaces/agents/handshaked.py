@@ -13,6 +13,14 @@ class HandshakedAgent(SyncAgentBase):
 
     :attention: requires clk and rst/rstn signal
         (if you do not have any create simulation wrapper with it)
+    :note: data can be replaced by
+        :class:`hwt.simulator.agentArrayData.AgentArrayData`
+        for large amounts of data (words are stored in numpy arrays)
+    :note: monitor/driver are callbacks called on clk edge,
+        monitorOnCombUpdate/driverOnCombUpdate are called after
+        combinational update in the same time
+    :attention: monitor/driver/checkIfRdWillBeValid are not generators,
+        they can not be used in yield from (see :class:`SyncAgentBase`)
     """
 
     def __init__(self, intf, allowNoReset=False):
@@ -74,7 +82,6 @@ class HandshakedAgent(SyncAgentBase):
         """
         Collect data from interface
         """
-        r = sim.read
         if self.notReset(sim):
             # update rd signal only if required
             if self._lastRd is not 1:
@@ -91,28 +98,30 @@ class HandshakedAgent(SyncAgentBase):
                     onMonitorReady(sim)
 
             # wait for response of master
-            yield sim.waitOnCombUpdate()
-            vld = self.isVld(r)
-            assert vld.vldMask, (sim.now, self.intf,
-                                 "vld signal is in invalid state")
-
-            if vld.val:
-                # master responded with positive ack, do read data
-                d = self.doRead(sim)
-                if self._debugOutput is not None:
-                    self._debugOutput.write(
-                        "%s, read, %d: %r\n" % (
-                            self.intf._getFullName(),
-                            sim.now, d))
-                self.data.append(d)
-                if self._afterRead is not None:
-                    self._afterRead(sim)
+            sim.callOnCombUpdate(self.monitorOnCombUpdate)
         else:
             if self._lastRd is not 0:
                 # can not receive, say it to masters
                 self.wrRd(sim.write, 0)
                 self._lastRd = 0
 
+    def monitorOnCombUpdate(self, sim):
+        vld = self.isVld(sim.read)
+        assert vld.vldMask, (sim.now, self.intf,
+                             "vld signal is in invalid state")
+
+        if vld.val:
+            # master responded with positive ack, do read data
+            d = self.doRead(sim)
+            if self._debugOutput is not None:
+                self._debugOutput.write(
+                    "%s, read, %d: %r\n" % (
+                        self.intf._getFullName(),
+                        sim.now, d))
+            self.data.append(d)
+            if self._afterRead is not None:
+                self._afterRead(sim)
+
     def doRead(self, sim):
         """extract data from interface"""
         return sim.read(self.intf.data)
@@ -122,7 +131,6 @@ class HandshakedAgent(SyncAgentBase):
         sim.write(data, self.intf.data)
 
     def checkIfRdWillBeValid(self, sim):
-        yield sim.waitOnCombUpdate()
         rd = self.isRd(sim.read)
         assert rd.vldMask, (sim.now, self.intf, "rd signal in invalid state")
 
@@ -132,8 +140,6 @@ class HandshakedAgent(SyncAgentBase):
 
         set vld high and wait on rd in high then pass new data
         """
-        r = sim.read
-
         # pop new data if there are not any pending
         if self.actualData is NOP and self.data:
             self.actualData = self.data.popleft()
@@ -154,20 +160,18 @@ class HandshakedAgent(SyncAgentBase):
             self.wrVld(sim.write, vld)
             self._lastVld = vld
 
-        if not self._enabled:
-            # we can not check rd it in this function because we can not wait
-            # because we can be reactivated in this same time
-            sim.add_process(self.checkIfRdWillBeValid(sim))
-            return
-
-        # wait of response of slave
-        yield sim.waitOnCombUpdate()
+        if vld and self._enabled:
+            # wait of response of slave
+            sim.callOnCombUpdate(self.driverOnCombUpdate)
+        else:
+            # rd is only checked (if agent is disabled it can be
+            # reactivated in this same time)
+            sim.callOnCombUpdate(self.checkIfRdWillBeValid)
 
-        rd = self.isRd(r)
+    def driverOnCombUpdate(self, sim):
+        rd = self.isRd(sim.read)
         assert rd.vldMask, (sim.now, self.intf,
                             "rd signal in invalid state")
-        if not vld:
-            return
 
         if rd.val:
             # slave did read data, take new one
@@ -7,6 +7,9 @@ from hwt.simulator.agentBase import SyncAgentBase
 class RdSyncedAgent(SyncAgentBase):
     """
     Simulation/verification agent for RdSynced interface
+
+    :note: monitor/driver are plain callbacks called on clk edge
+        (not generators, see :class:`SyncAgentBase`)
     """
     def __init__(self, intf, allowNoReset=True):
         super().__init__(intf, allowNoReset=allowNoReset)
@@ -32,14 +35,14 @@ class RdSyncedAgent(SyncAgentBase):
         """Collect data from interface"""
         if self.notReset(sim) and self._enabled:
             self.wrRd(sim.write, 1)
-
-            yield sim.waitOnCombUpdate()
-
-            d = self.doRead(sim)
-            self.data.append(d)
+            sim.callOnCombUpdate(self.monitorOnCombUpdate)
         else:
             self.wrRd(sim.write, 0)
 
+    def monitorOnCombUpdate(self, sim):
+        d = self.doRead(sim)
+        self.data.append(d)
+
     def doRead(self, sim):
         """extract data from interface"""
         return sim.read(self.intf.data)
@@ -50,7 +53,6 @@ class RdSyncedAgent(SyncAgentBase):
 
     def driver(self, sim):
         """Push data to interface"""
-        r = sim.read
         if self.actualData is NOP and self.data:
             self.actualData = self.data.popleft()
 
@@ -62,17 +64,15 @@ class RdSyncedAgent(SyncAgentBase):
             self.doWrite(sim, None)
 
         en = self.notReset(sim) and self._enabled
-        if not (en and do):
-            return
-
-        yield sim.waitOnCombUpdate()
-
-        rd = self.isRd(r)
-        if en:
-            assert rd.vldMask, (
-                ("%r: ready signal for interface %r is in invalid state,"
-                 " this would cause desynchronization") %
-                (sim.now, self.intf))
+        if en and do:
+            sim.callOnCombUpdate(self.driverOnCombUpdate)
+
+    def driverOnCombUpdate(self, sim):
+        rd = self.isRd(sim.read)
+        assert rd.vldMask, (
+            ("%r: ready signal for interface %r is in invalid state,"
+             " this would cause desynchronization") %
+            (sim.now, self.intf))
         if rd.val:
             if self._debugOutput is not None:
                 self._debugOutput.write("%s, wrote, %d: %r\n" % (
@@ -37,8 +37,8 @@ class SignalAgent(SyncAgentBase):
             if self.initDelay:
                 raise NotImplementedError("initDelay only without clock")
             c = self.SELECTED_EDGE_CALLBACK
-            self.monitor = c(self.clk, self.monitor, self.getEnable)
-            self.driver = c(self.clk, self.driver, self.getEnable)
+            self.monitor = c(self.clk, self.monitorOnClk, self.getEnable)
+            self.driver = c(self.clk, self.driverOnClk, self.getEnable)
 
     def getDrivers(self):
         d = SyncAgentBase.getDrivers(self)
@@ -65,41 +65,48 @@ class SignalAgent(SyncAgentBase):
         s.write(data, self.intf)
 
     def driver(self, sim):
-        if self.clk is None:
-            if self.initPending:
-                if self.initDelay:
-                    yield sim.wait(self.initDelay)
-                self.initPending = False
-            # if clock is specified this function is periodically called every
-            # clk tick
-            while True:
-                if self._enabled and self.data and self.notReset(sim):
-                    d = self.data.popleft()
-                    self.doWrite(sim, d)
-                yield sim.wait(self.delay)
-        else:
-            # if clock is specified this function is periodically called every
-            # clk tick, when agent is enabled
-            if self.data and self.notReset(sim):
+        """
+        Driver used if there is no clk, the delay is used instead
+        """
+        if self.initPending:
+            if self.initDelay:
+                yield sim.wait(self.initDelay)
+            self.initPending = False
+        # there is no clk, we have to manage periodic call by our selfs
+        while True:
+            if self._enabled and self.data and self.notReset(sim):
                 d = self.data.popleft()
                 self.doWrite(sim, d)
+            yield sim.wait(self.delay)
+
+    def driverOnClk(self, sim):
+        # if clock is specified this function is periodically called every
+        # clk tick, when agent is enabled
+        if self.data and self.notReset(sim):
+            d = self.data.popleft()
+            self.doWrite(sim, d)
 
     def monitor(self, sim):
-        if self.clk is None:
-            if self.initPending and self.initDelay:
-                yield sim.wait(self.initDelay)
-                self.initPending = False
-            # if there is no clk, we have to manage periodic call by our selfs
-            while True:
-                if self._enabled and self.notReset(sim):
-                    yield sim.waitOnCombUpdate()
-                    d = self.doRead(sim)
-                    self.data.append(d)
-                    yield sim.wait(self.delay)
-        else:
-            # if clock is specified this function is periodically called every
-            # clk tick, when agent is enabled
-            yield sim.waitOnCombUpdate()
-            if self.notReset(sim):
+        """
+        Monitor used if there is no clk, the delay is used instead
+        """
+        if self.initPending and self.initDelay:
+            yield sim.wait(self.initDelay)
+            self.initPending = False
+        # there is no clk, we have to manage periodic call by our selfs
+        while True:
+            if self._enabled and self.notReset(sim):
+                yield sim.waitOnCombUpdate()
                 d = self.doRead(sim)
                 self.data.append(d)
+                yield sim.wait(self.delay)
+
+    def monitorOnClk(self, sim):
+        # if clock is specified this function is periodically called every
+        # clk tick, when agent is enabled
+        sim.callOnCombUpdate(self.monitorOnCombUpdate)
+
+    def monitorOnCombUpdate(self, sim):
+        if self.notReset(sim):
+            d = self.doRead(sim)
+            self.data.append(d)
@@ -49,9 +49,12 @@ class TristateAgent(AgentWitReset):
         return [self.onTWriteCallback__init]
 
     def onTWriteCallback(self, sim):
-        self.monitor(sim)
-        return
-        yield
+        """
+        Write callback of t and o signals
+
+        :return: monitor (called directly by simulator)
+        """
+        return self.monitor
 
     def _write(self, val, sim):
         if val is NOP:
@@ -72,13 +75,15 @@ class TristateAgent(AgentWitReset):
         """
         Process for injecting of this callback loop into simulator
         """
-        yield from self.onTWriteCallback(sim)
+        self.monitor(sim)
         self.intf.t._sigInside.registerWriteCallback(
             self.onTWriteCallback,
             self.getEnable)
         self.intf.o._sigInside.registerWriteCallback(
             self.onTWriteCallback,
             self.getEnable)
+        return
+        yield
 
     def driver(self, sim):
         while True:
@@ -129,8 +134,10 @@ class TristateClkAgent(TristateAgent):
                 sim.add_process(onLow(sim))
 
     def monitor(self, sim):
+        sim.callOnCombUpdate(self.monitorOnCombUpdate)
+
+    def monitorOnCombUpdate(self, sim):
         intf = self.intf
-        yield sim.waitOnCombUpdate()
         # read in pre-clock-edge
         t = sim.read(intf.t)
         o = sim.read(intf.o)
@@ -156,23 +163,3 @@ class TristateClkAgent(TristateAgent):
 
         if self.onFallingCallback and not v and (last.val or not last.vldMask):
             sim.add_process(self.onFallingCallback(sim))
-
-    def getMonitors(self):
-        return [self.onTWriteCallback__init]
-
-    def onTWriteCallback(self, sim):
-        yield from self.monitor(sim)
-        return
-        yield
-
-    def onTWriteCallback__init(self, sim):
-        """
-        Process for injecting of this callback loop into simulator
-        """
-        yield from self.onTWriteCallback(sim)
-        self.intf.t._sigInside.registerWriteCallback(
-            self.onTWriteCallback,
-            self.getEnable)
-        self.intf.o._sigInside.registerWriteCallback(
-            self.onTWriteCallback,
-            self.getEnable)
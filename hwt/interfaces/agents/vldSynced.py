@@ -5,6 +5,12 @@ from hwt.simulator.agentBase import SyncAgentBase
 
 
 class VldSyncedAgent(SyncAgentBase):
+    """
+    Simulation/verification agent for VldSynced interface
+
+    :note: monitor/driver are plain callbacks called on clk edge
+        (not generators, see :class:`SyncAgentBase`)
+    """
 
     def __init__(self, intf, allowNoReset=False):
         super(VldSyncedAgent, self).__init__(intf,
@@ -30,7 +36,9 @@ class VldSyncedAgent(SyncAgentBase):
             self._lastVld = 0
 
     def monitor(self, sim):
-        yield sim.waitOnCombUpdate()
+        sim.callOnCombUpdate(self.monitorOnCombUpdate)
+
+    def monitorOnCombUpdate(self, sim):
         if self.notReset(sim):
             intf = self.intf
             vld = self.doReadVld(sim.read)
@@ -0,0 +1,162 @@
+from hwt.doc_markers import internal
+
+
+class OrderedSet():
+    """
+    Set which keeps the insertion order of items,
+    append, membership test and removal of any item are O(1)
+
+    It has same interface as UniqList (append returns True if item was added,
+    indexing, pop...) and it is used as its replacement
+    for endpoints/drivers of signals, inputs/outputs of statements,
+    sensitivity lists and queues of simulator.
+
+    Most of these sets are empty or contain only few items,
+    because of this items are stored in tuple (shared empty tuple if empty)
+    until there are more than SMALL_SIZE of them, then dict is used.
+
+    :ivar _d: tuple of items or dict {item: None}
+    :note: indexing by other index than 0/-1 is O(n) for large set
+    """
+    __slots__ = ["_d"]
+    SMALL_SIZE = 8
+
+    def __init__(self, initSeq=None):
+        self._d = ()
+        if initSeq is not None:
+            self.extend(initSeq)
+
+    def append(self, item) -> bool:
+        """
+        :return: True if item was added, False if it was already present
+        """
+        d = self._d
+        if item in d:
+            return False
+        if d.__class__ is tuple:
+            if len(d) < self.SMALL_SIZE:
+                self._d = d + (item,)
+                return True
+            d = self._d = dict.fromkeys(d)
+        d[item] = None
+        return True
+
+    def extend(self, items):
+        # existing items keep their position
+        d = self._d
+        if d.__class__ is tuple:
+            d = dict.fromkeys(d)
+            d.update(dict.fromkeys(items))
+            if len(d) <= self.SMALL_SIZE:
+                d = tuple(d)
+            self._d = d
+        else:
+            d.update(dict.fromkeys(items))
+
+    @internal
+    def _removeAt(self, d: tuple, index: int):
+        if index == -1:
+            self._d = d[:-1]
+        else:
+            self._d = d[:index] + d[index + 1:]
+
+    def discard(self, item):
+        d = self._d
+        if d.__class__ is tuple:
+            if item in d:
+                self._removeAt(d, d.index(item))
+        else:
+            d.pop(item, None)
+
+    def remove(self, item):
+        """
+        :raise KeyError: if item is not present
+        """
+        d = self._d
+        if d.__class__ is tuple:
+            if item not in d:
+                raise KeyError(item)
+            self._removeAt(d, d.index(item))
+        else:
+            del d[item]
+
+    def pop(self, index=-1):
+        d = self._d
+        if d.__class__ is tuple:
+            try:
+                item = d[index]
+            except IndexError:
+                raise IndexError("pop from empty OrderedSet")
+            self._removeAt(d, index)
+            return item
+
+        if index == -1:
+            return d.popitem()[0]
+        item = self[index]
+        del d[item]
+        return item
+
+    def clear(self):
+        d = self._d
+        if d.__class__ is tuple:
+            self._d = ()
+        else:
+            # dict is reused as set which was large once will be probably
+            # large again (e.g. queues of simulator)
+            d.clear()
+
+    def copy(self):
+        c = self.__class__()
+        d = self._d
+        # tuple is immutable and can be shared
+        c._d = d if d.__class__ is tuple else d.copy()
+        return c
+
+    def __copy__(self):
+        return self.copy()
+
+    def _get_set(self):
+        d = self._d
+        if d.__class__ is tuple:
+            return set(d)
+        return d.keys()
+
+    def intersection_set(self, other):
+        return self._get_set() & other._get_set()
+
+    def __contains__(self, key):
+        return key in self._d
+
+    def __iter__(self):
+        return iter(self._d)
+
+    def __reversed__(self):
+        return reversed(self._d)
+
+    def __len__(self):
+        return len(self._d)
+
+    def __getitem__(self, index):
+        d = self._d
+        if d.__class__ is tuple:
+            if isinstance(index, slice):
+                return list(d[index])
+            try:
+                return d[index]
+            except IndexError:
+                raise IndexError("OrderedSet index out of range")
+
+        if isinstance(index, slice):
+            return list(d)[index]
+        try:
+            if index == 0:
+                return next(iter(d))
+            elif index == -1:
+                return next(reversed(d))
+        except StopIteration:
+            raise IndexError("OrderedSet index out of range")
+
+        return list(d)[index]
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, list(self._d))
@@ -0,0 +1,52 @@
+from hwt.doc_markers import internal
+
+
+# {template directory: jinja2 Environment}
+_environments = {}
+
+
+@internal
+def _getEnvironment(templateDir: str):
+    env = _environments.get(templateDir, None)
+    if env is None:
+        # jinja2 is imported only if some template is actually used
+        from jinja2.environment import Environment
+        from jinja2.loaders import PackageLoader
+        env = Environment(loader=PackageLoader('hwt', templateDir))
+        _environments[templateDir] = env
+    return env
+
+
+class LazyTemplate():
+    """
+    Jinja2 template which is loaded and compiled on first use
+    (and then cached), used as a class attribute of serializers
+    to avoid loading of jinja2 and templates on import
+
+    :ivar templateDir: directory of template relative to hwt package
+    :ivar name: file name of template
+    :ivar _tmpl: loaded jinja2 Template or None if not loaded yet
+    """
+    __slots__ = ["templateDir", "name", "_tmpl"]
+
+    def __init__(self, templateDir: str, name: str):
+        self.templateDir = templateDir
+        self.name = name
+        self._tmpl = None
+
+    def get(self):
+        """
+        :return: jinja2 Template
+        """
+        t = self._tmpl
+        if t is None:
+            t = self._tmpl = _getEnvironment(
+                self.templateDir).get_template(self.name)
+        return t
+
+    def render(self, *args, **kwargs) -> str:
+        return self.get().render(*args, **kwargs)
+
+    def __repr__(self):
+        return "<%s %s/%s>" % (self.__class__.__name__,
+                               self.templateDir, self.name)
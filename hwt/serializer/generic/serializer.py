@@ -43,7 +43,17 @@ class CurrentUnitSwap():
 class GenericSerializer():
     """
     Base class for serializers
+
+    :cvar reuseElaboration: if True units which are not serialized
+        because of serialization mode of their class (hwt.serializer.mode)
+        are elaborated only once for each configuration
+        (other instances do not have netlist/architecture and the
+        callbacks of target platform are not called for them, because
+        of this elaboration is not reused if target platform has any
+        beforeToRtl/beforeToRtlImpl/afterToRtlImpl/afterToRtl callbacks)
     """
+    reuseElaboration = True
+
     @staticmethod
     def formatter(s):
         return s
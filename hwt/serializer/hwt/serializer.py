@@ -1,6 +1,3 @@
-from jinja2.environment import Environment
-from jinja2.loaders import PackageLoader
-
 from hwt.hdl.architecture import Architecture
 from hwt.hdl.assignment import Assignment
 from hwt.hdl.constants import SENSITIVITY, DIRECTION
@@ -16,6 +13,7 @@ from hwt.hdl.value import Value
 from hwt.serializer.exceptions import SerializerException
 from hwt.serializer.generic.constCache import ConstCache
 from hwt.serializer.generic.indent import getIndent
+from hwt.serializer.generic.lazyTemplate import LazyTemplate
 from hwt.serializer.generic.nameScope import LangueKeyword
 from hwt.serializer.generic.serializer import GenericSerializer
 from hwt.serializer.hwt.keywords import HWT_KEYWORDS
@@ -28,11 +26,11 @@ from hwt.synthesizer.rtlLevel.mainBases import RtlSignalBase
 from hwt.serializer.hwt.context import HwtSerializerCtx
 
 
-env = Environment(loader=PackageLoader('hwt', 'serializer/hwt/templates'))
-unitHeadTmpl = env.get_template('unit_head.py.template')
-unitBodyTmpl = env.get_template('unit_body.py.template')
-processTmpl = env.get_template('process.py.template')
-ifTmpl = env.get_template("if.py.template")
+_TMPL_DIR = 'serializer/hwt/templates'
+unitHeadTmpl = LazyTemplate(_TMPL_DIR, 'unit_head.py.template')
+unitBodyTmpl = LazyTemplate(_TMPL_DIR, 'unit_body.py.template')
+processTmpl = LazyTemplate(_TMPL_DIR, 'process.py.template')
+ifTmpl = LazyTemplate(_TMPL_DIR, "if.py.template")
 
 
 class HwtSerializer(HwtSerializer_value, HwtSerializer_ops,
@@ -43,6 +41,8 @@ class HwtSerializer(HwtSerializer_value, HwtSerializer_ops,
     """
     _keywords_dict = {kw: LangueKeyword() for kw in HWT_KEYWORDS}
     fileExtension = '.py'
+    # all units are serialized
+    reuseElaboration = False
 
     @classmethod
     def serializationDecision(cls, obj, serializedClasses,
@@ -0,0 +1,45 @@
+"""
+Registry of serializers, serializer modules are imported only when
+the serializer is actually used (importing of all serializers and their
+templates takes significant amount of time)
+"""
+import importlib
+from typing import Union
+
+
+# {name: (module name, class name)}
+SERIALIZERS = {
+    "vhdl": ("hwt.serializer.vhdl.serializer", "VhdlSerializer"),
+    "verilog": ("hwt.serializer.verilog.serializer", "VerilogSerializer"),
+    "systemC": ("hwt.serializer.systemC.serializer", "SystemCSerializer"),
+    "hwt": ("hwt.serializer.hwt.serializer", "HwtSerializer"),
+    "simModel": ("hwt.serializer.simModel.serializer", "SimModelSerializer"),
+    "intSimModel": ("hwt.serializer.simModel.serializer",
+                    "IntSimModelSerializer"),
+    "batchSimModel": ("hwt.serializer.simModel.serializer",
+                      "BatchSimModelSerializer"),
+}
+
+
+def registerSerializer(name: str, moduleName: str, clsName: str):
+    """
+    Register serializer class which will be imported on first use
+    """
+    SERIALIZERS[name] = (moduleName, clsName)
+
+
+def getSerializer(serializer: Union[str, type]):
+    """
+    :param serializer: name of serializer in SERIALIZERS
+        or serializer class (returned as is)
+    :return: serializer class
+    """
+    if not isinstance(serializer, str):
+        return serializer
+
+    try:
+        moduleName, clsName = SERIALIZERS[serializer]
+    except KeyError:
+        raise KeyError("Unknown serializer", serializer,
+                       list(SERIALIZERS.keys())) from None
+    return getattr(importlib.import_module(moduleName), clsName)
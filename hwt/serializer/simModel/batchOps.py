@@ -0,0 +1,308 @@
+from typing import Optional
+
+from hwt.bitmask import mask
+from hwt.hdl.assignment import Assignment
+from hwt.hdl.ifContainter import IfContainer
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.process import HWProcess
+from hwt.hdl.switchContainer import SwitchContainer
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.bool import HBool
+from hwt.hdl.types.enum import HEnum
+from hwt.hdl.types.integer import Integer
+from hwt.hdl.types.slice import Slice
+from hwt.hdl.value import Value
+from hwt.hdl.variables import SignalItem
+from hwt.pyUtils.uniqList import UniqList
+from hwt.serializer.exceptions import SerializerException
+from hwt.serializer.generic.context import SerializerCtx
+from hwt.serializer.generic.indent import getIndent
+from hwt.serializer.simModel.intOps import SimModelSerializer_intOps
+from hwt.synthesizer.param import Param, evalParam
+
+
+class SimModelSerializer_batchOps(SimModelSerializer_intOps):
+    """
+    Part of BatchSimModelSerializer which serializes processes
+    as numpy expressions which evaluate all lanes
+    (independent instances of the unit) at once
+
+    Value of each signal is hwt.simulator.batchSim.BatchVal which contains
+    numpy arrays of values and validity masks of all lanes.
+    Statements are converted to masked assignments (each branch of if/switch
+    updates only lanes where its condition is satisfied).
+
+    :note: only unsigned Bits (up to 64 bits), HBool and HEnum
+        types are supported
+    """
+    modelImports = (
+        "import numpy as np",
+        "from hwt.simulator.batchSim import BatchSimSignal as SimSignal, "
+        "mkBatchVal, u64",
+    )
+    MAX_WIDTH = 64
+
+    _intBinOps = {
+        AllOps.AND: "(%s & %s)",
+        AllOps.OR: "(%s | %s)",
+        AllOps.XOR: "(%s ^ %s)",
+        AllOps.EQ: "u64(%s == %s)",
+        AllOps.NEQ: "u64(%s != %s)",
+        AllOps.GT: "u64(%s > %s)",
+        AllOps.GE: "u64(%s >= %s)",
+        AllOps.LT: "u64(%s < %s)",
+        AllOps.LE: "u64(%s <= %s)",
+    }
+
+    @classmethod
+    def _isIntCompatibleT(cls, t) -> bool:
+        if isinstance(t, (HBool, HEnum)):
+            return True
+        return (isinstance(t, Bits) and not t.signed
+                and t.bit_length() <= cls.MAX_WIDTH)
+
+    @staticmethod
+    def _intEdge(sig: str, isRising: bool) -> str:
+        return "u64((%s.updateTimes == sim.now) & (%s.val == %d))" % (
+            sig, sig, int(isRising))
+
+    @staticmethod
+    def _intTernary(cond: str, ifTrue: str, ifFalse: str) -> str:
+        return "np.where(%s, %s, %s)" % (cond, ifTrue, ifFalse)
+
+    @staticmethod
+    def _intNot(operand: str, resT) -> str:
+        if isinstance(resT, HBool):
+            return "u64(%s == 0)" % operand
+        else:
+            return "(~%s & %d)" % (operand, resT.all_mask())
+
+    @classmethod
+    def _intExpr(cls, obj, ctx: SerializerCtx, leafs: UniqList)\
+            -> Optional[str]:
+        if isinstance(obj, Param):
+            obj = evalParam(obj)
+        elif isinstance(obj, SignalItem) and obj._const:
+            obj = obj._val
+
+        if not isinstance(obj, Value):
+            return super(SimModelSerializer_batchOps, cls)._intExpr(
+                obj, ctx, leafs)
+
+        t = obj._dtype
+        if not cls._isIntCompatibleT(t):
+            return None
+
+        if isinstance(t, HEnum):
+            v = t._allValues.index(obj.val) if obj.vldMask else 0
+        else:
+            v = obj.val
+
+        if obj.vldMask != t.all_mask():
+            # validity of constant is checked in runtime as validity
+            # of signals
+            leafs.append((cls.Value(obj, ctx), t.all_mask()))
+
+        return repr(int(v))
+
+    @staticmethod
+    def _batchVldCheck(leafs: UniqList) -> Optional[str]:
+        """
+        :return: expression which evaluates to bool array
+            of lanes where all leafs are valid (None if there are no leafs)
+        """
+        if not leafs:
+            return None
+        return " & ".join("np.equal(%s.vldMask, %d)" % leaf
+                          for leaf in leafs)
+
+    @classmethod
+    def _batchExpr(cls, obj, ctx: SerializerCtx, leafs: UniqList) -> str:
+        e = cls._intExpr(obj, ctx, leafs)
+        if e is None:
+            raise SerializerException(
+                "%r can not be simulated in batch mode"
+                " (unsupported type or operator)" % obj)
+        return e
+
+    @classmethod
+    def _batchAnd(cls, en: Optional[str], cond: str, st: dict) -> str:
+        """
+        Declare new lane enable variable
+
+        :param st: state of process serialization
+        :return: name of new enable variable
+        """
+        name = "_en%d" % st["enCnt"]
+        st["enCnt"] += 1
+        if en is None:
+            e = cond
+        else:
+            e = "%s & %s" % (en, cond)
+        st["lines"].append("%s%s = %s" % (st["indent"], name, e))
+        return name
+
+    @staticmethod
+    def _batchSet(dst: str, en: Optional[str], v: str) -> str:
+        if en is None:
+            return "%s = %s" % (dst, v)
+        else:
+            return "%s = np.where(%s, %s, %s)" % (dst, en, v, dst)
+
+    @classmethod
+    def _batchAssignment(cls, a: Assignment, en: Optional[str],
+                         ctx: SerializerCtx, st: dict):
+        dst = a.dst
+        dstT = dst._dtype
+        srcT = a.src._dtype
+        if not (dstT == srcT or (isinstance(srcT, Bits)
+                                 and isinstance(dstT, Bits)
+                                 and srcT.bit_length() == dstT.bit_length())):
+            raise SerializerException(
+                "%r can not be simulated in batch mode"
+                " (types are different)" % a)
+
+        leafs = UniqList()
+        src = cls._batchExpr(a.src, ctx, leafs)
+        check = cls._batchVldCheck(leafs)
+        srcMask = srcT.all_mask()
+        if check is None:
+            vld = repr(srcMask)
+        else:
+            vld = "np.where(%s, %d, 0)" % (check, srcMask)
+
+        v = "_v_" + dst.name
+        vVld = "_vld_" + dst.name
+        if a.indexes:
+            if len(a.indexes) != 1:
+                raise SerializerException(
+                    "%r can not be simulated in batch mode"
+                    " (multiple indexes)" % a)
+            i = a.indexes[0]
+            if isinstance(i, SignalItem) and i._const:
+                i = i._val
+            if not isinstance(i, Value) or not i._isFullVld():
+                raise SerializerException(
+                    "%r can not be simulated in batch mode"
+                    " (non constant index)" % a)
+
+            if isinstance(i._dtype, Integer):
+                low = int(i.val)
+            elif isinstance(i._dtype, Slice):
+                low = int(evalParam(i.val[1]).val)
+            else:
+                raise SerializerException(
+                    "%r can not be simulated in batch mode"
+                    " (unsupported index)" % a)
+
+            m = srcMask << low
+            src = "((%s & %d) | (u64(%s) << %d))" % (
+                v, mask(cls.MAX_WIDTH) ^ m, src, low)
+            vld = "((%s & %d) | (u64(%s) << %d))" % (
+                vVld, mask(cls.MAX_WIDTH) ^ m, vld, low)
+
+        indent = st["indent"]
+        lines = st["lines"]
+        lines.append(indent + cls._batchSet(v, en, src))
+        lines.append(indent + cls._batchSet(vVld, en, vld))
+        evDep = st["evDep"]
+        evDep[dst] = evDep.get(dst, True) and a._is_completly_event_dependent
+
+    @classmethod
+    def _batchIf(cls, branches, ifFalse, outputs, en: Optional[str],
+                 ctx: SerializerCtx, st: dict):
+        """
+        :param branches: list of tuples (condition, statements)
+        :param ifFalse: statements for else branch or None
+        :param outputs: outputs of if statement which are invalidated
+            if condition is not valid
+        """
+        indent = st["indent"]
+        lines = st["lines"]
+        rest = en
+        for i, (cond, stms) in enumerate(branches):
+            leafs = UniqList()
+            c = cls._batchExpr(cond, ctx, leafs)
+            cName = "_c%d" % st["enCnt"]
+            lines.append("%s%s = np.not_equal(%s, 0)" % (indent, cName, c))
+            check = cls._batchVldCheck(leafs)
+            if check is not None:
+                inv = cls._batchAnd(rest, "~(%s)" % check, st)
+                for o in outputs:
+                    lines.append(indent + cls._batchSet(
+                        "_vld_" + o.name, inv, "0"))
+                # lanes with invalid condition take none of the branches
+                cTrue = "(%s & %s)" % (cName, check)
+                cFalse = "(%s & ~%s)" % (check, cName)
+            else:
+                cTrue = cName
+                cFalse = "~%s" % cName
+
+            enT = cls._batchAnd(rest, cTrue, st)
+            cls._batchStatements(stms, enT, ctx, st)
+            if ifFalse or i != len(branches) - 1:
+                rest = cls._batchAnd(rest, cFalse, st)
+
+        if ifFalse:
+            cls._batchStatements(ifFalse, rest, ctx, st)
+
+    @classmethod
+    def _batchStatements(cls, stms, en: Optional[str], ctx: SerializerCtx,
+                         st: dict):
+        for stm in stms:
+            if isinstance(stm, Assignment):
+                cls._batchAssignment(stm, en, ctx, st)
+            elif isinstance(stm, IfContainer):
+                branches = [(stm.cond, stm.ifTrue)]
+                branches.extend(stm.elIfs)
+                cls._batchIf(branches, stm.ifFalse, stm._outputs, en,
+                             ctx, st)
+            elif isinstance(stm, SwitchContainer):
+                switchOn = stm.switchOn
+                branches = [(switchOn._eq(c), stms)
+                            for c, stms in stm.cases]
+                cls._batchIf(branches, stm.default, stm._outputs, en,
+                             ctx, st)
+            else:
+                raise SerializerException(
+                    "%r can not be simulated in batch mode" % stm)
+
+    @classmethod
+    def HWProcess(cls, proc: HWProcess, ctx: SerializerCtx):
+        body = proc.statements
+        assert body
+        proc.name = ctx.scope.checkedName(proc.name, proc)
+        sensitivityList = sorted(
+            map(cls.sensitivityListItem, proc.sensitivityList))
+
+        indent = getIndent(ctx.indent + 2)
+        lines = []
+        outputs = sorted(proc.outputs, key=lambda o: o.name)
+        for o in outputs:
+            # lanes which are not assigned keep the value
+            lines.append("%s_v_%s = self.%s._oldVal.val" % (
+                indent, o.name, o.name))
+            lines.append("%s_vld_%s = self.%s._oldVal.vldMask" % (
+                indent, o.name, o.name))
+
+        st = {
+            "indent": indent,
+            "lines": lines,
+            "enCnt": 0,
+            "evDep": {},
+        }
+        cls._batchStatements(body, None, ctx, st)
+
+        evDep = st["evDep"]
+        for o in outputs:
+            lines.append("%sio.%s = (mkBatchVal(self.%s, _v_%s, _vld_%s), %s)"
+                         % (indent, o.name, o.name, o.name, o.name,
+                            evDep.get(o, False)))
+
+        # import there because of cyclic dependency
+        from hwt.serializer.simModel.serializer import processTmpl
+        return processTmpl.render(
+            name=proc.name,
+            sensitivityList=sensitivityList,
+            stmLines=lines
+        )
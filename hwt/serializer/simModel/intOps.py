@@ -0,0 +1,279 @@
+from typing import Optional
+
+from hwt.bitmask import mask
+from hwt.hdl.operator import Operator
+from hwt.hdl.operatorDefs import AllOps
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.bool import HBool
+from hwt.hdl.types.integer import Integer
+from hwt.hdl.types.slice import Slice
+from hwt.hdl.value import Value
+from hwt.hdl.variables import SignalItem
+from hwt.pyUtils.uniqList import UniqList
+from hwt.serializer.generic.context import SerializerCtx
+from hwt.serializer.generic.indent import getIndent
+from hwt.synthesizer.param import Param, evalParam
+
+
+class SimModelSerializer_intOps():
+    """
+    Part of IntSimModelSerializer which serializes expressions as python
+    expressions on plain int/bool instead of calls of Value methods
+    (each of which allocates new Value instance)
+
+    The integer expression is used only if all operands are fully valid,
+    otherwise original evaluation on Value instances is used.
+    Expressions on signed types or on types other than Bits/HBool are always
+    evaluated on Value instances.
+    """
+    _intBinOps = {
+        AllOps.AND: "(%s & %s)",
+        AllOps.OR: "(%s | %s)",
+        AllOps.XOR: "(%s ^ %s)",
+        AllOps.EQ: "(%s == %s)",
+        AllOps.NEQ: "(%s != %s)",
+        AllOps.GT: "(%s > %s)",
+        AllOps.GE: "(%s >= %s)",
+        AllOps.LT: "(%s < %s)",
+        AllOps.LE: "(%s <= %s)",
+    }
+    _intArithOps = {
+        AllOps.ADD: "((%s + %s) & %d)",
+        AllOps.SUB: "((%s - %s) & %d)",
+        AllOps.MUL: "((%s * %s) & %d)",
+    }
+
+    @staticmethod
+    def _isIntCompatibleT(t) -> bool:
+        """
+        :return: True if values of type t can be represented as plain int/bool
+        """
+        return isinstance(t, HBool) or (isinstance(t, Bits) and not t.signed)
+
+    @classmethod
+    def _intExpr(cls, obj, ctx: SerializerCtx, leafs: UniqList)\
+            -> Optional[str]:
+        """
+        :param leafs: UniqList of tuples (value expression, all mask)
+            for values read by this expression, all of them has to be
+            fully valid for this expression to be used
+        :return: python expression which evaluates obj on plain int/bool
+            or None if obj can not be converted
+        """
+        if isinstance(obj, Param):
+            obj = evalParam(obj)
+        elif isinstance(obj, SignalItem) and obj._const:
+            obj = obj._val
+
+        t = obj._dtype
+        if not cls._isIntCompatibleT(t):
+            return None
+
+        if isinstance(obj, Value):
+            if obj.vldMask != t.all_mask():
+                return None
+            return repr(obj.val)
+        elif obj.hidden and hasattr(obj, "origin"):
+            o = obj.origin
+            if isinstance(o, Operator):
+                return cls._intExpr_Operator(o, ctx, leafs)
+            else:
+                return None
+        else:
+            v = cls.asHdl(obj, ctx)
+            leafs.append((v, t.all_mask()))
+            return v + ".val"
+
+    @classmethod
+    def _intExpr_Operator(cls, op: Operator, ctx: SerializerCtx,
+                          leafs: UniqList) -> Optional[str]:
+        o = op.operator
+        ops = op.operands
+        resT = op.result._dtype
+        if not cls._isIntCompatibleT(resT):
+            return None
+
+        if o in (AllOps.RISING_EDGE, AllOps.FALLING_EDGE):
+            s = ops[0]
+            if not isinstance(s, SignalItem) or s.hidden or s._const:
+                return None
+            v = cls.asHdl(s, ctx)
+            leafs.append((v, s._dtype.all_mask()))
+            return cls._intEdge(v, o == AllOps.RISING_EDGE)
+
+        elif o == AllOps.INDEX:
+            src, index = ops
+            if isinstance(index, SignalItem) and index._const:
+                index = index._val
+            if not isinstance(index, Value) or not index._isFullVld():
+                return None
+
+            src = cls._intExpr(src, ctx, leafs)
+            if src is None:
+                return None
+
+            if isinstance(index._dtype, Integer):
+                return "((%s >> %d) & 1)" % (src, index.val)
+            elif isinstance(index._dtype, Slice):
+                low = evalParam(index.val[1]).val
+                return "((%s >> %d) & %d)" % (src, low, mask(index._size()))
+            else:
+                return None
+
+        elif o == AllOps.TERNARY:
+            cond, ifTrue, ifFalse = ops
+            if not (ifTrue._dtype == resT and ifFalse._dtype == resT):
+                return None
+            operands = [cls._intExpr(x, ctx, leafs)
+                        for x in (cond, ifTrue, ifFalse)]
+            if None in operands:
+                return None
+            return cls._intTernary(*operands)
+
+        isArithOp = o in cls._intArithOps
+        operands = []
+        for x in ops:
+            if isArithOp and isinstance(x._dtype, Integer):
+                # arithmetic with integer constant f.e. a + 1
+                if isinstance(x, Param):
+                    x = evalParam(x)
+                elif isinstance(x, SignalItem) and x._const:
+                    x = x._val
+
+                if not isinstance(x, Value) or not x._isFullVld():
+                    return None
+                operands.append(repr(int(x.val)))
+                continue
+
+            if not cls._isIntCompatibleT(x._dtype):
+                return None
+            _x = cls._intExpr(x, ctx, leafs)
+            if _x is None:
+                return None
+            operands.append(_x)
+
+        if o == AllOps.NOT:
+            return cls._intNot(operands[0], resT)
+
+        elif o in (AllOps.BitsAsVec, AllOps.BitsAsUnsigned):
+            # source type is not signed, no conversion of value required
+            return operands[0]
+
+        t0 = ops[0]._dtype
+        if len(ops) != 2:
+            return None
+
+        t1 = ops[1]._dtype
+        if o == AllOps.CONCAT:
+            if isinstance(t0, Bits) and isinstance(t1, Bits):
+                return "((%s << %d) | %s)" % (
+                    operands[0], t1.bit_length(), operands[1])
+            return None
+
+        if isArithOp:
+            if isinstance(resT, Bits) and isinstance(t0, Bits)\
+                    and (t0 == t1 or isinstance(t1, Integer)):
+                # same as evaluation on Value instances, the result is
+                # truncated to the width of the first operand
+                # (f.e. the result of mul is not extended)
+                return cls._intArithOps[o] % (
+                    operands[0], operands[1], t0.all_mask())
+            return None
+
+        if t0 != t1:
+            return None
+
+        op_str = cls._intBinOps.get(o, None)
+        if op_str is not None:
+            return op_str % tuple(operands)
+
+        return None
+
+    @staticmethod
+    def _intEdge(sig: str, isRising: bool) -> str:
+        """
+        :param sig: expression of value of signal
+        :return: expression which evaluates rising/falling edge of signal
+        """
+        return "(%s.updateTime == sim.now and %s.val == %d)" % (
+            sig, sig, int(isRising))
+
+    @staticmethod
+    def _intTernary(cond: str, ifTrue: str, ifFalse: str) -> str:
+        return "(%s if %s else %s)" % (ifTrue, cond, ifFalse)
+
+    @staticmethod
+    def _intNot(operand: str, resT) -> str:
+        if isinstance(resT, HBool):
+            return "(not %s)" % operand
+        else:
+            return "(~%s & %d)" % (operand, resT.all_mask())
+
+    @classmethod
+    def _intValue(cls, obj, ctx: SerializerCtx) -> Optional[str]:
+        """
+        :return: expression which constructs Value instance for obj from
+            integer expression if all operands are valid
+            (or evaluates obj on Value instances if they are not)
+            or None if obj can not be converted
+        """
+        if not (isinstance(obj, SignalItem) and obj.hidden
+                and isinstance(getattr(obj, "origin", None), Operator)):
+            # there is nothing to evaluate
+            return None
+
+        leafs = UniqList()
+        e = cls._intExpr(obj, ctx, leafs)
+        if e is None:
+            return None
+
+        t = obj._dtype
+        if isinstance(t, HBool):
+            v = "HBoolVal(%s, BOOL, 1)" % e
+        else:
+            v = "BitsVal(%s, %s, %d)" % (e, cls.HdlType(t, ctx), t.all_mask())
+
+        if not leafs:
+            return v
+
+        return "(%s if %s else %s)" % (
+            v, cls._intLeafsVldCheck(leafs), cls.asHdl(obj, ctx))
+
+    @staticmethod
+    def _intLeafsVldCheck(leafs: UniqList) -> str:
+        return " and ".join("%s.vldMask == %d" % leaf for leaf in leafs)
+
+    @classmethod
+    def _intCond(cls, cond, ctx: SerializerCtx) -> Optional[str]:
+        """
+        :return: expression which evaluates condition to tuple
+            (value, isValid) or None if cond can not be converted
+        """
+        leafs = UniqList()
+        e = cls._intExpr(cond, ctx, leafs)
+        if e is None:
+            return None
+
+        if not leafs:
+            return "(bool(%s), True)" % e
+
+        return "((bool(%s), True) if %s else simEvalCond(sim, %s))" % (
+            e, cls._intLeafsVldCheck(leafs), cls.asHdl(cond, ctx))
+
+    @classmethod
+    def condAsHdl(cls, cond, ctx: SerializerCtx):
+        c = cls._intCond(cond, ctx)
+        if c is None:
+            return super(SimModelSerializer_intOps, cls).condAsHdl(cond, ctx)
+        return c
+
+    @classmethod
+    def Assignment(cls, a, ctx: SerializerCtx):
+        if a.indexes is None and a.dst._dtype == a.src._dtype:
+            v = cls._intValue(a.src, ctx)
+            if v is not None:
+                return "%sio.%s = (%s, %s)" % (
+                    getIndent(ctx.indent), a.dst.name, v,
+                    a._is_completly_event_dependent)
+
+        return super(SimModelSerializer_intOps, cls).Assignment(a, ctx)
@@ -1,6 +1,4 @@
 from copy import copy
-from jinja2.environment import Environment
-from jinja2.loaders import PackageLoader
 
 from hwt.hdl.architecture import Architecture
 from hwt.hdl.assignment import Assignment
@@ -19,8 +17,11 @@ from hwt.serializer.exceptions import SerializerException
 from hwt.serializer.generic.constCache import ConstCache
 from hwt.serializer.generic.context import SerializerCtx
 from hwt.serializer.generic.indent import getIndent
+from hwt.serializer.generic.lazyTemplate import LazyTemplate
 from hwt.serializer.generic.nameScope import LangueKeyword
 from hwt.serializer.generic.serializer import GenericSerializer
+from hwt.serializer.simModel.batchOps import SimModelSerializer_batchOps
+from hwt.serializer.simModel.intOps import SimModelSerializer_intOps
 from hwt.serializer.simModel.keywords import SIMMODEL_KEYWORDS
 from hwt.serializer.simModel.ops import SimModelSerializer_ops
 from hwt.serializer.simModel.types import SimModelSerializer_types
@@ -29,10 +30,10 @@ from hwt.serializer.utils import maxStmId
 from hwt.synthesizer.param import evalParam
 
 
-env = Environment(loader=PackageLoader('hwt', 'serializer/simModel/templates'))
-unitTmpl = env.get_template('modelCls.py.template')
-processTmpl = env.get_template('process.py.template')
-ifTmpl = env.get_template("if.py.template")
+_TMPL_DIR = 'serializer/simModel/templates'
+unitTmpl = LazyTemplate(_TMPL_DIR, 'modelCls.py.template')
+processTmpl = LazyTemplate(_TMPL_DIR, 'process.py.template')
+ifTmpl = LazyTemplate(_TMPL_DIR, "if.py.template")
 
 
 class SimModelSerializer(SimModelSerializer_value, SimModelSerializer_ops,
@@ -42,6 +43,10 @@ class SimModelSerializer(SimModelSerializer_value, SimModelSerializer_ops,
     """
     _keywords_dict = {kw: LangueKeyword() for kw in SIMMODEL_KEYWORDS}
     fileExtension = '.py'
+    # extra import statements for header of the model
+    modelImports = ()
+    # all instances are required for simulation
+    reuseElaboration = False
 
     @classmethod
     def serializationDecision(cls, obj, serializedClasses,
@@ -116,6 +121,7 @@ class SimModelSerializer(SimModelSerializer_value, SimModelSerializer_ops,
             isOp=lambda x: isinstance(x, Operator),
             sensitivityByOp=sensitivityByOp,
             serialize_io=cls.sensitivityListItem,
+            imports=cls.modelImports,
         )
 
     @classmethod
@@ -278,3 +284,24 @@ class SimModelSerializer(SimModelSerializer_value, SimModelSerializer_ops,
             sensitivityList=sensitivityList,
             stmLines=[_body]
         )
+
+
+class IntSimModelSerializer(SimModelSerializer_intOps, SimModelSerializer):
+    """
+    Serializer which converts Unit instances to simulator code,
+    expressions on Bits/HBool are evaluated as python int/bool expressions
+    (if all operands are valid) instead of calls of Value methods
+
+    :note: model has same interface as model from SimModelSerializer,
+        signals are still holding Value instances
+    """
+
+
+class BatchSimModelSerializer(SimModelSerializer_batchOps, SimModelSerializer):
+    """
+    Serializer which converts Unit instances to simulator code
+    which simulates multiple instances (lanes) of the unit at once,
+    values of signals are numpy arrays (see hwt.simulator.batchSim)
+
+    :note: requires numpy
+    """
@@ -79,4 +79,8 @@ class SimModelSerializer_value(GenericSerializer_Value):
 
     @classmethod
     def condAsHdl(cls, cond, ctx):
-        return cls.asHdl(cond, ctx)
+        """
+        :return: expression which evaluates condition to tuple
+            (value, isValid)
+        """
+        return "simEvalCond(sim, %s)" % cls.asHdl(cond, ctx)
@@ -1,9 +1,7 @@
-from jinja2.environment import Environment
-from jinja2.loaders import PackageLoader
-
 from hwt.hdl.constants import DIRECTION
 from hwt.hdl.entity import Entity
 from hwt.interfaces.std import Clk
+from hwt.serializer.generic.lazyTemplate import LazyTemplate
 from hwt.serializer.generic.serializer import GenericSerializer
 from hwt.serializer.generic.nameScope import LangueKeyword
 from hwt.serializer.systemC.context import SystemCCtx
@@ -15,6 +13,9 @@ from hwt.serializer.systemC.value import SystemCSerializer_value
 from hwt.serializer.utils import maxStmId
 
 
+_TMPL_DIR = 'serializer/systemC/templates'
+
+
 class SystemCSerializer(SystemCSerializer_value, SystemCSerializer_type,
                         SystemCSerializer_statements, SystemCSerializer_ops,
                         GenericSerializer):
@@ -23,12 +24,10 @@ class SystemCSerializer(SystemCSerializer_value, SystemCSerializer_type,
     """
     fileExtension = '.cpp'
     _keywords_dict = {kw: LangueKeyword() for kw in SYSTEMC_KEYWORDS}
-    env = Environment(loader=PackageLoader('hwt',
-                                           'serializer/systemC/templates'))
-    moduleTmpl = env.get_template('module.cpp.template')
-    methodTmpl = env.get_template("method.cpp.template")
-    ifTmpl = env.get_template("if.cpp.template")
-    switchTmpl = env.get_template("switch.cpp.template")
+    moduleTmpl = LazyTemplate(_TMPL_DIR, 'module.cpp.template')
+    methodTmpl = LazyTemplate(_TMPL_DIR, "method.cpp.template")
+    ifTmpl = LazyTemplate(_TMPL_DIR, "if.cpp.template")
+    switchTmpl = LazyTemplate(_TMPL_DIR, "switch.cpp.template")
 
     @classmethod
     def getBaseContext(cls):
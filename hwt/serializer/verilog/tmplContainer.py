@@ -1,14 +1,13 @@
-from jinja2.environment import Environment
-from jinja2.loaders import PackageLoader
+from hwt.serializer.generic.lazyTemplate import LazyTemplate
+
+
+_TMPL_DIR = 'serializer/verilog/templates'
 
 
 class VerilogTmplContainer():
-    tmplEnv = Environment(loader=PackageLoader(
-        'hwt', 'serializer/verilog/templates'))
-
-    moduleHeadTmpl = tmplEnv.get_template('module_head.v')
-    moduleBodyTmpl = tmplEnv.get_template('module_body.v')
-    processTmpl = tmplEnv.get_template('process.v')
-    ifTmpl = tmplEnv.get_template("if.v")
-    componentInstanceTmpl = tmplEnv.get_template("component_instance.v")
-    switchTmpl = tmplEnv.get_template("switch.v")
+    moduleHeadTmpl = LazyTemplate(_TMPL_DIR, 'module_head.v')
+    moduleBodyTmpl = LazyTemplate(_TMPL_DIR, 'module_body.v')
+    processTmpl = LazyTemplate(_TMPL_DIR, 'process.v')
+    ifTmpl = LazyTemplate(_TMPL_DIR, "if.v")
+    componentInstanceTmpl = LazyTemplate(_TMPL_DIR, "component_instance.v")
+    switchTmpl = LazyTemplate(_TMPL_DIR, "switch.v")
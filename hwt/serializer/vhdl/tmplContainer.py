@@ -1,15 +1,14 @@
+from hwt.serializer.generic.lazyTemplate import LazyTemplate
 
-from jinja2.environment import Environment
-from jinja2.loaders import PackageLoader
+
+_TMPL_DIR = 'serializer/vhdl/templates'
 
 
 class VhdlTmplContainer():
-    tmplEnv = Environment(loader=PackageLoader(
-        'hwt', 'serializer/vhdl/templates'))
-    architectureTmpl = tmplEnv.get_template('architecture.vhd')
-    entityTmpl = tmplEnv.get_template('entity.vhd')
-    processTmpl = tmplEnv.get_template('process.vhd')
-    componentTmpl = tmplEnv.get_template('component.vhd')
-    componentInstanceTmpl = tmplEnv.get_template('component_instance.vhd')
-    ifTmpl = tmplEnv.get_template('if.vhd')
-    switchTmpl = tmplEnv.get_template('switch.vhd')
+    architectureTmpl = LazyTemplate(_TMPL_DIR, 'architecture.vhd')
+    entityTmpl = LazyTemplate(_TMPL_DIR, 'entity.vhd')
+    processTmpl = LazyTemplate(_TMPL_DIR, 'process.vhd')
+    componentTmpl = LazyTemplate(_TMPL_DIR, 'component.vhd')
+    componentInstanceTmpl = LazyTemplate(_TMPL_DIR, 'component_instance.vhd')
+    ifTmpl = LazyTemplate(_TMPL_DIR, 'if.vhd')
+    switchTmpl = LazyTemplate(_TMPL_DIR, 'switch.vhd')
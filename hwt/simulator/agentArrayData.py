@@ -0,0 +1,203 @@
+"""
+Data of simulation agents stored in numpy arrays
+
+AgentArrayData can be used instead of deque as data of agents which
+transfer a single word per transaction (HandshakedAgent, FifoReaderAgent,
+FifoWriterAgent, VldSyncedAgent, readed of BramPort_withoutClkAgent...).
+Words are converted from/to numpy arrays at the boundary of the agent,
+no Value instance is stored for each word.
+
+Usage::
+
+    # stimulus from array (or from bytes by AgentArrayData.fromBytes)
+    u.dataIn._ag.data = AgentArrayData.fromArray(np.arange(1000) & 0xff)
+    # preallocated container for captured data
+    u.dataOut._ag.data = AgentArrayData(capacity=1000)
+    self.runSim(...)
+    u.dataOut._ag.data.values()  # array of captured values
+    u.dataOut._ag.data.validity()  # array of bool, True if word was valid
+    self.assertValSequenceEqual(u.dataOut._ag.data, expectedArray)
+
+:note: requires numpy
+:attention: only types which fit in to dtype of arrays are supported
+    (unsigned Bits up to 64 bits by default, use signed dtype
+    for signed types)
+"""
+import numpy as np
+
+from hwt.hdl.value import Value
+
+
+class AgentArrayData():
+    """
+    Queue of words (deque like interface used by agents) backed by
+    numpy arrays
+
+    :ivar val: numpy array of values, items [_start:_end] are valid
+    :ivar vld: numpy array of bool, True if word was fully valid
+    :ivar _start: index of first item which was not popped yet
+    :ivar _end: index where next item will be appended
+    :ivar _t: type of last appended value (cache for _allMask)
+    :ivar _allMask: all_mask() of _t
+    """
+    __slots__ = ["val", "vld", "_start", "_end", "_t", "_allMask"]
+
+    def __init__(self, capacity: int=0, dtype=np.uint64):
+        """
+        :param capacity: number of words for which space is preallocated
+            (container grows automatically if required)
+        :param dtype: numpy dtype of values
+        """
+        self.val = np.zeros(capacity, dtype=dtype)
+        self.vld = np.zeros(capacity, dtype=np.bool_)
+        self._start = 0
+        self._end = 0
+        self._t = None
+        self._allMask = None
+
+    @classmethod
+    def fromArray(cls, data, dtype=np.uint64) -> "AgentArrayData":
+        """
+        Create container filled with words from array (all words are valid)
+        """
+        self = cls(0, dtype=dtype)
+        self.val = np.array(data, dtype=dtype).reshape(-1)
+        self.vld = np.ones(self.val.shape[0], dtype=np.bool_)
+        self._end = self.val.shape[0]
+        return self
+
+    @classmethod
+    def fromBytes(cls, buff, wordBytes: int, byteorder: str="little",
+                  dtype=np.uint64) -> "AgentArrayData":
+        """
+        Create container filled with words from bytes like object
+
+        :param wordBytes: number of bytes in a single word (max 8)
+        """
+        assert 0 < wordBytes <= 8, wordBytes
+        b = np.frombuffer(buff, dtype=np.uint8)
+        if b.shape[0] % wordBytes:
+            raise ValueError("Size of buffer is not multiple of word size",
+                             b.shape[0], wordBytes)
+
+        b = b.reshape(-1, wordBytes).astype(np.uint64)
+        shifts = np.arange(wordBytes, dtype=np.uint64) * np.uint64(8)
+        if byteorder == "big":
+            shifts = shifts[::-1]
+        else:
+            assert byteorder == "little", byteorder
+        words = np.bitwise_or.reduce(b << shifts, axis=1)
+        return cls.fromArray(words, dtype=dtype)
+
+    def _grow(self):
+        n = self._end - self._start
+        capacity = max(2 * n, 16)
+        val = np.zeros(capacity, dtype=self.val.dtype)
+        vld = np.zeros(capacity, dtype=np.bool_)
+        val[:n] = self.val[self._start:self._end]
+        vld[:n] = self.vld[self._start:self._end]
+        self.val = val
+        self.vld = vld
+        self._start = 0
+        self._end = n
+
+    def append(self, v):
+        """
+        Append word (Value, int or None for invalid word)
+        """
+        i = self._end
+        if i == self.val.shape[0]:
+            self._grow()
+            i = self._end
+
+        if isinstance(v, Value):
+            t = v._dtype
+            if t is not self._t:
+                self._t = t
+                self._allMask = t.all_mask()
+            self.vld[i] = v.vldMask == self._allMask
+            self.val[i] = v.val
+        elif v is None:
+            self.vld[i] = False
+            self.val[i] = 0
+        else:
+            self.vld[i] = True
+            self.val[i] = v
+
+        self._end = i + 1
+
+    def extend(self, items):
+        for v in items:
+            self.append(v)
+
+    def popleft(self):
+        """
+        :return: int of first word or None if the word is not valid
+        """
+        i = self._start
+        if i == self._end:
+            raise IndexError("pop from an empty AgentArrayData")
+        self._start = i + 1
+        if self.vld[i]:
+            return int(self.val[i])
+        else:
+            return None
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+
+    def values(self) -> np.ndarray:
+        """
+        :return: array of values of words (view, not a copy)
+        """
+        return self.val[self._start:self._end]
+
+    def validity(self) -> np.ndarray:
+        """
+        :return: array of bool, True if word is valid (view, not a copy)
+        """
+        return self.vld[self._start:self._end]
+
+    def toInts(self) -> list:
+        """
+        :return: list of int of words (None for invalid words)
+        """
+        return [int(v) if vld else None
+                for v, vld in zip(self.values(), self.validity())]
+
+    def isEqualTo(self, other) -> bool:
+        """
+        Compare with other array/sequence of ints (None is not supported,
+        all words in this container has to be valid)
+        """
+        if isinstance(other, AgentArrayData):
+            if not other.validity().all():
+                return False
+            other = other.values()
+
+        vals = self.values()
+        other = np.asarray(other)
+        if other.shape != vals.shape:
+            return False
+        if other.dtype.kind not in "iub":
+            # contains None or other objects
+            return False
+        if other.dtype.kind == "i" and vals.dtype.kind == "u" \
+                and (other < 0).any():
+            return False
+
+        return bool(self.validity().all()
+                    and (vals == other.astype(vals.dtype)).all())
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __bool__(self):
+        return self._end != self._start
+
+    def __iter__(self):
+        return iter(self.toInts())
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self.toInts())
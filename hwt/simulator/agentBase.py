@@ -1,5 +1,6 @@
 from hwt.doc_markers import internal
 from hwt.simulator.shortcuts import OnRisingCallbackLoop
+from hwt.simulator.simSignalHandle import SimSignalHandle
 from hwt.synthesizer.exceptions import IntfLvlConfErr
 
 
@@ -57,6 +58,14 @@ class AgentBase():
 
 
 class AgentWitReset(AgentBase):
+    """
+    Agent which discovers reset signal of interface
+
+    :ivar rst: reset signal (SimSignal) or None if there is no reset
+    :ivar _rst: SimSignalHandle of rst (or None) used for fast read of rst
+    :ivar rstOffIn: value of rst when reset is not active
+    """
+
     def __init__(self, intf, allowNoReset=False):
         super().__init__(intf)
         self._discoverReset(allowNoReset)
@@ -65,10 +74,12 @@ class AgentWitReset(AgentBase):
         try:
             rst = self.intf._getAssociatedRst()
             self.rst = rst._sigInside
+            self._rst = SimSignalHandle(self.rst)
             self.rstOffIn = int(rst._dtype.negated)
             self.notReset = self._notReset
         except IntfLvlConfErr:
             self.rst = None
+            self._rst = None
             self.notReset = self._notReset_dummy
 
             if allowNoReset:
@@ -79,11 +90,10 @@ class AgentWitReset(AgentBase):
     @internal
     def _notReset_dummy(self, sim):
         return True
-    
+
     @internal
     def _notReset(self, sim):
-        rstVal = sim.read(self.rst).val
-        return rstVal == self.rstOffIn
+        return self._rst.val == self.rstOffIn
 
 
 class SyncAgentBase(AgentWitReset):
@@ -93,6 +103,13 @@ class SyncAgentBase(AgentWitReset):
 
     :attention: requires clk and rst/rstn signal
         (if you do not have any create simulation wrapper with it)
+    :note: monitor/driver of stock agents are plain functions(simulator)
+        which are called directly by simulator (the part which has to wait
+        on combinational update is registered by sim.callOnCombUpdate()).
+        This means that yield from super().monitor(sim) in overridden
+        monitor/driver does not work (call super().monitor(sim) instead).
+        Overridden monitor/driver (or other hook called by simulator)
+        can still be a generator, it is then run as a simulation process.
     """
     SELECTED_EDGE_CALLBACK = OnRisingCallbackLoop
 
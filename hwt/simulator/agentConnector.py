@@ -40,7 +40,7 @@ def valuesToInts(values):
     res = []
     append = res.append
     for d in values:
-        if isinstance(d, int):
+        if d is None or isinstance(d, int):
             append(d)
         else:
             append(valToInt(d))
@@ -0,0 +1,460 @@
+"""
+Simulation of multiple independent instances (lanes) of the same unit
+in a single simulator, values of all lanes are stored in numpy arrays
+and processes of the model are evaluated for all lanes at once.
+
+Usage::
+
+    units = [MyUnit() for _ in range(lanes)]
+    model, procs = batchSimPrepare(units)
+    # drive each unit by its agents (units[i]._ag...)
+    sim = HdlSimulator()
+    sim.simUnit(model, until, extraProcesses=procs)
+
+:note: requires numpy
+:attention: value changes are not logged (use default HdlSimConfig),
+    only unsigned Bits (up to 64 bits), HBool and HEnum signals are supported,
+    agents are still executed separately for each lane
+"""
+from typing import List
+
+import numpy as np
+
+from hwt.doc_markers import internal
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.bitsVal import BitsVal
+from hwt.hdl.types.bool import HBool
+from hwt.hdl.types.boolVal import HBoolVal
+from hwt.hdl.types.enum import HEnum
+from hwt.hdl.types.enumVal import HEnumVal
+from hwt.hdl.value import Value
+from hwt.simulator.agentConnector import autoAddAgents
+from hwt.simulator.simSignal import SimSignal
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.synthesizer.param import Param, evalParam
+from hwt.synthesizer.unit import Unit
+
+
+def u64(x):
+    """
+    Convert result of numpy expression to array of uint64
+    """
+    return np.asarray(x, dtype=np.uint64)
+
+
+class BatchVal():
+    """
+    Value of signal for all lanes
+
+    :ivar val: numpy array of values (index of value for HEnum)
+    :ivar vldMask: numpy array of validity masks
+    :ivar updateTime: time of last update of any lane
+    :ivar updateTimes: numpy array of times of last update of each lane
+    """
+    __slots__ = ["_dtype", "val", "vldMask", "updateTime", "updateTimes"]
+
+    def __init__(self, dtype, val, vldMask, updateTimes):
+        self._dtype = dtype
+        self.val = val
+        self.vldMask = vldMask
+        self.updateTimes = updateTimes
+        self.updateTime = -1
+
+    @classmethod
+    def fromScalar(cls, v: Value, lanes: int) -> "BatchVal":
+        """
+        Broadcast scalar value to all lanes
+        """
+        val, vld = _scalarToInts(v)
+        return cls(v._dtype,
+                   np.full(lanes, val, dtype=np.uint64),
+                   np.full(lanes, vld, dtype=np.uint64),
+                   np.full(lanes, v.updateTime, dtype=np.float64))
+
+    def clone(self):
+        v = self.__class__(self._dtype, self.val.copy(), self.vldMask.copy(),
+                           self.updateTimes.copy())
+        v.updateTime = self.updateTime
+        return v
+
+    def laneValue(self, lane: int) -> Value:
+        """
+        :return: scalar Value of lane
+        """
+        t = self._dtype
+        val = int(self.val[lane])
+        vld = int(self.vldMask[lane])
+        updateTime = float(self.updateTimes[lane])
+        if isinstance(t, HEnum):
+            return HEnumVal(t._allValues[val], t, vld, updateTime)
+        elif isinstance(t, HBool):
+            return HBoolVal(bool(val), t, vld, updateTime)
+        else:
+            return BitsVal(val, t, vld, updateTime)
+
+    def __repr__(self):
+        return "<%s %r, mask %r>" % (self.__class__.__name__,
+                                     self.val, self.vldMask)
+
+
+@internal
+def _scalarToInts(v: Value):
+    """
+    :return: tuple (value, validity mask) of scalar value as ints
+    """
+    t = v._dtype
+    if isinstance(t, HEnum):
+        if v.vldMask:
+            return t._allValues.index(v.val), 1
+        else:
+            return 0, 0
+    elif isinstance(t, (Bits, HBool)):
+        return int(v.val), int(v.vldMask)
+    else:
+        raise TypeError("Type can not be simulated in batch mode", t)
+
+
+def mkBatchVal(sig: "BatchSimSignal", val, vldMask) -> BatchVal:
+    """
+    Construct BatchVal for sig from result of numpy expression
+    (scalars are broadcasted to all lanes)
+    """
+    lanes = sig._lanes
+    return BatchVal(sig._dtype,
+                    np.broadcast_to(u64(val), (lanes, )),
+                    np.broadcast_to(u64(vldMask), (lanes, )),
+                    sig._oldVal.updateTimes)
+
+
+class BatchSimSignal(SimSignal):
+    """
+    SimSignal which holds values of all lanes as BatchVal
+
+    :ivar _lanes: number of lanes
+    :ivar _laneViews: dictionary {lane index: SimSignalLane}
+    """
+
+    def __init__(self, ctx, name, dtype, defVal=None):
+        super(BatchSimSignal, self).__init__(ctx, name, dtype, defVal)
+        self._lanes = None
+        self._laneViews = {}
+
+    def _setLanes(self, lanes: int):
+        """
+        Convert value of this signal to BatchVal with specified number
+        of lanes
+        """
+        if self._lanes == lanes:
+            return
+        assert self._lanes is None, (self, "number of lanes already set")
+        self._lanes = lanes
+        self._val = BatchVal.fromScalar(self._val, lanes)
+        self._oldVal = BatchVal.fromScalar(self._oldVal, lanes)
+
+    def getLane(self, lane: int) -> "SimSignalLane":
+        """
+        :return: signal like object for access to a single lane
+            of this signal
+        """
+        try:
+            return self._laneViews[lane]
+        except KeyError:
+            v = self._laneViews[lane] = SimSignalLane(self, lane)
+            return v
+
+    @internal
+    def _normalize(self, v) -> BatchVal:
+        if isinstance(v, BatchVal):
+            return v
+        return BatchVal.fromScalar(v, self._lanes)
+
+    def simUpdateVal(self, simulator, valUpdater):
+        """
+        Method called by simulator to update new value for this object
+        """
+        old = self._oldVal
+        _, newVal = valUpdater(old)
+        newVal = self._normalize(newVal)
+
+        changed = (newVal.val != old.val) | (newVal.vldMask != old.vldMask)
+        if not changed.any():
+            return
+
+        now = simulator.now
+        newVal = BatchVal(newVal._dtype,
+                          np.array(newVal.val, dtype=np.uint64),
+                          np.array(newVal.vldMask, dtype=np.uint64),
+                          np.where(changed, now, old.updateTimes))
+        newVal.updateTime = now
+        self._val = newVal
+        self.simPropagateChanges(simulator, changed)
+
+    @internal
+    def _updateLane(self, simulator, lane: int, newVal: Value):
+        """
+        Write scalar value to a single lane
+        """
+        val, vld = _scalarToInts(newVal)
+        old = self._oldVal
+        if old.val[lane] == val and old.vldMask[lane] == vld:
+            return
+
+        now = simulator.now
+        v = old.clone()
+        v.val[lane] = val
+        v.vldMask[lane] = vld
+        v.updateTimes[lane] = now
+        v.updateTime = now
+        self._val = v
+
+        changed = np.zeros(self._lanes, dtype=np.bool_)
+        changed[lane] = True
+        self.simPropagateChanges(simulator, changed)
+
+    def simPropagateChanges(self, simulator, changed):
+        """
+        :param changed: numpy array of bool, True for lanes which value
+            has changed
+        """
+        v = self._val
+        self._oldVal = v
+
+        if self._writeCallbacksToEn:
+            self._loadWriteCallbacks()
+
+        log = simulator.config.logPropagation
+        if log:
+            log(simulator, self, self.simSensProcs)
+        for p in self.simSensProcs:
+            simulator._addHdlProcToRun(self, p)
+
+        for c in self._writeCallbacks:
+            if c:
+                simulator.add_process(c(simulator))
+
+        if self._risingWriteCallbacks or self._fallingWriteCallbacks:
+            fullVld = v.vldMask == self._dtype.all_mask()
+            for callbacks, isEdge in (
+                    (self._risingWriteCallbacks, v.val != 0),
+                    (self._fallingWriteCallbacks, v.val == 0)):
+                if callbacks and np.any(changed & fullVld & isEdge):
+                    for c in callbacks:
+                        if c:
+                            simulator.add_process(c(simulator))
+
+        if self._laneViews:
+            for lane in np.flatnonzero(changed):
+                lv = self._laneViews.get(int(lane), None)
+                if lv is not None:
+                    lv._runWriteCallbacks(simulator)
+
+        if self.simRisingSensProcs:
+            if np.any(changed & ((v.val != 0) | (v.vldMask == 0))):
+                if log:
+                    log(simulator, self, self.simRisingSensProcs)
+                for p in self.simRisingSensProcs:
+                    simulator._addHdlProcToRun(self, p)
+
+        if self.simFallingSensProcs:
+            if np.any(changed & ((v.val == 0) | (v.vldMask == 0))):
+                if log:
+                    log(simulator, self, self.simFallingSensProcs)
+                for p in self.simFallingSensProcs:
+                    simulator._addHdlProcToRun(self, p)
+
+
+class SimSignalLane():
+    """
+    View on a single lane of BatchSimSignal, it behaves as SimSignal
+    for agents and HdlSimulator.read/write
+
+    :ivar _batchSig: BatchSimSignal of this lane
+    :ivar _lane: index of lane
+    :ivar _writeCallbacks: write callbacks of this lane
+        (see SimSignal._writeCallbacks, _risingWriteCallbacks
+        and _fallingWriteCallbacks)
+    """
+    getWriteCallbacks = SimSignal.getWriteCallbacks
+    hasWriteCallbacks = SimSignal.hasWriteCallbacks
+    registerWriteCallback = SimSignal.registerWriteCallback
+    _loadWriteCallbacks = SimSignal._loadWriteCallbacks
+
+    def __init__(self, batchSig: BatchSimSignal, lane: int):
+        self._batchSig = batchSig
+        self._lane = lane
+        self.name = "%s[%d]" % (batchSig.name, lane)
+        self._dtype = batchSig._dtype
+        self._writeCallbacks = []
+        self._risingWriteCallbacks = []
+        self._fallingWriteCallbacks = []
+        self._writeCallbacksToEn = []
+
+    @property
+    def _val(self):
+        return self._batchSig._val.laneValue(self._lane)
+
+    @property
+    def _oldVal(self):
+        return self._batchSig._oldVal.laneValue(self._lane)
+
+    @property
+    def simSensProcs(self):
+        return self._batchSig.simSensProcs
+
+    @property
+    def simRisingSensProcs(self):
+        return self._batchSig.simRisingSensProcs
+
+    @property
+    def simFallingSensProcs(self):
+        return self._batchSig.simFallingSensProcs
+
+    def simUpdateVal(self, simulator, valUpdater):
+        dirtyFlag, newVal = valUpdater(self._oldVal)
+        if dirtyFlag:
+            self._batchSig._updateLane(simulator, self._lane, newVal)
+
+    @internal
+    def _runWriteCallbacks(self, simulator):
+        if self._writeCallbacksToEn:
+            self._loadWriteCallbacks()
+
+        for c in self._writeCallbacks:
+            if c:
+                simulator.add_process(c(simulator))
+
+        if self._risingWriteCallbacks or self._fallingWriteCallbacks:
+            v = self._val
+            if v._isFullVld():
+                if v.val:
+                    callbacks = self._risingWriteCallbacks
+                else:
+                    callbacks = self._fallingWriteCallbacks
+                for c in callbacks:
+                    if c:
+                        simulator.add_process(c(simulator))
+
+    def __repr__(self):
+        return "<%s, %s>" % (self.__class__.__name__, self.name)
+
+
+@internal
+def _setModelLanes(model, lanes: int):
+    for s in model._ctx.signals:
+        s._setLanes(lanes)
+
+    for u in model._units:
+        _setModelLanes(u, lanes)
+
+
+@internal
+def _connectLane(intf, modelCls, lane: int):
+    """
+    Connect interface to lane of signals of simulation model
+    """
+    if intf._interfaces:
+        for i in intf._interfaces:
+            _connectLane(i, modelCls, lane)
+    else:
+        intf._sigInside = getattr(modelCls, intf._sigInside.name).getLane(lane)
+
+
+@internal
+def _copyDirections(src, dst):
+    dst._direction = src._direction
+    for s, d in zip(src._interfaces, dst._interfaces):
+        _copyDirections(s, d)
+
+
+@internal
+def _paramValues(u: Unit):
+    """
+    :return: list of tuples (name, value) of evaluated params of unit
+    """
+    res = []
+    for p in u._params:
+        name = p.getName(u)
+        # param can be replaced by value in attribute of unit
+        v = getattr(u, name, p)
+        if isinstance(v, Param):
+            v = evalParam(v)
+        if isinstance(v, Value):
+            v = (v._dtype, v.val, v.vldMask)
+        res.append((name, v))
+
+    return res
+
+
+@internal
+def _checkSameConfig(u0: Unit, u: Unit):
+    """
+    :raise ValueError: if unit u is not instance of same class
+        with same values of params as u0
+    """
+    if u.__class__ is not u0.__class__:
+        raise ValueError(
+            "All units in batch simulation have to be instances"
+            " of same class", u0.__class__, u.__class__)
+
+    diff = []
+    for (name, v0), (_, v) in zip(_paramValues(u0), _paramValues(u)):
+        if v0 != v:
+            diff.append(name)
+    if diff:
+        raise ValueError(
+            "All units in batch simulation have to have same values"
+            " of params, differs in:", diff, u0, u)
+
+
+def batchSimPrepare(units: List[Unit], targetPlatform=DummyPlatform()):
+    """
+    Create simulation model which simulates all units at once,
+    each unit is a lane of the model
+
+    :param units: list of instances of same unit with same configuration,
+        only first of them is elaborated, others are used only for
+        communication with the lane (its agents)
+    :raise ValueError: if units are not of same class with same params
+    :return: tuple (simulation model, simulation processes of agents
+        of all units)
+    """
+    # import there because of cyclic dependency
+    from hwt.serializer.simModel.serializer import BatchSimModelSerializer
+    from hwt.simulator.shortcuts import toSimModel
+
+    assert units
+    u0 = units[0]
+    for u in units[1:]:
+        _checkSameConfig(u0, u)
+
+    modelCls = toSimModel(u0, targetPlatform=targetPlatform,
+                          serializer=BatchSimModelSerializer)
+    model = modelCls()
+    lanes = len(units)
+    _setModelLanes(model, lanes)
+
+    procs = []
+    for lane, u in enumerate(units):
+        if u is not u0:
+            u._loadDeclarations()
+            u._targetPlatform = targetPlatform
+            for i0, i in zip(u0._interfaces, u._interfaces):
+                _copyDirections(i0, i)
+                # signal names are resolved from the elaborated unit
+                _copySigInside(i0, i)
+
+    for lane, u in enumerate(units):
+        for i in u._interfaces:
+            _connectLane(i, modelCls, lane)
+        procs.extend(autoAddAgents(u))
+
+    return model, procs
+
+
+@internal
+def _copySigInside(src, dst):
+    if src._interfaces:
+        for s, d in zip(src._interfaces, dst._interfaces):
+            _copySigInside(s, d)
+    else:
+        dst._sigInside = src._sigInside
@@ -0,0 +1,407 @@
+"""
+Binary trace file format (all numbers are little endian)
+
+* 8B magic, 4B version
+* chunks of changes, each chunk contains changes of single signal
+    * count * 8B deltas of time (first is relative to time of the chunk)
+    * count * nbytes values
+    * count * nbytes validity masks
+    (nbytes is number of bytes of signal width, values are unsigned)
+* footer (utf-8 json) with list of signals
+  (name, width, enum values, list of chunks
+  (offset, count, time of first change, time of last change))
+* 8B offset of the footer, 8B magic
+"""
+from bisect import bisect_left, bisect_right
+from heapq import merge
+import json
+import struct
+from typing import Dict, List, Optional, Tuple, Union
+
+from pyDigitalWaveTools.vcd.common import VCD_SIG_TYPE
+from pyDigitalWaveTools.vcd.writer import VcdWriter, vcdBitsFormatter, \
+    vcdEnumFormatter
+
+from hwt.doc_markers import internal
+from hwt.hdl.types.bits import Bits
+from hwt.hdl.types.bool import HBool
+from hwt.hdl.types.enum import HEnum
+from hwt.simulator.hdlSimConfig import HdlSimConfig
+from hwt.simulator.simModel import SimModel
+from hwt.simulator.types.simBits import SimBitsT
+from hwt.synthesizer.interfaceLevel.unitImplHelpers import getSignalName
+from hwt.synthesizer.unit import Unit
+
+BIN_TRACE_MAGIC = b"HWTTRACE"
+BIN_TRACE_VERSION = 1
+
+
+@internal
+def _byteWidth(width: int) -> int:
+    return max((width + 7) // 8, 1)
+
+
+@internal
+class BinTraceSignalBuffer():
+    """
+    Buffer of changes of single signal which were not written yet
+
+    :ivar index: list of chunks [offset, count, first time, last time]
+    """
+    __slots__ = ["id", "name", "width", "nbytes", "enumValues",
+                 "times", "vals", "masks", "index"]
+
+    def __init__(self, id_: int, name: str, width: int,
+                 enumValues: Optional[Tuple[str]]):
+        self.id = id_
+        self.name = name
+        self.width = width
+        self.nbytes = _byteWidth(width)
+        self.enumValues = enumValues
+        self.times = []
+        self.vals = []
+        self.masks = []
+        self.index = []
+
+    def toJson(self):
+        return {
+            "name": self.name,
+            "width": self.width,
+            "enumValues": None if self.enumValues is None else list(
+                self.enumValues),
+            "chunks": self.index,
+        }
+
+
+class BinTraceHdlSimConfig(HdlSimConfig):
+    """
+    Simulator config which records changes of signals to binary file
+    which has columnar format with time index (see BinTraceReader)
+
+    :ivar chunkSize: max number of changes in the chunk of the signal
+    :ivar _signals: dictionary {signal: BinTraceSignalBuffer}
+    """
+    supported_type_classes = (HBool, Bits, HEnum)
+
+    def __init__(self, dumpFile: Union[str, "BinaryIO"],
+                 chunkSize: int=4096):
+        """
+        :param dumpFile: name of the file or file object opened
+            in binary mode
+        """
+        self.logPropagation = None
+        self.logApplyingValues = None
+
+        if isinstance(dumpFile, str):
+            dumpFile = open(dumpFile, "wb")
+            self._ownsDumpFile = True
+        else:
+            self._ownsDumpFile = False
+
+        self._file = dumpFile
+        self.chunkSize = chunkSize
+        self._signals = {}
+        self._file.write(BIN_TRACE_MAGIC)
+        self._file.write(struct.pack("<I", BIN_TRACE_VERSION))
+
+    @internal
+    def _registerSignal(self, sig, name: str):
+        if sig in self._signals:
+            return
+        t = sig._dtype
+        if isinstance(t, HEnum):
+            width = t.bit_length()
+            enumValues = t._allValues
+        elif isinstance(t, (SimBitsT, Bits, HBool)):
+            width = t.bit_length()
+            enumValues = None
+        else:
+            return
+
+        self._signals[sig] = BinTraceSignalBuffer(
+            len(self._signals), name, width, enumValues)
+
+    @internal
+    def _registerInterfaces(self, obj: Union[SimModel, Unit], path: str):
+        if hasattr(obj, "_interfaces") and obj._interfaces:
+            path = path + obj._name
+            for chIntf in obj._interfaces:
+                self._registerInterfaces(chIntf, path + ".")
+
+            if isinstance(obj, (Unit, SimModel)):
+                for u in obj._units:
+                    self._registerInterfaces(u, path + ".")
+        else:
+            self._registerSignal(obj, path + getSignalName(obj))
+
+    @internal
+    def _registerRemainingSignals(self, unit: SimModel, path: str):
+        path = path + unit._name + "."
+        for s in unit._ctx.signals:
+            self._registerSignal(s, path + getSignalName(s))
+
+        for u in unit._units:
+            self._registerRemainingSignals(u, path)
+
+    def beforeSim(self, simulator, synthesisedUnit):
+        """
+        This method is called before first step of simulation.
+        """
+        self._registerInterfaces(synthesisedUnit, "")
+        self._registerRemainingSignals(synthesisedUnit, "")
+
+    def logChange(self, nowTime, sig, nextVal):
+        """
+        This method is called for every value change of any signal.
+        """
+        try:
+            b = self._signals[sig]
+        except KeyError:
+            # not every signal has to be registered
+            return
+
+        val = nextVal.val
+        if b.enumValues is not None:
+            val = b.enumValues.index(val) if nextVal.vldMask else 0
+
+        t = int(nowTime)
+        times = b.times
+        if times and times[-1] == t:
+            # only last value in this time is important
+            b.vals[-1] = val
+            b.masks[-1] = nextVal.vldMask
+        else:
+            times.append(t)
+            b.vals.append(val)
+            b.masks.append(nextVal.vldMask)
+            if len(times) >= self.chunkSize:
+                self._writeChunk(b)
+
+    @internal
+    def _writeChunk(self, b: BinTraceSignalBuffer):
+        times = b.times
+        if not times:
+            return
+
+        f = self._file
+        offset = f.tell()
+        t0 = times[0]
+        deltas = [t - prev for t, prev in zip(times, [t0, ] + times[:-1])]
+        f.write(struct.pack("<%dQ" % len(deltas), *deltas))
+        nbytes = b.nbytes
+        # values of signed types are stored as unsigned
+        m = (1 << (8 * nbytes)) - 1
+        f.write(b"".join((v & m).to_bytes(nbytes, "little") for v in b.vals))
+        f.write(b"".join(m.to_bytes(nbytes, "little") for m in b.masks))
+        b.index.append([offset, len(times), t0, times[-1]])
+
+        b.times = []
+        b.vals = []
+        b.masks = []
+
+    def afterSim(self, simulator, synthesisedUnit):
+        """
+        This method is called after simulation of unit ends.
+        """
+        self.close()
+
+    def close(self):
+        """
+        Write all buffered changes and the index and close the file
+        if it was opened by this object
+        """
+        f = self._file
+        if f is None:
+            return
+
+        signals = sorted(self._signals.values(), key=lambda b: b.id)
+        for b in signals:
+            self._writeChunk(b)
+
+        footerOffset = f.tell()
+        footer = {"signals": [b.toJson() for b in signals]}
+        f.write(json.dumps(footer).encode("utf-8"))
+        f.write(struct.pack("<Q", footerOffset))
+        f.write(BIN_TRACE_MAGIC)
+        f.flush()
+        if self._ownsDumpFile:
+            f.close()
+        self._file = None
+
+
+class BinTraceReader():
+    """
+    Reader of binary trace files written by BinTraceHdlSimConfig
+
+    Lookup of the value in the time and of the changes in time window
+    has O(log n) complexity (only chunks containing the time are loaded).
+
+    :ivar signals: dictionary {name: signal info dictionary}
+    """
+
+    def __init__(self, fileName: str):
+        self._file = f = open(fileName, "rb")
+        if f.read(len(BIN_TRACE_MAGIC)) != BIN_TRACE_MAGIC:
+            raise ValueError("Not a binary trace file", fileName)
+        version, = struct.unpack("<I", f.read(4))
+        if version != BIN_TRACE_VERSION:
+            raise ValueError("Unsupported version of binary trace", version)
+
+        f.seek(-(8 + len(BIN_TRACE_MAGIC)), 2)
+        footerOffset, = struct.unpack("<Q", f.read(8))
+        if f.read(len(BIN_TRACE_MAGIC)) != BIN_TRACE_MAGIC:
+            raise ValueError("Binary trace file is incomplete", fileName)
+        footerEnd = f.seek(0, 2) - 8 - len(BIN_TRACE_MAGIC)
+        f.seek(footerOffset)
+        footer = json.loads(f.read(footerEnd - footerOffset).decode("utf-8"))
+
+        self.signals = {s["name"]: s for s in footer["signals"]}
+        for s in self.signals.values():
+            s["chunkStarts"] = [c[2] for c in s["chunks"]]
+        self._chunkCache = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    @internal
+    def _loadChunk(self, sig: dict, chunkI: int)\
+            -> Tuple[List[int], List[int], List[int]]:
+        """
+        :return: tuple (times, values, validity masks)
+        """
+        offset, count, t0, _ = sig["chunks"][chunkI]
+        k = (offset, count)
+        try:
+            return self._chunkCache[k]
+        except KeyError:
+            pass
+
+        nbytes = _byteWidth(sig["width"])
+        f = self._file
+        f.seek(offset)
+        deltas = struct.unpack("<%dQ" % count, f.read(8 * count))
+        times = []
+        t = t0
+        for d in deltas:
+            t += d
+            times.append(t)
+
+        data = f.read(2 * count * nbytes)
+        ints = [int.from_bytes(data[i:i + nbytes], "little")
+                for i in range(0, len(data), nbytes)]
+        res = (times, ints[:count], ints[count:])
+        if len(self._chunkCache) > 64:
+            self._chunkCache.clear()
+        self._chunkCache[k] = res
+        return res
+
+    @internal
+    def _toValue(self, sig: dict, val: int, vldMask: int):
+        enumValues = sig["enumValues"]
+        if enumValues is not None:
+            val = enumValues[val] if vldMask else None
+        return val
+
+    def valueAt(self, name: str, time: int) -> Optional[Tuple[object, int]]:
+        """
+        :return: tuple (value, validity mask) of the signal in the time
+            or None if signal does not have any value in this time
+        """
+        sig = self.signals[name]
+        chunkI = bisect_right(sig["chunkStarts"], time) - 1
+        if chunkI < 0:
+            return None
+
+        times, vals, masks = self._loadChunk(sig, chunkI)
+        i = bisect_right(times, time) - 1
+        return (self._toValue(sig, vals[i], masks[i]), masks[i])
+
+    def iterChanges(self, name: str, start: int=0, end: Optional[int]=None):
+        """
+        :return: generator of tuples (time, value, validity mask)
+            of changes of the signal in time window [start, end)
+        """
+        sig = self.signals[name]
+        chunks = sig["chunks"]
+        chunkI = max(bisect_right(sig["chunkStarts"], start) - 1, 0)
+        for i in range(chunkI, len(chunks)):
+            if end is not None and chunks[i][2] >= end:
+                break
+            times, vals, masks = self._loadChunk(sig, i)
+            lo = bisect_left(times, start)
+            hi = len(times) if end is None else bisect_left(times, end)
+            for t, v, m in zip(times[lo:hi], vals[lo:hi], masks[lo:hi]):
+                yield (t, self._toValue(sig, v, m), m)
+
+    def changes(self, name: str, start: int=0, end: Optional[int]=None)\
+            -> List[Tuple[int, object, int]]:
+        """
+        :return: list of tuples (time, value, validity mask)
+            of changes of the signal in time window [start, end)
+        """
+        return list(self.iterChanges(name, start, end))
+
+
+@internal
+class _TraceValue():
+    """
+    Value-like object for VCD value formatters
+    """
+    __slots__ = ["val", "vldMask"]
+
+    def __init__(self, val, vldMask):
+        self.val = val
+        self.vldMask = vldMask
+
+
+def binTraceToVcd(traceFileName: str, vcdFile):
+    """
+    Convert binary trace file to VCD
+
+    :param vcdFile: text file object where VCD should be written
+    """
+    with BinTraceReader(traceFileName) as r:
+        vcd = VcdWriter(vcdFile)
+        vcd.timescale(1)
+
+        # build tree of scopes from hierarchical names
+        root = {}
+        for name in r.signals.keys():
+            scope = root
+            path = name.split(".")
+            for n in path[:-1]:
+                scope = scope.setdefault(n, {})
+            scope[path[-1]] = name
+
+        def writeScope(parent, name: str, children: Dict):
+            with parent.varScope(name) as s:
+                for chName, ch in children.items():
+                    if isinstance(ch, dict):
+                        writeScope(s, chName, ch)
+                    else:
+                        sig = r.signals[ch]
+                        if sig["enumValues"] is None:
+                            s.addVar(ch, chName, VCD_SIG_TYPE.WIRE,
+                                     sig["width"], vcdBitsFormatter)
+                        else:
+                            s.addVar(ch, chName, VCD_SIG_TYPE.REAL,
+                                     1, vcdEnumFormatter)
+
+        for name, children in root.items():
+            writeScope(vcd, name, children)
+        vcd.enddefinitions()
+
+        def sigChanges(name):
+            for t, v, m in r.iterChanges(name):
+                yield t, name, v, m
+
+        allChanges = merge(*(sigChanges(name) for name in r.signals.keys()),
+                           key=lambda x: x[0])
+        for t, name, v, m in allChanges:
+            vcd.logChange(t, name, _TraceValue(v, m))
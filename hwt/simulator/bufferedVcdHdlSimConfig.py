@@ -0,0 +1,247 @@
+from fnmatch import fnmatchcase
+import gzip
+import io
+import sys
+from typing import Optional, List
+
+from pyDigitalWaveTools.vcd.writer import VcdVarWritingScope
+
+from hwt.doc_markers import internal
+from hwt.simulator.vcdHdlSimConfig import VcdHdlSimConfig
+
+
+class BufferedVcdHdlSimConfig(VcdHdlSimConfig):
+    """
+    VCD dumping simulator config which buffers the value changes
+    and writes them in large chunks
+
+    * only the last value of the signal in each time is dumped
+      (changes in delta steps are coalesced) and value which is same
+      as the previous dumped value of the signal is not dumped
+    * signals can be filtered by fnmatch patterns on hierarchical
+      names (f.e. "top.dataIn.*", "*.clk")
+    * dumping can be limited to time window [startTime, stopTime)
+    * output can be compressed by gzip or zstd (requires zstandard package)
+
+    :note: buffer is flushed after the simulation ends (afterSim)
+        or by explicit call of flush(); if the simulation is continued
+        by simulator.run() the flush() has to be called manually
+        and close() has to be called if dumpFile was opened by this object
+
+    :ivar include: list of patterns of names of signals to dump
+        (None means all)
+    :ivar exclude: list of patterns of names of signals which should not
+        be dumped
+    :ivar startTime: time where dumping starts (values of all dumped signals
+        are written at this time)
+    :ivar stopTime: time where dumping stops (None means never)
+    :ivar bufferSize: number of characters in buffer before it is written
+        to file
+    :ivar _buff: list of strings to write to file
+    :ivar _buffLen: number of characters in _buff
+    :ivar _time: time of the changes in _pending
+    :ivar _pending: dictionary {signal: value} of changes in _time
+    :ivar _lastVal: dictionary {signal: value} of values before startTime
+    :ivar _lastDumped: dictionary {signal: value string} with last dumped
+        value of each signal
+    :ivar _started: flag, True if the startTime was reached
+    :ivar _excluded: set of signals which were filtered out by patterns
+    """
+    COMPRESSIONS = (None, "gzip", "zstd")
+
+    def __init__(self, dumpFile=sys.stdout,
+                 include: Optional[List[str]]=None,
+                 exclude: Optional[List[str]]=None,
+                 startTime: float=0, stopTime: Optional[float]=None,
+                 compression: Optional[str]=None,
+                 bufferSize: int=1 << 20):
+        """
+        :param dumpFile: file object or name of the file where vcd should
+            be written
+        :param compression: None, "gzip" or "zstd", can be used only
+            if dumpFile is name of the file
+        """
+        if compression not in self.COMPRESSIONS:
+            raise ValueError("Unknown compression", compression)
+
+        if isinstance(dumpFile, str):
+            dumpFile = self._openDumpFile(dumpFile, compression)
+            self._ownsDumpFile = True
+        else:
+            if compression is not None:
+                raise ValueError("Compression can be used only if dumpFile"
+                                 " is a name of the file")
+            self._ownsDumpFile = False
+
+        super(BufferedVcdHdlSimConfig, self).__init__(dumpFile)
+        self.include = include
+        self.exclude = exclude
+        self.startTime = startTime
+        self.stopTime = stopTime
+        self.bufferSize = bufferSize
+
+        self._buff = []
+        self._buffLen = 0
+        self._time = None
+        self._pending = {}
+        self._lastVal = {}
+        self._lastDumped = {}
+        self._started = False
+        self._excluded = set()
+
+    @staticmethod
+    @internal
+    def _openDumpFile(fileName: str, compression: Optional[str]):
+        if compression is None:
+            return open(fileName, "w")
+        elif compression == "gzip":
+            return gzip.open(fileName, "wt")
+        else:
+            assert compression == "zstd", compression
+            try:
+                import zstandard
+            except ImportError:
+                raise ImportError("zstd compression requires"
+                                  " zstandard package")
+            f = open(fileName, "wb")
+            w = zstandard.ZstdCompressor().stream_writer(f)
+            return io.TextIOWrapper(w, encoding="utf-8")
+
+    @internal
+    def _isDumped(self, name: str) -> bool:
+        """
+        :param name: hierarchical name of signal
+        :return: True if signal of this name should be dumped
+        """
+        inc = self.include
+        if inc is not None and not any(fnmatchcase(name, p) for p in inc):
+            return False
+
+        exc = self.exclude
+        if exc is not None and any(fnmatchcase(name, p) for p in exc):
+            return False
+
+        return True
+
+    def vcdAddVar(self, scope: VcdVarWritingScope, sig, name: str,
+                  tName: str, width: int, formatter):
+        if sig in self._excluded:
+            return
+
+        path = [name, ]
+        s = scope
+        while isinstance(s, VcdVarWritingScope):
+            path.append(s.name)
+            s = s.parent
+
+        if self._isDumped(".".join(reversed(path))):
+            scope.addVar(sig, name, tName, width, formatter)
+        else:
+            self._excluded.add(sig)
+
+    def logChange(self, nowTime, sig, nextVal):
+        """
+        This method is called for every value change of any signal.
+        """
+        if nowTime != self._time:
+            if self._pending:
+                self._dumpPending()
+            self._time = nowTime
+            stopTime = self.stopTime
+            if stopTime is not None and nowTime >= stopTime:
+                self._stop()
+                return
+
+        if sig in self.vcdWriter._idScope:
+            self._pending[sig] = nextVal
+
+    @internal
+    def _dumpPending(self):
+        t = self._time
+        pending = self._pending
+        self._pending = {}
+        if t < self.startTime:
+            self._lastVal.update(pending)
+            return
+
+        if not self._started:
+            self._started = True
+            lastVal = self._lastVal
+            self._lastVal = None
+            if t == self.startTime:
+                lastVal.update(pending)
+                pending = lastVal
+            else:
+                self._dumpValues(self.startTime, lastVal)
+
+        self._dumpValues(t, pending)
+
+    @internal
+    def _dumpValues(self, t, values):
+        idScope = self.vcdWriter._idScope
+        lastDumped = self._lastDumped
+        lines = ["#%d\n" % t]
+        for sig, v in values.items():
+            varInfo = idScope[sig]
+            s = varInfo.valueFormatter(sig, v, varInfo)
+            if lastDumped.get(sig, None) != s:
+                lastDumped[sig] = s
+                lines.append(s)
+
+        if len(lines) == 1:
+            # nothing changed
+            return
+
+        data = "".join(lines)
+        self._buff.append(data)
+        self._buffLen += len(data)
+        if self._buffLen >= self.bufferSize:
+            self._writeBuff()
+
+    @internal
+    def _writeBuff(self):
+        if self._buff:
+            self.vcdWriter._oFile.write("".join(self._buff))
+            self._buff = []
+            self._buffLen = 0
+
+    @internal
+    def _stop(self):
+        # disable logging of changes in simulator
+        self.logChange = None
+        self.flush()
+
+    def flush(self):
+        """
+        Write all buffered changes to dumpFile
+        """
+        if self._pending:
+            self._dumpPending()
+        self._writeBuff()
+        self.vcdWriter._oFile.flush()
+
+    def close(self):
+        """
+        Flush the buffer and close dumpFile if it was opened by this object
+        """
+        f = self.vcdWriter._oFile
+        if f.closed:
+            return
+        self.flush()
+        if self._ownsDumpFile:
+            f.close()
+
+    def afterSim(self, simulator, synthesisedUnit):
+        """
+        This method is called after simulation of unit ends.
+        """
+        if self._pending:
+            self._dumpPending()
+
+        if not self._started and simulator.now >= self.startTime:
+            # there was not any change after startTime
+            self._started = True
+            self._dumpValues(self.startTime, self._lastVal)
+            self._lastVal = None
+
+        self.close()
@@ -10,7 +10,6 @@ from hwt.hdl.types.bool import HBool
 from hwt.hdl.types.defs import BIT
 from hwt.hdl.types.enum import HEnum
 from hwt.hdl.waitStm import WaitStm
-from hwt.serializer.vhdl.serializer import VhdlSerializer
 from hwt.simulator.hdlSimConfig import HdlSimConfig
 from hwt.synthesizer.interfaceLevel.interfaceUtils.utils import \
     walkPhysInterfaces
@@ -123,6 +122,9 @@ class HdlSimConfigVhdlTestbench(HdlSimConfig):
         )
 
     def dump(self, dumpFile=sys.stdout):
+        # imported here because serializer is not required for simulation
+        from hwt.serializer.vhdl.serializer import VhdlSerializer
+
         for proc in self.tbArch.processes:
             proc.statements.append(WaitStm(None))
 
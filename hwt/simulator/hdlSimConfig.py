@@ -6,6 +6,7 @@ class HdlSimConfig():
     def __init__(self):
         # set to None to prevent redundant calls
         self.beforeSim = None
+        self.afterSim = None
         self.logChange = None
         self.logPropagation = None
         self.logApplyingValues = None
@@ -15,6 +16,11 @@ class HdlSimConfig():
         called beforee preparing of simulation
         """
 
+    def afterSim(self, simulator, synthesisedUnit):
+        """
+        called after simulation of unit ends
+        """
+
     def logChange(self, nowTime, sig, nextVal):
         """
         Log change of value for signal
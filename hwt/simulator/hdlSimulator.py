@@ -1,13 +1,18 @@
+from collections import deque
 from heapq import heappush, heappop
+from types import GeneratorType
 from typing import Tuple, Generator, Callable
 
 from hwt.doc_markers import internal
+from hwt.hdl.types.arrayVal import HArrayVal
+from hwt.hdl.types.struct import HStruct
 from hwt.hdl.value import Value
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 from hwt.simulator.hdlSimConfig import HdlSimConfig
 from hwt.simulator.simModel import mkUpdater, mkArrayUpdater
 from hwt.simulator.simSignal import SimSignal
 from hwt.simulator.utils import valueHasChanged
+from hwt.synthesizer.interfaceLevel.mainBases import InterfaceBase
 from hwt.synthesizer.unit import Unit
 
 
@@ -23,6 +28,72 @@ def isEvDependentOn(sig, process) -> bool:
         or process in sig.simRisingSensProcs
 
 
+@internal
+def _toSimSignal(sig) -> SimSignal:
+    """
+    :return: SimSignal for signal, interface or SimSignalHandle
+    """
+    # getattr with default does not raise AttributeError internally
+    # (raising of exception is slow)
+    return getattr(sig, "_sigInside", sig)
+
+
+@internal
+def _castValue(val, t) -> Value:
+    """
+    Convert value to value of type t, returned value is owned by caller
+    """
+    if isinstance(val, Value):
+        v = val._auto_cast(t)
+        if v is val:
+            # value will be owned by signal
+            v = val.clone()
+        return v
+    else:
+        return t.fromPy(val)
+
+
+@internal
+def _mkWriteUpdater(v: Value):
+    return lambda curentV: (valueHasChanged(curentV, v), v)
+
+
+@internal
+def _flattenIntfValue(val, intf, vals: list, sigs: list) -> None:
+    """
+    Collect values and signals for write of value to interface
+    (used by HdlSimulator.writeIntf)
+    """
+    if not isinstance(intf, InterfaceBase) or not intf._interfaces:
+        vals.append(val)
+        sigs.append(intf)
+        return
+
+    structT = getattr(intf, "_structT", None)
+    if isinstance(structT, HStruct):
+        if val is None:
+            val = {}
+        isDict = isinstance(val, dict)
+        for f in structT.fields:
+            if f.name is None:
+                continue
+            if isDict:
+                v = val.get(f.name, None)
+            else:
+                v = getattr(val, f.name)
+            _flattenIntfValue(v, getattr(intf, f.name), vals, sigs)
+        return
+
+    if val is None:
+        val = [None for _ in intf._interfaces]
+    elif len(val) != len(intf._interfaces):
+        raise ValueError("Number of values does not match number of"
+                         " child interfaces", intf, val)
+
+    for v, i in zip(val, intf._interfaces):
+        _flattenIntfValue(v, i, vals, sigs)
+
+
 @internal
 class IoContainer():
     """
@@ -90,42 +161,125 @@ def raise_StopSimulation(sim):
     yield
 
 
-@internal
-class CalendarItem():
-    def __init__(self, time, priority, value):
-        self.key = (time, priority)
-        self.value = value
-
-    def __lt__(self, other):
-        return self.key < other.key
+PRIORITY_URGENT = 0
+PRIORITY_NORMAL = PRIORITY_URGENT + 1
+# updating of combinational signals (wire updates)
+PRIORITY_APPLY_COMB = PRIORITY_NORMAL + 1
+# simulation agents waiting for combUpdate event
+PRIORITY_AGENTS_UPDATE_DONE = PRIORITY_APPLY_COMB + 1
+# updateing of event dependent signals (writing in gegisters,rams etc)
+PRIORITY_APPLY_SEQ = PRIORITY_AGENTS_UPDATE_DONE + 1
+PRIORITY_CNT = PRIORITY_APPLY_SEQ + 1
 
 
 @internal
 class SimCalendar():
     """
     Priority queue where key is time and priority
+
+    Implemented as time wheel, there is a FIFO for each priority in each time
+    slot and heap is used only to sort distinct times.
+    (Most of events is planed on few times with few priorities, this
+    avoids allocation of item object and tuple comparison for each event.)
+
+    :note: events with same time and priority are popped in order
+        in which they were pushed (FIFO). Older heap based implementation
+        popped them in an order given by the layout of the heap, because
+        of this simulations where processes with same time and priority
+        depend on order of their execution (f.e. processes which share
+        one random generator) may give different (but still deterministic)
+        results than before
+
+    :ivar _times: heap of times which have planed events
+    :ivar _slots: dictionary {time: list of deques (one for each priority)}
     """
+    __slots__ = ["_times", "_slots"]
 
     def __init__(self):
-        self._q = []
+        self._times = []
+        self._slots = {}
 
     def push(self, time: float, priority: int, value):
-        item = CalendarItem(time, priority, value)
-        heappush(self._q, item)
+        try:
+            slot = self._slots[time]
+        except KeyError:
+            slot = self._slots[time] = [deque() for _ in range(PRIORITY_CNT)]
+            heappush(self._times, time)
+
+        slot[priority].append(value)
 
     def pop(self) -> Tuple[float, int, object]:
-        item = heappop(self._q)
-        return (*item.key, item.value)
+        times = self._times
+        slots = self._slots
+        while True:
+            time = times[0]
+            for priority, q in enumerate(slots[time]):
+                if q:
+                    return (time, priority, q.popleft())
 
+            # all events from this time were processed, move on next time
+            heappop(times)
+            del slots[time]
 
-PRIORITY_URGENT = 0
-PRIORITY_NORMAL = PRIORITY_URGENT + 1
-# updating of combinational signals (wire updates)
-PRIORITY_APPLY_COMB = PRIORITY_NORMAL + 1
-# simulation agents waiting for combUpdate event
-PRIORITY_AGENTS_UPDATE_DONE = PRIORITY_APPLY_COMB + 1
-# updateing of event dependent signals (writing in gegisters,rams etc)
-PRIORITY_APPLY_SEQ = PRIORITY_AGENTS_UPDATE_DONE + 1
+
+class ClockDomain():
+    """
+    Clock signals with same period and phase driven directly by simulator
+
+    Instance of ClockDomain is a simulation process (callback) which is
+    scheduled only on clock edges, it writes new value to all clock signals
+    of this domain at once (sequential processes of all clocks are then
+    evaluated in the same delta step) and plans itself on next edge.
+    There is no generator, wait or type conversion for each edge.
+
+    :ivar period: period of clock signals
+    :ivar initWait: time from start of the domain to first half period
+    :ivar _halfPeriod: period / 2
+    :ivar _clks: list of tuples (SimSignal, (updater for 0, updater for 1))
+    :ivar _nextVal: 0/1 value which will be written on next edge
+    """
+    __slots__ = ["period", "initWait", "_halfPeriod", "_clks", "_nextVal"]
+
+    def __init__(self, period: float, initWait: float=0):
+        self.period = period
+        self.initWait = initWait
+        self._halfPeriod = period / 2
+        self._clks = []
+        self._nextVal = 1
+
+    def addClk(self, sim: "HdlSimulator", sig: SimSignal) -> None:
+        """
+        Add clock signal to this domain and write 0 to it
+        """
+        t = sig._dtype
+        updaters = (mkUpdater(t.fromPy(0), False),
+                    mkUpdater(t.fromPy(1), False))
+        self._clks.append((sig, updaters))
+        sig.simUpdateVal(sim, updaters[0])
+        if not sim._applyValPlaned and sim._needsApplyValues(sig):
+            sim._scheduleApplyValues()
+
+    def __call__(self, sim: "HdlSimulator") -> None:
+        """
+        Clock edge
+        """
+        v = self._nextVal
+        needsApply = False
+        for sig, updaters in self._clks:
+            sig.simUpdateVal(sim, updaters[v])
+            if not needsApply:
+                needsApply = sim._needsApplyValues(sig)
+
+        if needsApply and not sim._applyValPlaned:
+            sim._scheduleApplyValues()
+
+        self._nextVal = v ^ 1
+        sim._events.push(sim.now + self._halfPeriod, PRIORITY_NORMAL, self)
+
+    def __repr__(self):
+        return "<%s period:%r initWait:%r %r>" % (
+            self.__class__.__name__, self.period, self.initWait,
+            [sig for sig, _ in self._clks])
 
 
 class HdlSimulator():
@@ -181,16 +335,29 @@ class HdlSimulator():
         running sequential (rising/falling event) dependent processes to reevaluate
     :ivar _valuesToApply: is container of values
         which should be applied in this delta step
-    :ivar _combProcsToRun: list of hdl processes to run
-    :ivar _seqProcsToRun: list of rising/falling event dependent processes
+    :ivar _combProcsToRun: OrderedSet of hdl processes to run
+    :ivar _seqProcsToRun: OrderedSet of rising/falling event dependent processes
         which should be evaluated after all combinational changes are applied
     :ivar _outputContainers: dictionary {SimSignal:IoContainer} for each hdl process
     :ivar _events: heap of simulation events and processes
+    :ivar levelized: flag, if True combinational processes which are not
+        part of combinational loop are evaluated in static (topological) order
+        and their outputs are applied immediately, this means that each
+        of them is evaluated only once in delta step
+        (processes in combinational loops are evaluated by regular delta steps)
+    :ivar _rankedProcs: list of combinational processes in topological order
+    :ivar _procRank: dictionary {process: index in _rankedProcs}
+    :ivar _rankedProcsToRun: heap of ranks of ranked processes to evaluate
+    :ivar _rankedProcsPlaned: set of ranks in _rankedProcsToRun
+    :ivar eventCnt: number of events (processes and Event instances)
+        executed by this simulator
+    :ivar _clockDomains: dictionary {(period, initWait, start time):
+        ClockDomain}
     """
 
     wait = Wait
 
-    def __init__(self, config=None):
+    def __init__(self, config=None, levelized=False):
         super(HdlSimulator, self).__init__()
         if config is None:
             # default config
@@ -207,12 +374,20 @@ class HdlSimulator():
         # new round of processes
         #  will be executed
         self._valuesToApply = []
-        self._seqProcsToRun = UniqList()
-        self._combProcsToRun = UniqList()
+        self._seqProcsToRun = OrderedSet()
+        self._combProcsToRun = OrderedSet()
         # container of outputs for every process
         self._outputContainers = {}
         self._events = SimCalendar()
 
+        self.levelized = levelized
+        self._rankedProcs = []
+        self._procRank = {}
+        self._rankedProcsToRun = []
+        self._rankedProcsPlaned = set()
+        self.eventCnt = 0
+        self._clockDomains = {}
+
     @internal
     def _add_process(self, proc, priority) -> None:
         """
@@ -233,6 +408,16 @@ class HdlSimulator():
         else:
             return self.combUpdateDoneEv
 
+    def callOnCombUpdate(self,
+                         callback: Callable[["HdlSimulator"], None]) -> None:
+        """
+        Callback based alternative of yield sim.waitOnCombUpdate(),
+        callback(simulator) is called directly by simulator
+        when all combinational updates are done in this delta step
+        (if callback returns a generator it is run as a process)
+        """
+        self.waitOnCombUpdate().process_to_wake.append(callback)
+
     @internal
     def _addHdlProcToRun(self, trigger: SimSignal, proc) -> None:
         """
@@ -252,7 +437,12 @@ class HdlSimulator():
                 return  # pass event dependent on startup
             self._seqProcsToRun.append(proc)
         else:
-            self._combProcsToRun.append(proc)
+            rank = self._procRank.get(proc, None)
+            if rank is None:
+                self._combProcsToRun.append(proc)
+            elif rank not in self._rankedProcsPlaned:
+                self._rankedProcsPlaned.add(rank)
+                heappush(self._rankedProcsToRun, rank)
 
     @internal
     def _initUnitSignals(self, unit: Unit) -> None:
@@ -264,8 +454,7 @@ class HdlSimulator():
         # set initial value to all signals and propagate it
         for s in unit._ctx.signals:
             if s.defVal.vldMask:
-                v = s.defVal.clone()
-                s.simUpdateVal(self, mkUpdater(v, False))
+                s.simUpdateVal(self, mkUpdater(s.defVal, False))
 
         for u in unit._units:
             self._initUnitSignals(u)
@@ -284,13 +473,59 @@ class HdlSimulator():
             self._outputContainers[p] = SpecificIoContainer(outputs)
 
     @internal
-    def __deleteCombUpdateDoneEv(self) -> Generator[None, None, None]:
+    def _levelizeCombProcesses(self, unit: Unit) -> None:
+        """
+        Resolve static evaluation order of combinational processes
+        (topological sort of graph process -> output signal -> sensitive process)
+
+        :note: processes in combinational loops and processes dependent
+            on them are not ranked and they are evaluated in regular delta steps
+        """
+        evDependentProcs = set()
+
+        def collectEvDependentProcs(u):
+            for s in u._ctx.signals:
+                evDependentProcs.update(s.simRisingSensProcs)
+                evDependentProcs.update(s.simFallingSensProcs)
+
+            for _u in u._units:
+                collectEvDependentProcs(_u)
+
+        collectEvDependentProcs(unit)
+
+        combProcs = [p for p in self._outputContainers
+                     if p not in evDependentProcs]
+        successors = {}
+        inDegree = {p: 0 for p in combProcs}
+        for p in combProcs:
+            succ = OrderedSet()
+            for _, s in self._outputContainers[p]._all_signals:
+                for dep in s.simSensProcs:
+                    if dep in inDegree:
+                        succ.append(dep)
+
+            successors[p] = succ
+            for dep in succ:
+                inDegree[dep] += 1
+
+        order = [p for p in combProcs if not inDegree[p]]
+        # order is extended during iteration
+        for p in order:
+            for dep in successors[p]:
+                d = inDegree[dep] - 1
+                inDegree[dep] = d
+                if not d:
+                    order.append(dep)
+
+        self._rankedProcs = order
+        self._procRank = {p: i for i, p in enumerate(order)}
+
+    @internal
+    def __deleteCombUpdateDoneEv(self, sim) -> None:
         """
         Callback called on combUpdateDoneEv finished
         """
         self._combUpdateDonePlaned = False
-        return
-        yield
 
     @internal
     def _scheduleCombUpdateDoneEv(self) -> Event:
@@ -300,7 +535,7 @@ class HdlSimulator():
         """
         assert not self._combUpdateDonePlaned, self.now
         cud = Event(self)
-        cud.process_to_wake.append(self.__deleteCombUpdateDoneEv())
+        cud.process_to_wake.append(self.__deleteCombUpdateDoneEv)
         self._add_process(cud, PRIORITY_AGENTS_UPDATE_DONE)
         self._combUpdateDonePlaned = True
         self.combUpdateDoneEv = cud
@@ -362,7 +597,46 @@ class HdlSimulator():
                     setattr(cont, sigName, None)
                     # else value is latched
 
-        self._combProcsToRun = UniqList()
+        # queue is reused in next delta step
+        self._combProcsToRun.clear()
+
+    @internal
+    def _runRankedCombProcesses(self) -> None:
+        """
+        Evaluate planed ranked combinational processes in static order,
+        outputs are applied immediately, so processes dependent on them
+        are evaluated later in this same delta step
+        """
+        toRun = self._rankedProcsToRun
+        planed = self._rankedProcsPlaned
+        procs = self._rankedProcs
+        lav = self.config.logApplyingValues
+        addSp = self._seqProcsToRun.append
+
+        while toRun:
+            rank = heappop(toRun)
+            planed.remove(rank)
+            proc = procs[rank]
+            cont = self._outputContainers[proc]
+            proc(self, cont)
+
+            va = []
+            for sigName, sig in cont._all_signals:
+                newVal = getattr(cont, sigName)
+                if newVal is not None:
+                    updater, isEvDependent = self._conflictResolveStrategy(
+                        newVal)
+                    va.append((sig, updater, isEvDependent, proc))
+                    setattr(cont, sigName, None)
+
+            if va and lav:
+                lav(self, va)
+
+            for s, vUpdater, isEventDependent, comesFrom in va:
+                if isEventDependent:
+                    addSp(comesFrom)
+                else:
+                    s.simUpdateVal(self, vUpdater)
 
     @internal
     def _runSeqProcesses(self) -> Generator[None, None, None]:
@@ -382,7 +656,8 @@ class HdlSimulator():
             if outContainer is not None:
                 updates.append(outContainer)
 
-        self._seqProcsToRun = UniqList()
+        # queue is reused, new processes can be added from simUpdateVal below
+        self._seqProcsToRun.clear()
         self._runSeqProcessesPlaned = False
 
         for cont in updates:
@@ -422,6 +697,9 @@ class HdlSimulator():
                 # regular combinational process
                 s.simUpdateVal(self, vUpdater)
 
+        if self._rankedProcsToRun:
+            self._runRankedCombProcesses()
+
         self._runCombProcesses()
 
         # processes triggered from simUpdateVal can add new values
@@ -434,52 +712,133 @@ class HdlSimulator():
     def read(self, sig) -> Value:
         """
         Read value from signal or interface
+
+        :attention: returned value is shared with the signal
+            and it must not be modified, value of signal is replaced
+            by new instance on every change (only values of arrays are updated
+            in place and because of this they are copied)
         """
-        try:
-            v = sig._val
-        except AttributeError:
-            v = sig._sigInside._val
+        v = getattr(sig, "_sigInside", sig)._val
+        if isinstance(v, HArrayVal):
+            return v.clone()
+        return v
 
-        return v.clone()
+    def readMany(self, sigs) -> list:
+        """
+        Read values of multiple signals or interfaces
 
-    def write(self, val, sig: SimSignal)-> None:
+        :return: list of values in same order as sigs
+            (same rules as for read() are applied)
         """
-        Write value to signal or interface.
+        res = []
+        for s in sigs:
+            v = getattr(s, "_sigInside", s)._val
+            if isinstance(v, HArrayVal):
+                v = v.clone()
+            res.append(v)
+        return res
+
+    def readIntf(self, intf):
         """
-        # get target RtlSignal
-        try:
-            simSensProcs = sig.simSensProcs
-        except AttributeError:
-            sig = sig._sigInside
-            simSensProcs = sig.simSensProcs
+        Read value of all signals of interface
 
-        # type cast of input value
-        t = sig._dtype
+        :return: value for interface with signal, value of HStruct
+            for StructIntf with HStruct type, tuple of values
+            of child interfaces (in order of _interfaces) for other interfaces
+        """
+        if not isinstance(intf, InterfaceBase) or not intf._interfaces:
+            return self.read(intf)
 
-        if isinstance(val, Value):
-            v = val.clone()
-            v = v._auto_cast(t)
-        else:
-            v = t.fromPy(val)
+        structT = getattr(intf, "_structT", None)
+        if isinstance(structT, HStruct):
+            return structT.fromPy({
+                f.name: self.readIntf(getattr(intf, f.name))
+                for f in structT.fields if f.name is not None
+            })
 
+        return tuple(self.readIntf(i) for i in intf._interfaces)
+
+    @internal
+    def _needsApplyValues(self, sig: SimSignal) -> bool:
+        """
+        :return: True if write to signal has to schedule _applyValues
+            because nothing else will schedule it
+        """
+        if not (sig.simSensProcs or
+                sig.simRisingSensProcs or
+                sig.simFallingSensProcs):
+            # signal value was changed but there are no sensitive processes
+            # to it because of this _applyValues is never planed
+            # and should be
+            return True
+        # signal write did not caused any change on any other signal
+        # but there are still simulation agets waiting on
+        # updateComplete event
+        return sig.hasWriteCallbacks()
+
+    def write(self, val, sig: SimSignal)-> None:
+        """
+        Write value to signal or interface.
+        """
+        sig = _toSimSignal(sig)
+        self._updateSignal(_castValue(val, sig._dtype), sig)
+
+    @internal
+    def _updateSignal(self, v: Value, sig: SimSignal) -> None:
+        """
+        Write value of the type of the signal (owned by the signal)
+        to SimSignal
+        """
         # can not update value in signal directly due singnal proxies
         sig.simUpdateVal(self, lambda curentV: (
             valueHasChanged(curentV, v), v))
 
-        if not self._applyValPlaned:
-            if not (simSensProcs or
-                    sig.simRisingSensProcs or
-                    sig.simFallingSensProcs):
-                # signal value was changed but there are no sensitive processes
-                # to it because of this _applyValues is never planed
-                # and should be
-                self._scheduleApplyValues()
-            elif (sig._writeCallbacks or
-                  sig._writeCallbacksToEn):
-                # signal write did not caused any change on any other signal
-                # but there are still simulation agets waiting on
-                # updateComplete event
-                self._scheduleApplyValues()
+        if not self._applyValPlaned and self._needsApplyValues(sig):
+            self._scheduleApplyValues()
+
+    def writeMany(self, vals, sigs) -> None:
+        """
+        Write values to multiple signals or interfaces,
+        signals are updated in order and _applyValues is scheduled only once
+
+        :param vals: sequence of values (Value instances or python values)
+        :param sigs: sequence of signals or interfaces of same length as vals
+        """
+        needsApply = False
+        # last resolved signal and its type
+        lastT = None
+        for val, sig in zip(vals, sigs):
+            sig = _toSimSignal(sig)
+            t = sig._dtype
+            if t is not lastT:
+                lastT = t
+                fromPy = t.fromPy
+
+            if isinstance(val, Value):
+                v = _castValue(val, t)
+            else:
+                v = fromPy(val)
+
+            sig.simUpdateVal(self, _mkWriteUpdater(v))
+            if not needsApply:
+                needsApply = self._needsApplyValues(sig)
+
+        if needsApply and not self._applyValPlaned:
+            self._scheduleApplyValues()
+
+    def writeIntf(self, val, intf) -> None:
+        """
+        Write value to all signals of interface
+
+        :param val: value for interface with signal,
+            for StructIntf value of its HStruct or dict {field name: value},
+            for other interfaces sequence of values of child interfaces
+            (in order of _interfaces)
+        """
+        vals = []
+        sigs = []
+        _flattenIntfValue(val, intf, vals, sigs)
+        self.writeMany(vals, sigs)
 
     def run(self, until: float) -> None:
         """
@@ -493,15 +852,25 @@ class HdlSimulator():
 
         # add handle to stop simulation
         schedule(until, PRIORITY_URGENT, raise_StopSimulation(self))
+        eventCnt = 0
 
         try:
             # for all events
             while True:
                 nextTime, priority, process = next_event()
+                eventCnt += 1
                 self.now = nextTime
-                # process is python generator or Event
-                if isinstance(process, Event):
-                    process = iter(process)
+                # process is python generator, Event or callback
+                if process.__class__ is not GeneratorType:
+                    if isinstance(process, Event):
+                        process = iter(process)
+                    elif callable(process):
+                        # function(simulator) which does not have to wait,
+                        # it may return a generator (f.e. overridden
+                        # agent hook) which is then run as a process
+                        process = process(self)
+                        if process is None:
+                            continue
 
                 # run process or activate processes dependent on Event
                 while True:
@@ -528,10 +897,38 @@ class HdlSimulator():
 
         except StopSimumulation:
             return
+        finally:
+            self.eventCnt += eventCnt
+
+    def addClk(self, sig, period: float, initWait: float=0) -> ClockDomain:
+        """
+        Drive clock signal, 0 is written to it now and after initWait
+        it starts oscillating with specified period
+        (first edge is rising edge after initWait + period / 2)
+
+        Clock signals added in same time with same period and initWait
+        share the ClockDomain and they are updated in the same simulation
+        event.
+
+        :param sig: clock signal or interface
+        :return: ClockDomain of this clock signal
+        """
+        key = (period, initWait, self.now)
+        d = self._clockDomains.get(key, None)
+        if d is None:
+            d = self._clockDomains[key] = ClockDomain(period, initWait)
+            self._events.push(self.now + initWait + d._halfPeriod,
+                              PRIORITY_NORMAL, d)
+
+        d.addClk(self, _toSimSignal(sig))
+        return d
 
     def add_process(self, proc) -> None:
         """
         Add process to events with default priority on current time
+
+        :param proc: generator or callback function(simulator),
+            if callback returns a generator it is run as a process
         """
         self._events.push(self.now, PRIORITY_NORMAL, proc)
 
@@ -548,4 +945,11 @@ class HdlSimulator():
             add_proc(p(self))
 
         self._initUnitSignals(synthesisedUnit)
+        if self.levelized:
+            self._levelizeCombProcesses(synthesisedUnit)
+
         self.run(until)
+
+        afterSim = getattr(self.config, "afterSim", None)
+        if afterSim is not None:
+            afterSim(self, synthesisedUnit)
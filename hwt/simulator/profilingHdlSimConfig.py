@@ -0,0 +1,365 @@
+from collections import defaultdict
+import json
+import sys
+from time import perf_counter
+from typing import Optional
+
+from hwt.doc_markers import internal
+from hwt.simulator.hdlSimConfig import HdlSimConfig
+
+
+class ProfilingHdlSimConfig(HdlSimConfig):
+    """
+    Simulator config which measures where the simulation time is spent
+
+    * number of evaluations and cumulative wall time of each hdl process
+      (generated HWProcess method of simulation model)
+    * number of steps and cumulative wall time of each agent/simulation
+      process (time includes the propagation of values written by it)
+    * number of value propagations of each SimSignal, its cumulative
+      wall time and number of hdl processes triggered by it
+    * number of delta steps in each time, events per second
+
+    Other config (f.e. VcdHdlSimConfig) can be wrapped by this config,
+    its callbacks are still called. Use enableProfiling(simulator)
+    to profile any HdlSimulator.
+
+    :ivar config: wrapped simulator config (or None)
+    :ivar hdlProcs: dictionary {name: [evaluation count, time]}
+    :ivar simProcs: dictionary {name: [step count, time]}
+    :ivar signals: dictionary {name: [propagation count, time,
+        triggered hdl processes count]}
+    :ivar deltaSteps: dictionary {simulation time: number of delta steps}
+    :ivar eventCnt: number of events executed by simulator during profiling
+    :ivar wallTime: wall time of simulation in seconds
+    """
+
+    def __init__(self, config: Optional[HdlSimConfig]=None):
+        # HdlSimConfig.__init__ is not called because logChange
+        # and logApplyingValues are resolved from wrapped config
+        self.config = config
+        self.beforeSim = self._beforeSim
+        self.afterSim = self._afterSim
+        self.logPropagation = self._logPropagationCnt
+
+        self.hdlProcs = defaultdict(lambda: [0, 0.0])
+        self.simProcs = defaultdict(lambda: [0, 0.0])
+        self.signals = defaultdict(lambda: [0, 0.0, 0])
+        self.deltaSteps = defaultdict(int)
+        self.eventCnt = 0
+        self.wallTime = 0.0
+        self._sigNames = {}
+        self._startTime = None
+        self._startEventCnt = 0
+
+    @property
+    def logChange(self):
+        c = self.config
+        return None if c is None else c.logChange
+
+    @property
+    def logApplyingValues(self):
+        c = self.config
+        return None if c is None else c.logApplyingValues
+
+    @internal
+    def _beforeSim(self, simulator, synthesisedUnit):
+        c = self.config
+        if c is not None and c.beforeSim:
+            c.beforeSim(simulator, synthesisedUnit)
+
+        self._instrumentSimulator(simulator)
+        wrapped = {}
+        signals = []
+        self._instrumentModel(synthesisedUnit, synthesisedUnit._name,
+                              wrapped, signals)
+        self._instrumentSignals(wrapped, signals)
+        self._startEventCnt = simulator.eventCnt
+        self._startTime = perf_counter()
+
+    @internal
+    def _afterSim(self, simulator, synthesisedUnit):
+        self.wallTime += perf_counter() - self._startTime
+        self.eventCnt += simulator.eventCnt - self._startEventCnt
+
+        c = self.config
+        if c is not None:
+            afterSim = getattr(c, "afterSim", None)
+            if afterSim:
+                afterSim(simulator, synthesisedUnit)
+
+    @internal
+    def _logPropagationCnt(self, simulator, signal, proceses):
+        self.signals[self._sigNames.get(signal, signal.name)][2] += \
+            len(proceses)
+        c = self.config
+        log = None if c is None else c.logPropagation
+        if log:
+            log(simulator, signal, proceses)
+
+    @internal
+    def _instrumentSimulator(self, simulator):
+        """
+        Wrap methods of simulator to measure agent processes
+        and delta steps
+        """
+        add_process = simulator.add_process
+        simProcs = self.simProcs
+
+        def profiledAddProcess(proc):
+            if callable(proc):
+                proc = self._wrapCallback(proc)
+            elif not isinstance(proc, _ProfiledProcess):
+                proc = _ProfiledProcess(proc, simProcs)
+            add_process(proc)
+
+        simulator.add_process = profiledAddProcess
+
+        scheduleApplyValues = simulator._scheduleApplyValues
+        deltaSteps = self.deltaSteps
+
+        def profiledScheduleApplyValues():
+            deltaSteps[simulator.now] += 1
+            scheduleApplyValues()
+
+        simulator._scheduleApplyValues = profiledScheduleApplyValues
+
+    @internal
+    def _instrumentModel(self, model, path: str, wrapped: dict,
+                         signals: list):
+        """
+        Replace hdl processes of model and its children by wrappers
+        which measure them
+
+        :param wrapped: dictionary {original process: wrapper}
+        :param signals: list of tuples (name, signal) of signals of the model
+        """
+        for p in model._processes:
+            wrapped[p] = self._wrapHdlProc(p, "%s.%s" % (path, p.__name__))
+
+        model._processes = [wrapped[p] for p in model._processes]
+        model._outputs = {wrapped[p]: o for p, o in model._outputs.items()}
+        signals.extend(("%s.%s" % (path, s.name), s)
+                       for s in model._ctx.signals)
+
+        for u in model._units:
+            self._instrumentModel(u, "%s.%s" % (path, u._name),
+                                  wrapped, signals)
+
+    @internal
+    def _instrumentSignals(self, wrapped: dict, signals: list):
+        """
+        Update sensitivity of signals to wrapped processes
+        and wrap the propagation of signals
+        """
+        for name, s in signals:
+            self._sigNames[s] = name
+            # signal can be connected to processes of parent and child model
+            for procs in (s.simSensProcs,
+                          s.simRisingSensProcs,
+                          s.simFallingSensProcs):
+                toReplace = [p for p in procs if p in wrapped]
+                for p in toReplace:
+                    procs.remove(p)
+                    procs.add(wrapped[p])
+            self._wrapSignal(s, self.signals[name])
+
+    @internal
+    def _wrapHdlProc(self, proc, name: str):
+        stat = self.hdlProcs[name]
+
+        def profiledProc(sim, io):
+            t = perf_counter()
+            proc(sim, io)
+            stat[1] += perf_counter() - t
+            stat[0] += 1
+
+        profiledProc.__name__ = proc.__name__
+        return profiledProc
+
+    @internal
+    def _wrapCallback(self, callback):
+        """
+        Wrap callback (function(simulator)) scheduled as simulation process
+        """
+        stat = self.simProcs[_ProfiledProcess._procName(callback)]
+
+        def profiledCallback(sim):
+            t = perf_counter()
+            callback(sim)
+            stat[1] += perf_counter() - t
+            stat[0] += 1
+
+        return profiledCallback
+
+    @staticmethod
+    @internal
+    def _wrapSignal(sig, stat):
+        # simulation model signals are class attributes, original method
+        # has to be used if the model is profiled again
+        simPropagateChanges = sig.__class__.simPropagateChanges.__get__(sig)
+
+        def profiledPropagateChanges(*args):
+            t = perf_counter()
+            simPropagateChanges(*args)
+            stat[1] += perf_counter() - t
+            stat[0] += 1
+
+        sig.simPropagateChanges = profiledPropagateChanges
+
+    def eventsPerSecond(self) -> float:
+        if self.wallTime == 0:
+            return 0.0
+        return self.eventCnt / self.wallTime
+
+    def getReport(self) -> dict:
+        """
+        :return: dictionary with results of profiling which can be
+            serialized to json, items are sorted by time (descending)
+        """
+        def items(stats, keys):
+            res = []
+            for name, v in sorted(stats.items(), key=lambda x: -x[1][1]):
+                d = {"name": name}
+                d.update(zip(keys, v))
+                res.append(d)
+            return res
+
+        deltaHist = defaultdict(int)
+        for cnt in self.deltaSteps.values():
+            deltaHist[cnt] += 1
+
+        return {
+            "wallTime": self.wallTime,
+            "eventCnt": self.eventCnt,
+            "eventsPerSecond": self.eventsPerSecond(),
+            "hdlProcesses": items(self.hdlProcs, ("count", "time")),
+            "simProcesses": items(self.simProcs, ("count", "time")),
+            "signals": items(self.signals,
+                             ("count", "time", "triggeredProcesses")),
+            "deltaSteps": {
+                "total": sum(self.deltaSteps.values()),
+                "times": len(self.deltaSteps),
+                "max": max(self.deltaSteps.values(), default=0),
+                # {delta steps in time: number of such times}
+                "histogram": {str(k): v for k, v in sorted(deltaHist.items())},
+            },
+        }
+
+    def dumpJson(self, file):
+        """
+        Write report to file as json
+
+        :param file: file object or name of the file
+        """
+        rep = self.getReport()
+        if isinstance(file, str):
+            with open(file, "w") as f:
+                json.dump(rep, f, indent=2)
+        else:
+            json.dump(rep, file, indent=2)
+
+    def printReport(self, file=sys.stdout, limit: Optional[int]=20):
+        """
+        Print human readable report of the most expensive items
+
+        :param limit: max number of items in each table (None for all)
+        """
+        rep = self.getReport()
+        w = file.write
+        w("wall time %.3fs, %d events, %.1f events/s\n" % (
+            rep["wallTime"], rep["eventCnt"], rep["eventsPerSecond"]))
+        ds = rep["deltaSteps"]
+        w("delta steps: %d in %d times (max %d in single time)\n" % (
+            ds["total"], ds["times"], ds["max"]))
+
+        for title, key, hasFanOut in [
+                ("hdl processes", "hdlProcesses", False),
+                ("simulation processes (agents)", "simProcesses", False),
+                ("signal propagation", "signals", True)]:
+            w("\n%s:\n" % title)
+            w("%12s %10s %12s%s  name\n" % (
+                "time [s]", "count", "avg [us]",
+                " %10s" % "fan-out" if hasFanOut else ""))
+            for item in rep[key][:limit]:
+                cnt = item["count"]
+                avg = item["time"] / cnt * 1e6 if cnt else 0.0
+                fanOut = ""
+                if hasFanOut:
+                    fanOut = " %10d" % item["triggeredProcesses"]
+                w("%12.6f %10d %12.2f%s  %s\n" % (
+                    item["time"], cnt, avg, fanOut, item["name"]))
+
+
+@internal
+class _ProfiledProcess():
+    """
+    Wrapper of simulation process (generator) which measures time spent
+    in it, processes spawned by it are wrapped as well
+
+    :ivar proc: wrapped generator
+    :ivar stat: [step count, time] of this process in stats
+    :ivar stats: dictionary {name: [step count, time]}, name is qualified
+        name of the generator function (and name of the interface
+        of agent if available)
+    """
+    __slots__ = ["proc", "stat", "stats"]
+
+    def __init__(self, proc, stats):
+        self.proc = proc
+        self.stats = stats
+        self.stat = stats[self._procName(proc)]
+
+    @staticmethod
+    def _procName(proc) -> str:
+        name = getattr(proc, "__qualname__", None)
+        if name is None:
+            return proc.__class__.__qualname__
+
+        obj = getattr(proc, "__self__", None)
+        frame = getattr(proc, "gi_frame", None)
+        if frame is not None:
+            obj = frame.f_locals.get("self", None)
+        if obj is not None:
+            # agents have intf, callback loops have sig
+            intf = getattr(obj, "intf", None)
+            if intf is None:
+                intf = getattr(obj, "sig", None)
+            if intf is not None:
+                try:
+                    intfName = intf._getFullName()
+                except AttributeError:
+                    intfName = getattr(intf, "name", None)
+                if intfName is not None:
+                    name = "%s(%s)" % (name, intfName)
+        return name
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        stat = self.stat
+        t = perf_counter()
+        try:
+            ev = next(self.proc)
+        finally:
+            stat[1] += perf_counter() - t
+            stat[0] += 1
+
+        if hasattr(ev, "gi_frame") and not isinstance(ev, _ProfiledProcess):
+            # new process spawned by this process
+            ev = _ProfiledProcess(ev, self.stats)
+        return ev
+
+
+def enableProfiling(simulator) -> ProfilingHdlSimConfig:
+    """
+    Replace config of simulator by ProfilingHdlSimConfig
+    which wraps the original config
+
+    :attention: has to be called before simUnit
+    :return: profiling config with results
+    """
+    c = ProfilingHdlSimConfig(simulator.config)
+    simulator.config = c
+    return c
@@ -6,8 +6,7 @@ from types import ModuleType
 from typing import Optional
 
 from hwt.doc_markers import internal
-from hwt.hdl.constants import Time
-from hwt.serializer.simModel.serializer import SimModelSerializer
+from hwt.hdl.constants import Time, SENSITIVITY
 from hwt.simulator.agentConnector import autoAddAgents
 from hwt.simulator.hdlSimulator import HdlSimulator
 from hwt.simulator.simModel import SimModel
@@ -20,7 +19,8 @@ from hwt.synthesizer.utils import toRtl
 
 def simPrepare(unit: Unit, modelCls: Optional[SimModel]=None,
                targetPlatform=DummyPlatform(),
-               dumpModelIn: str=None, onAfterToRtl=None):
+               dumpModelIn: str=None, onAfterToRtl=None,
+               serializer="simModel", modelCache=None):
     """
     Create simulation model and connect it with interfaces of original unit
     and decorate it with agents
@@ -33,29 +33,45 @@ def simPrepare(unit: Unit, modelCls: Optional[SimModel]=None,
         (if is None sim model will be constructed only in memory)
     :param onAfterToRtl: callback fn(unit, modelCls) which will be called
         after unit will be synthesised to rtl
+    :param serializer: serializer used to generate simulation model
+        (SimModelSerializer or IntSimModelSerializer, class or name
+        from hwt.serializer.registry.SERIALIZERS)
+    :param modelCache: optional SimModelCache instance, if specified
+        the simulation model is loaded from this cache if possible
+        (not used if modelCls, dumpModelIn or onAfterToRtl is specified,
+        because cached model is used without elaboration of the unit)
 
     :return: tuple (fully loaded unit with connected sim model,
         connected simulation model,
         simulation processes of agents
         )
     """
-    if modelCls is None:
-        modelCls = toSimModel(
-            unit, targetPlatform=targetPlatform, dumpModelIn=dumpModelIn)
+    if modelCls is None and dumpModelIn is None and onAfterToRtl is None\
+            and modelCache is not None:
+        # unit is connected to model by the cache
+        modelCls = modelCache.toSimModel(
+            unit, targetPlatform=targetPlatform, serializer=serializer)
     else:
-        # to instantiate hierarchy of unit
-        toSimModel(unit)
+        if modelCls is None:
+            modelCls = toSimModel(
+                unit, targetPlatform=targetPlatform, dumpModelIn=dumpModelIn,
+                serializer=serializer)
+        else:
+            # to instantiate hierarchy of unit
+            toSimModel(unit)
+
+        if onAfterToRtl:
+            onAfterToRtl(unit, modelCls)
 
-    if onAfterToRtl:
-        onAfterToRtl(unit, modelCls)
+        reconnectUnitSignalsToModel(unit, modelCls)
 
-    reconnectUnitSignalsToModel(unit, modelCls)
     model = modelCls()
     procs = autoAddAgents(unit)
     return unit, model, procs
 
 
-def toSimModel(unit, targetPlatform=DummyPlatform(), dumpModelIn=None):
+def toSimModel(unit, targetPlatform=DummyPlatform(), dumpModelIn=None,
+               serializer="simModel"):
     """
     Create a simulation model for unit
 
@@ -63,11 +79,12 @@ def toSimModel(unit, targetPlatform=DummyPlatform(), dumpModelIn=None):
     :param targetPlatform: target platform for this synthes
     :param dumpModelIn: folder to where put sim model files
         (otherwise sim model will be constructed only in memory)
+    :param serializer: serializer used to generate simulation model
     """
     sim_code = toRtl(unit,
                      targetPlatform=targetPlatform,
                      saveTo=dumpModelIn,
-                     serializer=SimModelSerializer)
+                     serializer=serializer)
     if dumpModelIn is not None:
         d = os.path.join(os.getcwd(), dumpModelIn)
         dInPath = d in sys.path
@@ -158,12 +175,22 @@ def _simUnitVcd(simModel, stimulFunctions, outputFile, until):
 
 
 class CallbackLoop(object):
+    """
+    :cvar EDGE: SENSITIVITY.ANY/RISING/FALLING, the edge of sig on which
+        callback is executed (filtered by sig itself, the process of callback
+        is not created at all for other changes)
+    """
+    EDGE = SENSITIVITY.ANY
+
     def __init__(self, sig: SimSignal, fn, shouldBeEnabledFn):
         """
         :param sig: signal on which write callback should be used
         :attention: if condFn is None callback function is always executed
 
         :ivra fn: function/generator which is callback which should be executed
+            (function is called directly by simulator, it can use
+            sim.callOnCombUpdate(callback) instead of
+            yield sim.waitOnCombUpdate())
         :ivar isGenerator: flag if callback function is generator
             or normal function
         :ivar _callbackIndex: index of callback in write callbacks on sig,
@@ -191,13 +218,18 @@ class CallbackLoop(object):
             c = self.onWriteCallback
         else:
             c = None
-        self.sig._writeCallbacks[self._callbackIndex] = c
+        self.sig.getWriteCallbacks(self.EDGE)[self._callbackIndex] = c
 
     def onWriteCallback(self, sim):
+        """
+        :return: simulation process which executes fn, generator of fn
+            or fn itself if it is not a generator function
+            (it is then called directly by simulator)
+        """
         if self.isGenerator:
-            yield from self.fn(sim)
+            return self.fn(sim)
         else:
-            self.fn(sim)
+            return self.fn
 
     def __call__(self, sim):
         """
@@ -205,45 +237,37 @@ class CallbackLoop(object):
         """
         self._callbackIndex = self.sig.registerWriteCallback(
             self.onWriteCallback,
-            self.shouldBeEnabledFn)
+            self.shouldBeEnabledFn,
+            self.EDGE)
         return
         yield
 
 
 class OnRisingCallbackLoop(CallbackLoop):
-
-    def onWriteCallback(self, sim):
-        if bool(sim.read(self.sig)._onRisingEdge__val(sim.now)):
-            if self.isGenerator:
-                yield from self.fn(sim)
-            else:
-                self.fn(sim)
+    """
+    CallbackLoop executed only on rising edge of sig
+    """
+    EDGE = SENSITIVITY.RISING
 
 
 class OnFallingCallbackLoop(CallbackLoop):
-
-    def onWriteCallback(self, sim):
-        if bool(sim.read(self.sig)._onFallingEdge__val(sim.now)):
-            if self.isGenerator:
-                yield from self.fn(sim)
-            else:
-                self.fn(sim)
+    """
+    CallbackLoop executed only on falling edge of sig
+    """
+    EDGE = SENSITIVITY.FALLING
 
 
 def oscilate(sig, period=10 * Time.ns, initWait=0):
     """
     Oscillative simulation driver for your signal
     (usually used as clk generator)
+
+    :note: signal is driven by ClockDomain of simulator
+        (see HdlSimulator.addClk)
     """
     def oscillateStimul(s):
-        s.write(False, sig)
-        halfPeriod = period / 2
-        yield s.wait(initWait)
-
-        while True:
-            yield s.wait(halfPeriod)
-            s.write(True, sig)
-            yield s.wait(halfPeriod)
-            s.write(False, sig)
+        s.addClk(sig, period, initWait)
+        return
+        yield
 
     return oscillateStimul
@@ -82,13 +82,23 @@ def mkUpdater(nextVal: Value, invalidate: bool):
     :param invalidate: flag which tells if value has been compromised
         and if it should be invaidated
     :return: function(value) -> tuple(valueHasChangedFlag, nextVal)
-    """
 
-    def updater(currentVal):
-        _nextVal = nextVal.clone()
-        if invalidate:
+    :note: nextVal is often shared (constant of model or value of other
+        signal), value stored in signal has to be owned by signal
+        because its updateTime is set, because of this nextVal
+        is copied, but only if it changes value of signal
+    """
+    if invalidate:
+        def updater(currentVal):
+            _nextVal = nextVal.clone()
             _nextVal.vldMask = 0
-        return (valueHasChanged(currentVal, _nextVal), _nextVal)
+            return (valueHasChanged(currentVal, _nextVal), _nextVal)
+    else:
+        def updater(currentVal):
+            if valueHasChanged(currentVal, nextVal):
+                return (True, nextVal.clone())
+            else:
+                return (False, nextVal)
     return updater
 
 
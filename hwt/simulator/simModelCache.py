@@ -0,0 +1,420 @@
+from hashlib import sha256
+import inspect
+from itertools import chain
+import json
+import marshal
+import os
+import re
+import sys
+import sysconfig
+import tempfile
+from types import ModuleType
+from typing import Optional
+
+from hwt.doc_markers import internal
+from hwt.hdl.constants import INTF_DIRECTION
+from hwt.serializer.registry import getSerializer
+from hwt.synthesizer.dummyPlatform import DummyPlatform
+from hwt.synthesizer.param import Param
+from hwt.synthesizer.unit import Unit
+from hwt.synthesizer.utils import toRtl
+
+
+# attributes of unit instance which are not part of its configuration
+_UNIT_NON_CONFIG_ATTRS = {"_parent", "_lazyLoaded", "_ctx", "_params",
+                          "_setAttrListener"}
+# repr of object which does not have better repr than its address
+_ADDRESS_IN_REPR = re.compile(r" at 0x[0-9a-fA-F]+")
+# directories of standard library and installed packages, modules from
+# there are not checked for modifications
+_LIBRARY_DIRS = tuple(sorted({
+    os.path.join(os.path.abspath(p), "")
+    for p in (sysconfig.get_paths().get(n, None)
+              for n in ("stdlib", "platstdlib", "purelib", "platlib"))
+    if p}))
+
+
+@internal
+def _hwtVersion() -> str:
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return "unknown"
+    try:
+        return version("hwt")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@internal
+def _defaultCacheDir() -> str:
+    cacheHome = os.environ.get("XDG_CACHE_HOME", None)
+    if not cacheHome:
+        cacheHome = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cacheHome, "hwt", "sim_model_cache")
+
+
+@internal
+def _walkUnits(u: Unit):
+    yield u
+    for su in u._units:
+        yield from _walkUnits(su)
+
+
+@internal
+def _walkInterfaces(intf, path):
+    """
+    :return: generator of tuples (path, interface) for intf
+        and all its sub interfaces
+    """
+    yield path, intf
+    for i in intf._interfaces:
+        yield from _walkInterfaces(i, path + (i._name, ))
+
+
+@internal
+def _classDependencies(cls, files: set, modules: set):
+    """
+    Add source files of cls and its base classes to files
+    and names of their modules to modules
+    """
+    for c in cls.__mro__:
+        modules.add(c.__module__)
+        try:
+            f = inspect.getsourcefile(c)
+        except TypeError:
+            # builtin class
+            continue
+        if f is not None:
+            files.add(os.path.abspath(f))
+
+
+@internal
+def _moduleDependencies(modules: set, files: set):
+    """
+    Add source files of modules and of all modules used by them
+    (transitively, trough module globals) to files,
+    modules from standard library and installed packages are skipped
+    """
+    seen = set()
+    toWalk = list(modules)
+    while toWalk:
+        name = toWalk.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        m = sys.modules.get(name, None)
+        f = getattr(m, "__file__", None)
+        if f is None:
+            # builtin module or module which is not loaded
+            continue
+        f = os.path.abspath(f)
+        if f.startswith(_LIBRARY_DIRS):
+            continue
+        files.add(f)
+        for v in list(vars(m).values()):
+            if isinstance(v, ModuleType):
+                toWalk.append(v.__name__)
+            else:
+                # function/class/object imported from other module
+                mName = getattr(v, "__module__", None)
+                if isinstance(mName, str):
+                    toWalk.append(mName)
+
+
+class SimModelCache():
+    """
+    Persistent cache of simulation models generated by toSimModel
+
+    Generated source of the model and its compiled code are stored
+    in cacheDir and are reused across tests and processes.
+    The key of the model is derived from the class of the unit,
+    its configuration (values of params and other instance attributes
+    set before elaboration), serializer, target platform, hwt version
+    and python version. Source files of units and interfaces from which
+    the model was generated and of modules used by their modules
+    (f.e. helper functions used in _impl) are checked for modification
+    on load.
+    Least recently used items are removed if size of the cache exceeds
+    maxSize.
+
+    :attention: on cache hit the unit is not elaborated,
+        only declarations of its interfaces are loaded and interfaces
+        are connected to signals of simulation model,
+        because of this onAfterToRtl callbacks and features which require
+        elaborated unit (f.e. unit._entity) are not available
+    :attention: modules from standard library and installed packages
+        (site-packages) are not checked and modules which are used
+        only indirectly (f.e. imported inside of a function) may not be
+        discovered, the cache has to be cleared (cacheDir removed)
+        after modification of such modules
+    :note: units which configuration can not be converted to string
+        (f.e. objects without __repr__) are not cached
+    :note: code from cacheDir is executed, because of this cacheDir
+        is created with permissions only for the current user and it is not
+        used if it is owned by other user or if it is writable by others
+
+    :ivar cacheDir: directory where cached models are stored
+        (~/.cache/hwt/sim_model_cache by default)
+    :ivar maxSize: maximum size of cacheDir in bytes
+    :ivar _loaded: dictionary {key: (code object of model, record)}
+        of models already loaded in this process
+    """
+    DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, cacheDir: Optional[str]=None,
+                 maxSize: int=DEFAULT_MAX_SIZE):
+        if cacheDir is None:
+            cacheDir = _defaultCacheDir()
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self._loaded = {}
+
+    def toSimModel(self, unit: Unit, targetPlatform=DummyPlatform(),
+                   serializer="simModel"):
+        """
+        Same as hwt.simulator.shortcuts.toSimModel but model is loaded
+        from the cache if it is available
+
+        :note: interfaces of the unit are connected to the simulation model
+            (reconnectUnitSignalsToModel does not have to be called
+            on returned model class)
+        :return: simulation model class
+        """
+        serializer = getSerializer(serializer)
+        key = self.getKey(unit, targetPlatform, serializer)
+        if key is None:
+            return self._build(unit, targetPlatform, serializer, None)
+
+        item = self._loaded.get(key, None)
+        if item is None:
+            item = self._load(key)
+            if item is None:
+                return self._build(unit, targetPlatform, serializer, key)
+            self._loaded[key] = item
+
+        code, record = item
+        modelCls = self._exec(code, record["name"])
+        self._reuse(unit, targetPlatform, modelCls, record)
+        return modelCls
+
+    def getKey(self, unit: Unit, targetPlatform, serializer) -> Optional[str]:
+        """
+        :return: key of simulation model for unit or None if model
+            for this unit can not be cached
+        """
+        if hasattr(unit, "_interfaces"):
+            # declarations were already loaded and we are not able
+            # to resolve if the unit was modified after
+            return None
+
+        cls = unit.__class__
+        conf = [cls.__module__, cls.__qualname__,
+                serializer.__module__, serializer.__qualname__,
+                _hwtVersion(), sys.implementation.cache_tag]
+        for name, v in sorted(unit.__dict__.items(), key=lambda x: x[0]):
+            if name in _UNIT_NON_CONFIG_ATTRS:
+                continue
+            if isinstance(v, Param):
+                v = v.get()
+            conf.append("%s=%r" % (name, v))
+
+        for name, v in sorted(targetPlatform.__dict__.items(),
+                              key=lambda x: x[0]):
+            conf.append("%s=%r" % (name, v))
+        conf.append(repr(targetPlatform.__class__))
+
+        conf = "\n".join(conf)
+        if _ADDRESS_IN_REPR.search(conf):
+            return None
+
+        return sha256(conf.encode("utf-8")).hexdigest()
+
+    @internal
+    def _exec(self, code, name):
+        simModule = ModuleType('simModule')
+        exec(code, simModule.__dict__)
+        return simModule.__dict__[name]
+
+    @internal
+    def _paths(self, key):
+        """
+        :return: tuple (source file, record file, code file)
+        """
+        base = os.path.join(self.cacheDir, key)
+        return base + ".py", base + ".json", base + ".code"
+
+    @internal
+    def _isCacheDirSafe(self) -> bool:
+        """
+        Create cacheDir if it does not exist and check that it can not be
+        modified by other users (files from it are executed)
+        """
+        os.makedirs(self.cacheDir, mode=0o700, exist_ok=True)
+        st = os.stat(self.cacheDir)
+        getuid = getattr(os, "getuid", None)
+        if getuid is not None and st.st_uid != getuid():
+            return False
+        return not (st.st_mode & 0o022)
+
+    @internal
+    def _build(self, unit, targetPlatform, serializer, key):
+        """
+        Generate simulation model, connect unit to it and store it
+        in the cache if key is not None
+        """
+        # import there because of cyclic dependency
+        from hwt.simulator.shortcuts import reconnectUnitSignalsToModel
+
+        sim_code = toRtl(unit,
+                         targetPlatform=targetPlatform,
+                         serializer=serializer)
+        if key is None:
+            srcFile = "<string>"
+        else:
+            srcFile, _, _ = self._paths(key)
+        code = compile(sim_code, srcFile, "exec")
+        modelCls = self._exec(code, unit._name)
+        reconnectUnitSignalsToModel(unit, modelCls)
+
+        if key is not None:
+            record = self._mkRecord(unit, serializer)
+            self._loaded[key] = (code, record)
+            try:
+                self._store(key, sim_code, code, record)
+            except OSError:
+                # cache is only optimization, simulation can continue
+                pass
+
+        return modelCls
+
+    @internal
+    def _mkRecord(self, unit, serializer):
+        deps = set()
+        modules = set()
+        _classDependencies(serializer, deps, modules)
+        interfaces = []
+        for u in _walkUnits(unit):
+            _classDependencies(u.__class__, deps, modules)
+            for i in chain(u._interfaces, u._private_interfaces):
+                for path, si in _walkInterfaces(i, (i._name, )):
+                    _classDependencies(si.__class__, deps, modules)
+                    if u is unit and si._isExtern:
+                        if si._interfaces:
+                            sigName = None
+                        else:
+                            sigName = si._sigInside.name
+                        interfaces.append((list(path),
+                                           si._direction.name,
+                                           sigName))
+
+        _moduleDependencies(modules, deps)
+
+        depStats = []
+        for f in sorted(deps):
+            st = os.stat(f)
+            depStats.append([f, st.st_mtime, st.st_size])
+
+        return {
+            "name": unit._name,
+            "interfaces": interfaces,
+            "dependencies": depStats,
+        }
+
+    @internal
+    def _store(self, key, sim_code, code, record):
+        if not self._isCacheDirSafe():
+            return
+        srcFile, recordFile, codeFile = self._paths(key)
+
+        # record is written last, model is not loaded without it
+        for fileName, content, mode in [
+                (srcFile, sim_code, "w"),
+                (codeFile, marshal.dumps(code), "wb"),
+                (recordFile, json.dumps(record), "w")]:
+            fd, tmp = tempfile.mkstemp(dir=self.cacheDir)
+            try:
+                with os.fdopen(fd, mode) as f:
+                    f.write(content)
+                os.replace(tmp, fileName)
+            except BaseException:
+                os.remove(tmp)
+                raise
+
+        self._evict()
+
+    @internal
+    def _load(self, key):
+        """
+        :return: tuple (code object, record) or None if model is not
+            in the cache or it is outdated
+        """
+        _, recordFile, codeFile = self._paths(key)
+        try:
+            if not self._isCacheDirSafe():
+                return None
+            with open(recordFile) as f:
+                record = json.load(f)
+            for fileName, mtime, size in record["dependencies"]:
+                st = os.stat(fileName)
+                if st.st_mtime != mtime or st.st_size != size:
+                    return None
+            with open(codeFile, "rb") as f:
+                code = marshal.load(f)
+            # mark as recently used
+            os.utime(recordFile)
+        except (OSError, EOFError, ValueError, KeyError, TypeError):
+            return None
+
+        return code, record
+
+    @internal
+    def _evict(self):
+        """
+        Remove least recently used models until size of the cache
+        is not larger than maxSize
+        """
+        items = {}
+        for fileName in os.listdir(self.cacheDir):
+            key, ext = os.path.splitext(fileName)
+            if ext not in (".py", ".json", ".code"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.cacheDir, fileName))
+            except OSError:
+                continue
+            lastUse, size = items.get(key, (0, 0))
+            if ext == ".json":
+                lastUse = st.st_mtime
+            items[key] = (lastUse, size + st.st_size)
+
+        total = sum(size for _, size in items.values())
+        for key, (_, size) in sorted(items.items(), key=lambda x: x[1][0]):
+            if total <= self.maxSize:
+                break
+            for fileName in self._paths(key):
+                try:
+                    os.remove(fileName)
+                except OSError:
+                    pass
+            total -= size
+
+    @internal
+    def _reuse(self, unit, targetPlatform, modelCls, record):
+        """
+        Prepare unit for simulation on cached model
+        without elaboration of the unit
+        """
+        unit._loadDeclarations()
+        unit._targetPlatform = targetPlatform
+        unit._name = record["name"]
+
+        interfaces = {}
+        for i in unit._interfaces:
+            interfaces.update(_walkInterfaces(i, (i._name, )))
+
+        for path, direction, sigName in record["interfaces"]:
+            intf = interfaces[tuple(path)]
+            intf._direction = INTF_DIRECTION[direction]
+            if sigName is not None:
+                intf._sigInside = getattr(modelCls, sigName)
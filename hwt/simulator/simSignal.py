@@ -1,4 +1,5 @@
 from hwt.doc_markers import internal
+from hwt.hdl.constants import SENSITIVITY
 from hwt.hdl.variables import SignalItem
 
 
@@ -7,23 +8,59 @@ class SimSignal(SignalItem):
     """
     Class of signal simulation functions
 
-    :ivar _writeCallbacks: list of callback functions(signal, simulator)
+    :ivar _writeCallbacks: list of callback functions(simulator)
         which is called when new (changed) value is written to this signal
+        (None for disabled callback)
+    :ivar _risingWriteCallbacks: same as _writeCallbacks but callbacks are
+        called only if the new value is fully valid and non zero
+        (rising edge of 1b signal)
+    :ivar _fallingWriteCallbacks: same as _writeCallbacks but callbacks are
+        called only if the new value is fully valid zero
+        (falling edge of 1b signal)
+    :ivar _writeCallbacksToEn: list of tuples (callback list, index,
+        callback, getEnFn) of callbacks waiting for registration
     """
-    __slots__ = ["name", "_val", "_oldVal", "_writeCallbacks",
-                 "simSensProcs", "simRisingSensProcs", "simFallingSensProcs"]
+    # __dict__ because signals of simulation model are extended
+    # by simulator configs (e.g. profiling wraps simPropagateChanges)
+    __slots__ = ["_writeCallbacks", "_risingWriteCallbacks",
+                 "_fallingWriteCallbacks", "_writeCallbacksToEn",
+                 "simSensProcs", "simRisingSensProcs", "simFallingSensProcs",
+                 "__dict__"]
 
     def __init__(self, ctx, name, dtype, defVal=None):
         ctx.signals.add(self)
         self.hidden = False
         self._writeCallbacks = []
+        self._risingWriteCallbacks = []
+        self._fallingWriteCallbacks = []
         self._writeCallbacksToEn = []
         self.simSensProcs = set()
         self.simRisingSensProcs = set()
         self.simFallingSensProcs = set()
         super(SimSignal, self).__init__(name, dtype, defVal)
 
-    def registerWriteCallback(self, callback, getEnFn) -> int:
+    def getWriteCallbacks(self, edge=SENSITIVITY.ANY) -> list:
+        """
+        :param edge: SENSITIVITY.ANY/RISING/FALLING
+        :return: list of write callbacks for specified edge
+        """
+        if edge == SENSITIVITY.ANY:
+            return self._writeCallbacks
+        elif edge == SENSITIVITY.RISING:
+            return self._risingWriteCallbacks
+        elif edge == SENSITIVITY.FALLING:
+            return self._fallingWriteCallbacks
+        else:
+            raise ValueError(edge)
+
+    def hasWriteCallbacks(self) -> bool:
+        return bool(self._writeCallbacks or
+                    self._risingWriteCallbacks or
+                    self._fallingWriteCallbacks or
+                    self._writeCallbacksToEn)
+
+    def registerWriteCallback(self, callback, getEnFn,
+                              edge=SENSITIVITY.ANY) -> int:
         """
         Register writeCallback for signal.
         Registration is evaluated at the end of deltastep of simulator.
@@ -31,19 +68,24 @@ class SimSignal(SignalItem):
         :param callback: simulation process represented by function(simulator)
             which should be called after update of this signal
         :param getEnFn: function() to get initial value for enable of callback
+        :param edge: SENSITIVITY.ANY to call callback on any change,
+            SENSITIVITY.RISING/FALLING to call it only on rising/falling edge
+            (callbacks for other edge are not even scheduled)
+        :return: index of callback in getWriteCallbacks(edge)
         """
-        index = len(self._writeCallbacks)
-        self._writeCallbacks.append(None)
-        self._writeCallbacksToEn.append((index, callback, getEnFn))
+        callbacks = self.getWriteCallbacks(edge)
+        index = len(callbacks)
+        callbacks.append(None)
+        self._writeCallbacksToEn.append((callbacks, index, callback, getEnFn))
         return index
 
     def _loadWriteCallbacks(self):
         wc = self._writeCallbacksToEn
         self._writeCallbacksToEn = []
         # perform registration of new write callbacks
-        for i, callback, reqEnFn in wc:
+        for callbacks, i, callback, reqEnFn in wc:
             if reqEnFn():
-                self._writeCallbacks[i] = callback
+                callbacks[i] = callback
 
     def simPropagateChanges(self, simulator):
         v = self._val
@@ -65,6 +107,16 @@ class SimSignal(SignalItem):
                 # run simulation processes which are activated
                 simulator.add_process(c(simulator))
 
+        if self._risingWriteCallbacks or self._fallingWriteCallbacks:
+            if v._isFullVld():
+                if v.val:
+                    callbacks = self._risingWriteCallbacks
+                else:
+                    callbacks = self._fallingWriteCallbacks
+                for c in callbacks:
+                    if c:
+                        simulator.add_process(c(simulator))
+
         if self.simRisingSensProcs:
             if v.val or not v.vldMask:
                 if log:
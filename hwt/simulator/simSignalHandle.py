@@ -0,0 +1,77 @@
+from hwt.hdl.types.arrayVal import HArrayVal
+from hwt.hdl.value import Value
+
+
+class SimSignalHandle():
+    """
+    Signal of interface resolved once for simulation agent
+    (agents are instantiated after the interfaces are connected
+    to the simulation model), access trough handle does not have to probe
+    attributes of interface on every read/write
+
+    Handle can be also used in HdlSimulator.read/write instead
+    of signal or interface.
+
+    :ivar _sigInside: SimSignal (or SimSignalLane) of this handle
+    :ivar _dtype: type of signal
+    :ivar _fromPy: fromPy method of _dtype (cached type conversion)
+    :ivar _allMask: all_mask() of _dtype or None if type does not have it
+    """
+    __slots__ = ["_sigInside", "_dtype", "_fromPy", "_allMask"]
+
+    def __init__(self, sigOrIntf):
+        """
+        :param sigOrIntf: SimSignal, interface with signal
+            or other SimSignalHandle
+        """
+        sig = getattr(sigOrIntf, "_sigInside", sigOrIntf)
+        assert sig is not None, (sigOrIntf, "is not connected to simulation")
+        self._sigInside = sig
+        t = self._dtype = sig._dtype
+        self._fromPy = t.fromPy
+        try:
+            self._allMask = t.all_mask()
+        except AttributeError:
+            self._allMask = None
+
+    @property
+    def val(self):
+        """
+        Value of signal as python value (the .val of Value)
+        """
+        return self._sigInside._val.val
+
+    @property
+    def vld(self) -> bool:
+        """
+        True if value of signal is fully valid
+        """
+        v = self._sigInside._val
+        if self._allMask is None:
+            return v._isFullVld()
+        return v.vldMask == self._allMask
+
+    def read(self) -> Value:
+        """
+        Same as HdlSimulator.read(), returned value must not be modified
+        """
+        v = self._sigInside._val
+        if isinstance(v, HArrayVal):
+            return v.clone()
+        return v
+
+    def write(self, sim, val) -> None:
+        """
+        Same as HdlSimulator.write()
+        """
+        if isinstance(val, Value):
+            v = val._auto_cast(self._dtype)
+            if v is val:
+                # value will be owned by signal
+                v = val.clone()
+        else:
+            v = self._fromPy(val)
+        sim._updateSignal(v, self._sigInside)
+
+    def __repr__(self):
+        return "<%s %r>" % (self.__class__.__name__, self._sigInside)
@@ -2,6 +2,7 @@ from _random import Random
 from collections import deque
 from inspect import isgenerator
 import os
+import sys
 import unittest
 
 from hwt.doc_markers import internal
@@ -17,12 +18,22 @@ from hwt.simulator.vcdHdlSimConfig import VcdHdlSimConfig
 from hwt.synthesizer.dummyPlatform import DummyPlatform
 
 
+@internal
+def _isAgentArrayData(obj) -> bool:
+    # numpy (batch_sim extra) is not imported if AgentArrayData
+    # was not used, there can not be any instance of it
+    m = sys.modules.get("hwt.simulator.agentArrayData", None)
+    return m is not None and isinstance(obj, m.AgentArrayData)
+
+
 def allValuesToInts(sequenceOrVal):
     if isinstance(sequenceOrVal, HArrayVal):
         sequenceOrVal = sequenceOrVal.val
 
     if isinstance(sequenceOrVal, Value):
         return valToInt(sequenceOrVal)
+    elif _isAgentArrayData(sequenceOrVal):
+        return sequenceOrVal.toInts()
     elif not sequenceOrVal:
         return sequenceOrVal
     elif (isinstance(sequenceOrVal, (list, tuple, deque))
@@ -46,8 +57,15 @@ class SimTestCase(unittest.TestCase):
 
     :attention: self.model, self.procs has to be specified before running
         runSim (you can use prepareUnit method)
+    :cvar _simModelCache: SimModelCache instance used by prepareUnit
+        if modelCache is not specified (None means no caching)
+    :ivar _simRuns: list of tuples (output file name, number of events)
+        for each simulation run by runSim in this test
+        (None until first simulation if setUp was overridden)
     """
     _defaultSeed = 317
+    _simModelCache = None
+    _simRuns = None
 
     def getTestName(self):
         className, testName = self.id().split(".")[-2:]
@@ -73,6 +91,9 @@ class SimTestCase(unittest.TestCase):
             # run simulation, stimul processes are register after initial
             # initialization
             sim.simUnit(self.model, until=until, extraProcesses=self.procs)
+            if self._simRuns is None:
+                self._simRuns = []
+            self._simRuns.append((outputFileName, sim.eventCnt))
             return sim
 
     @internal
@@ -131,7 +152,19 @@ class SimTestCase(unittest.TestCase):
             datatype should be enforced.
         :param msg: Optional message to use on failure instead of a list of
             differences.
+        :note: if seq1 is AgentArrayData and seq2 is an array or sequence
+            of ints, whole arrays are compared at once and items
+            are converted only if they are not equal
         """
+        if _isAgentArrayData(seq1):
+            if seq_type is None and seq1.isEqualTo(seq2):
+                return
+            import numpy as np
+            if _isAgentArrayData(seq2):
+                seq2 = seq2.toInts()
+            elif isinstance(seq2, np.ndarray):
+                seq2 = seq2.tolist()
+
         seq1 = allValuesToInts(seq1)
         self.assertSequenceEqual(seq1, seq2, msg, seq_type)
 
@@ -159,7 +192,8 @@ class SimTestCase(unittest.TestCase):
         self.procs.append(randomEnProc)
 
     def prepareUnit(self, unit, modelCls=None, dumpModelIn=None,
-                    onAfterToRtl=None, targetPlatform=DummyPlatform()):
+                    onAfterToRtl=None, targetPlatform=DummyPlatform(),
+                    serializer="simModel", modelCache=None):
         """
         Create simulation model and connect it with interfaces of original unit
         and decorate it with agents and collect all simulation processes
@@ -171,13 +205,22 @@ class SimTestCase(unittest.TestCase):
             sim model will be constructed only in memory)
         :param onAfterToRtl: callback fn(unit) which will be called unit after
             it will be synthesised to rtl
+        :param serializer: serializer used to generate simulation model
+        :param modelCache: SimModelCache used to load simulation model
+            (if None self._simModelCache is used)
         """
+        if modelCache is None:
+            modelCache = self._simModelCache
+
         self.u, self.model, self.procs = simPrepare(
             unit,
             modelCls=modelCls,
             targetPlatform=targetPlatform,
             dumpModelIn=dumpModelIn,
-            onAfterToRtl=onAfterToRtl)
+            onAfterToRtl=onAfterToRtl,
+            serializer=serializer,
+            modelCache=modelCache)
 
     def setUp(self):
         self._rand = Random(self._defaultSeed)
+        self._simRuns = []
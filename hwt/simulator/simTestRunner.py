@@ -0,0 +1,210 @@
+from multiprocessing import Pool
+import sys
+from time import time
+import traceback
+from typing import List, Optional
+import unittest
+
+from hwt.doc_markers import internal
+from hwt.simulator.simModelCache import SimModelCache
+from hwt.simulator.simTestCase import SimTestCase
+
+
+class SimTestReport():
+    """
+    Result of a single test run by runTestsParallel
+
+    :ivar testId: id of the test (module.Class.method)
+    :ivar status: "ok", "fail", "error" or "skip"
+    :ivar details: formatted traceback of failure/error or reason of skip
+    :ivar wallTime: wall time of the test in seconds
+    :ivar eventCnt: number of simulation events executed in the test
+    :ivar vcdFiles: list of waveform files written by the test
+    """
+
+    def __init__(self, testId: str, status: str, details: str,
+                 wallTime: float, eventCnt: int, vcdFiles: List[str]):
+        self.testId = testId
+        self.status = status
+        self.details = details
+        self.wallTime = wallTime
+        self.eventCnt = eventCnt
+        self.vcdFiles = vcdFiles
+
+    def eventsPerSecond(self) -> float:
+        if self.wallTime == 0:
+            return 0.0
+        return self.eventCnt / self.wallTime
+
+    def __repr__(self):
+        return "<%s %s %s, %fs, %d events>" % (
+            self.__class__.__name__, self.testId, self.status,
+            self.wallTime, self.eventCnt)
+
+
+@internal
+def _iterTests(suite):
+    if isinstance(suite, unittest.TestSuite):
+        for t in suite:
+            yield from _iterTests(t)
+    else:
+        yield suite
+
+
+def collectTestIds(suite: unittest.TestSuite,
+                   simTestsOnly: bool=True) -> List[str]:
+    """
+    Flatten test suite to list of test ids
+
+    :param simTestsOnly: if True only tests from SimTestCase subclasses
+        are collected
+    """
+    return [t.id() for t in _iterTests(suite)
+            if not simTestsOnly or isinstance(t, SimTestCase)]
+
+
+@internal
+def _initWorker(modelCacheDir: Optional[str], useModelCache: bool):
+    if useModelCache:
+        # sim models are shared between all tests in this process
+        SimTestCase._simModelCache = SimModelCache(modelCacheDir)
+
+
+@internal
+def _runTest(testId: str) -> SimTestReport:
+    """
+    Run test in worker, any exception is reported as an error of the test
+    (exception in worker would stop the whole pool)
+    """
+    start = time()
+    try:
+        return _runTestInWorker(testId, start)
+    except Exception:
+        return SimTestReport(testId, "error", traceback.format_exc(),
+                             time() - start, 0, [])
+
+
+@internal
+def _runTestInWorker(testId: str, start: float) -> SimTestReport:
+    result = unittest.TestResult()
+    test = unittest.defaultTestLoader.loadTestsFromName(testId)
+
+    # TestSuite removes tests after run, we need them for statistics
+    tests = list(_iterTests(test))
+    for t in tests:
+        t.run(result)
+    wallTime = time() - start
+
+    details = ""
+    if result.errors:
+        status = "error"
+        details = "\n".join(err for _, err in result.errors)
+    elif result.failures:
+        status = "fail"
+        details = "\n".join(err for _, err in result.failures)
+    elif result.skipped:
+        status = "skip"
+        details = "\n".join(reason for _, reason in result.skipped)
+    else:
+        status = "ok"
+
+    eventCnt = 0
+    vcdFiles = []
+    for t in tests:
+        for fileName, evCnt in getattr(t, "_simRuns", None) or ():
+            vcdFiles.append(fileName)
+            eventCnt += evCnt
+
+    return SimTestReport(testId, status, details, wallTime, eventCnt,
+                         vcdFiles)
+
+
+def runTestsParallel(testIds: List[str], workers: Optional[int]=None,
+                     useModelCache: bool=False,
+                     modelCacheDir: Optional[str]=None) -> List[SimTestReport]:
+    """
+    Run tests in pool of processes, each test in its own task
+    (tests are loaded by unittest.defaultTestLoader.loadTestsFromName)
+
+    :param testIds: ids of tests to run (f.e. from collectTestIds)
+    :param workers: number of worker processes
+        (None means os.cpu_count())
+    :param useModelCache: if True SimModelCache is used in each worker
+        so simulation models are generated only once for each
+        configuration of unit
+        (test classes with own _simModelCache are not affected)
+    :attention: on cache hit the unit is not elaborated (see SimModelCache),
+        tests which use unit._entity or internal signals of the unit
+        should not be run with useModelCache
+    :param modelCacheDir: directory of SimModelCache (None for default)
+    :return: list of SimTestReport in order of testIds
+    """
+    with Pool(workers, initializer=_initWorker,
+              initargs=(modelCacheDir, useModelCache)) as pool:
+        return pool.map(_runTest, testIds, chunksize=1)
+
+
+def printTestReports(reports: List[SimTestReport], file=sys.stdout) -> bool:
+    """
+    Print results, wall times and simulation speed of tests
+
+    :return: True if all tests passed
+    """
+    ok = True
+    for r in reports:
+        file.write("%-5s %8.3fs %10d events %12.1f events/s %s\n" % (
+            r.status, r.wallTime, r.eventCnt, r.eventsPerSecond(), r.testId))
+
+    for r in reports:
+        if r.status in ("fail", "error"):
+            ok = False
+            file.write("\n%s: %s\n%s\n" % (r.status.upper(), r.testId,
+                                           r.details))
+    total = sum(r.wallTime for r in reports)
+    file.write("\nRan %d tests (%.3fs of test time), %s\n" % (
+        len(reports), total, "OK" if ok else "FAILED"))
+    return ok
+
+
+def main(argv=None):
+    """
+    Discover or load tests, run them in parallel and print results
+
+    usage: python -m hwt.simulator.simTestRunner [-j N] [-s DIR] [-p PATTERN]
+    [--model-cache] [test names...]
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Run SimTestCase tests in parallel")
+    parser.add_argument("tests", nargs="*",
+                        help="names of modules/classes/tests to run"
+                        " (if not specified tests are discovered)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of worker processes")
+    parser.add_argument("-s", "--start-directory", default=".",
+                        help="directory to start discovery")
+    parser.add_argument("-p", "--pattern", default="test*.py",
+                        help="pattern to match test files")
+    parser.add_argument("--all", action="store_true",
+                        help="run also tests which are not SimTestCase")
+    parser.add_argument("--model-cache", action="store_true",
+                        help="use SimModelCache in workers (units are not"
+                        " elaborated if their model is in the cache)")
+    parser.add_argument("--model-cache-dir", default=None)
+    args = parser.parse_args(argv)
+
+    loader = unittest.defaultTestLoader
+    if args.tests:
+        suite = loader.loadTestsFromNames(args.tests)
+    else:
+        suite = loader.discover(args.start_directory, pattern=args.pattern)
+
+    testIds = collectTestIds(suite, simTestsOnly=not args.all)
+    reports = runTestsParallel(testIds, workers=args.jobs,
+                               useModelCache=args.model_cache,
+                               modelCacheDir=args.model_cache_dir)
+    return 0 if printTestReports(reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
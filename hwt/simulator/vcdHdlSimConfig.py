@@ -70,11 +70,18 @@ class VcdHdlSimConfig(HdlSimConfig):
             if isinstance(t, self.supported_type_classes):
                 tName, width, formatter = vcdTypeInfoForHType(t)
                 try:
-                    parent.addVar(obj, getSignalName(obj),
-                                  tName, width, formatter)
+                    self.vcdAddVar(parent, obj, getSignalName(obj),
+                                   tName, width, formatter)
                 except VarAlreadyRegistered:
                     pass
 
+    def vcdAddVar(self, scope: VcdVarWritingScope, sig, name: str,
+                  tName: str, width: int, formatter):
+        """
+        Register signal in vcd scope
+        """
+        scope.addVar(sig, name, tName, width, formatter)
+
     def vcdRegisterRemainingSignals(self, unit: Union[Interface, Unit]):
         unitScope = self._obj2scope[unit]
         for s in unit._ctx.signals:
@@ -82,8 +89,8 @@ class VcdHdlSimConfig(HdlSimConfig):
                 t = s._dtype
                 if isinstance(t, self.supported_type_classes):
                     tName, width, formatter = vcdTypeInfoForHType(t)
-                    unitScope.addVar(s, getSignalName(
-                        s), tName, width, formatter)
+                    self.vcdAddVar(unitScope, s, getSignalName(s),
+                                   tName, width, formatter)
 
         for u in unit._units:
             self.vcdRegisterRemainingSignals(u)
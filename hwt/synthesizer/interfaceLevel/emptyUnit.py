@@ -14,9 +14,10 @@ class EmptyUnit(Unit):
     _defVal = None
 
     @internal
-    def _toRtl(self, targetPlatform):
+    def _toRtl(self, targetPlatform, elaborationCache=None):
         assert not self._wasSynthetised()
         self._targetPlatform = targetPlatform
+        self._elaborationCache = elaborationCache
 
         if not hasattr(self, "_name"):
             self._name = self._getDefaultName()
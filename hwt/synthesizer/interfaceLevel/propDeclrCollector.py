@@ -310,7 +310,8 @@ class PropDeclrCollector(object):
         """
         self._registerUnit(uName, u)
         u._loadDeclarations()
-        self._lazyLoaded.extend(u._toRtl(self._targetPlatform))
+        self._lazyLoaded.extend(u._toRtl(self._targetPlatform,
+                                         self._elaborationCache))
         u._signalsForMyEntity(self._ctx, "sig_" + uName)
 
     @internal
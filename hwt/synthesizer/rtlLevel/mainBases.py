@@ -2,11 +2,11 @@ class RtlSignalBase():
     """
     Main base class for all rtl signals
     """
-    pass
+    __slots__ = []
 
 
 class RtlMemoryBase(RtlSignalBase):
     """
     Main base class for all rtl memories
     """
-    pass
+    __slots__ = []
@@ -14,12 +14,12 @@ from hwt.hdl.statements import HdlStatement, HwtSyntaxError
 from hwt.hdl.types.defs import BIT
 from hwt.hdl.value import Value
 from hwt.pyUtils.arrayQuery import distinctBy, where
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 from hwt.synthesizer.exceptions import SigLvlConfErr
 from hwt.synthesizer.interfaceLevel.mainBases import InterfaceBase
 from hwt.synthesizer.rtlLevel.memory import RtlSyncSignal
 from hwt.synthesizer.rtlLevel.optimalizator import removeUnconnectedSignals, \
-    reduceProcesses
+    reduceProcesses, foldConstants
 from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwt.synthesizer.rtlLevel.signalUtils.exceptions import MultipleDriversErr,\
     NoDriverErr
@@ -74,9 +74,9 @@ def _statements_to_HWProcesses(_statements, tryToSolveCombLoops)\
         stms, _ = _stm._try_reduce()
         proc_statements.extend(stms)
 
-    outputs = UniqList()
-    _inputs = UniqList()
-    sensitivity = UniqList()
+    outputs = OrderedSet()
+    _inputs = OrderedSet()
+    sensitivity = OrderedSet()
     enclosed_for = set()
     for _stm in proc_statements:
         seen = set()
@@ -104,7 +104,7 @@ def _statements_to_HWProcesses(_statements, tryToSolveCombLoops)\
         for o in outputs:
             assert not o.hidden, o
         seen = set()
-        inputs = UniqList()
+        inputs = OrderedSet()
         for i in _inputs:
             inputs.extend(i._walk_public_drivers(seen))
 
@@ -227,6 +227,16 @@ class RtlNetlist():
     :ivar statements: list of all statements which are connected to signals in this context
     :ivar subUnits: is set of all units in this context
     :ivar synthesised: flag, True if synthesize method was called
+    :ivar _opCache: dictionary {(operator, result type, *operand keys):
+        result signal} used for hash-consing of operators (structurally
+        same expressions are represented by the same signal)
+    :ivar sharedOpCnt: number of operators which were not instantiated
+        because same operator was found in _opCache
+    :ivar removedCnt: tuple (number of removed signals, number of removed
+        operators, number of removed statements) from removal of unconnected
+        signals in synthesize (None before synthesis)
+    :ivar foldedSignals: list of signals which were replaced by constants
+        in synthesize (None before synthesis)
     """
 
     def __init__(self, parentForDebug=None):
@@ -236,6 +246,10 @@ class RtlNetlist():
         self.statements = set()
         self.subUnits = set()
         self.synthesised = False
+        self._opCache = {}
+        self.sharedOpCnt = 0
+        self.removedCnt = None
+        self.foldedSignals = None
 
     def sig(self, name, dtype=BIT, clk=None, syncRst=None, defVal=None):
         """
@@ -307,8 +321,11 @@ class RtlNetlist():
             ent.ports.append(pi)
             s.hidden = False
 
-        removeUnconnectedSignals(self)
+        self.removedCnt = removeUnconnectedSignals(self)
+        # cache may contain removed signals
+        self._opCache.clear()
         markVisibilityOfSignals(self, name, self.signals, intfSet)
+        self.foldedSignals = foldConstants(self)
 
         for proc in targetPlatform.beforeHdlArchGeneration:
             proc(self)
@@ -1,9 +1,14 @@
-from itertools import islice
+from typing import List
 
 from hwt.hdl.assignment import Assignment
+from hwt.hdl.ifContainter import IfContainer
 from hwt.hdl.operator import Operator
+from hwt.hdl.operatorDefs import AllOps
 from hwt.hdl.statements import IncompatibleStructure, HdlStatement
+from hwt.hdl.switchContainer import SwitchContainer
 from hwt.hdl.value import Value
+from hwt.synthesizer.param import Param
+from hwt.synthesizer.rtlLevel.rtlSignal import RtlSignal
 from hwt.pyUtils.arrayQuery import areSetsIntersets, groupedby
 from hwt.serializer.utils import maxStmId
 from hwt.hdl.process import HWProcess
@@ -14,53 +19,178 @@ from hwt.doc_markers import internal
 def removeUnconnectedSignals(netlist):
     """
     If signal is not driving anything remove it
+
+    Single worklist of signals without endpoints is drained,
+    for every signal the number of its endpoints which were not removed
+    yet is tracked, so the signal is scheduled for removal when
+    the counter reaches zero. Removed drivers are filtered out of
+    the endpoint lists at once at the end.
+
+    :return: tuple (number of removed signals, number of removed operators,
+        number of removed statements)
+    """
+    # {id(signal): number of endpoints which were not removed}
+    endpointCnt = {}
+    # signals which lost some endpoints but they are still used
+    partiallyUsed = []
+    # signals which lost all endpoints
+    unused = []
+    # ids of operators and statements which were removed
+    # (id is used because hash of operator is expensive)
+    removedDrivers = set()
+    removedSignals = set()
+    removedOperators = 0
+    removedStatements = 0
+
+    worklist = [sig for sig in netlist.signals if not sig.endpoints]
+
+    while worklist:
+        sig = worklist.pop()
+        if sig in removedSignals:
+            continue
+
+        try:
+            if sig._interface is not None:
+                # skip interfaces before we want to check them,
+                # they should not be optimized out from design
+                continue
+        except AttributeError:
+            pass
+
+        for e in sig.drivers:
+            # drivers of this signal are useless rm them
+            if isinstance(e, Operator):
+                inputs = e.operands
+                if e.result is sig:
+                    e.result = None
+            else:
+                inputs = e._inputs
+                netlist.statements.discard(e)
+
+            eId = id(e)
+            if eId in removedDrivers:
+                # statement with multiple outputs, already disconnected
+                continue
+            removedDrivers.add(eId)
+            if isinstance(e, Operator):
+                removedOperators += 1
+            else:
+                removedStatements += 1
+
+            seen = []
+            for op in inputs:
+                if isinstance(op, Value):
+                    continue
+                opId = id(op)
+                if opId in seen:
+                    # this operator has 2x+ same operand
+                    continue
+                seen.append(opId)
+
+                cnt = endpointCnt.get(opId, None)
+                if cnt is None:
+                    cnt = len(op.endpoints)
+                cnt -= 1
+                endpointCnt[opId] = cnt
+                if cnt == 0:
+                    worklist.append(op)
+                    unused.append(op)
+                else:
+                    partiallyUsed.append(op)
+
+        removedSignals.add(sig)
+        if sig.ctx == netlist:
+            netlist.signals.remove(sig)
+
+    # remove endpoints which were removed
+    for sig in partiallyUsed:
+        if endpointCnt.pop(id(sig), 0):
+            endpoints = sig.endpoints
+            alive = [e for e in endpoints if id(e) not in removedDrivers]
+            endpoints.clear()
+            endpoints.extend(alive)
+
+    for sig in unused:
+        sig.endpoints.clear()
+
+    return len(removedSignals), removedOperators, removedStatements
+
+
+@internal
+def _isFoldableConst(sig, cache: dict) -> bool:
     """
+    :return: True if signal is constant and its expression does not depend
+        on any Param (Params have to stay in HDL as they are)
+    :param cache: dictionary {signal: result} shared in a single pass
+    """
+    try:
+        return cache[sig]
+    except KeyError:
+        pass
+
+    if isinstance(sig, Param):
+        res = False
+    elif not sig.drivers:
+        # constant signal without driver (resolved in markVisibilityOfSignals)
+        res = sig._const
+    elif len(sig.drivers) != 1:
+        res = False
+    else:
+        d = sig.drivers[0]
+        res = isinstance(d, Operator)
+        if res:
+            for o in d.operands:
+                if not isinstance(o, Value) and not _isFoldableConst(o, cache):
+                    res = False
+                    break
+
+    cache[sig] = res
+    return res
+
 
-    toDelete = set()
-    toSearch = netlist.signals
-
-    while toSearch:
-        _toSearch = set()
-
-        for sig in toSearch:
-            if not sig.endpoints:
-                try:
-                    if sig._interface is not None:
-                        # skip interfaces before we want to check them,
-                        # they should not be optimized out from design
-                        continue
-                except AttributeError:
-                    pass
-
-                for e in sig.drivers:
-                    # drivers of this signal are useless rm them
-                    if isinstance(e, Operator):
-                        inputs = e.operands
-                        if e.result is sig:
-                            e.result = None
-                    else:
-                        inputs = e._inputs
-                        netlist.statements.discard(e)
-
-                    for op in inputs:
-                        if not isinstance(op, Value):
-                            try:
-                                op.endpoints.remove(e)
-                            except KeyError:
-                                # this operator has 2x+ same operand
-                                continue
-
-                            _toSearch.add(op)
-
-                toDelete.add(sig)
-
-        if toDelete:
-            for sig in toDelete:
-                if sig.ctx == netlist:
-                    netlist.signals.remove(sig)
-                _toSearch.discard(sig)
-            toDelete = set()
-        toSearch = _toSearch
+# conversions of named constant are not folded to keep the name of constant
+_CONVERSION_OPS = (AllOps.BitsToInt, AllOps.IntToBits, AllOps.BitsAsSigned,
+                   AllOps.BitsAsUnsigned, AllOps.BitsAsVec)
+
+
+@internal
+def foldConstants(netlist) -> List["RtlSignal"]:
+    """
+    Statically evaluate hidden signals (expressions) which are constant
+    and which do not depend on any Param and replace them by its value
+    (origin of such signal becomes the Value so it is rendered as literal)
+
+    Signals are evaluated in a single epoch of static evaluation,
+    so every operator is evaluated only once even if expression
+    is shared.
+
+    :attention: has to be called after markVisibilityOfSignals
+        (constant signals without driver are resolved there)
+    :return: list of signals which were folded
+    """
+    epoch = RtlSignal._nextStaticEvalEpoch()
+    cache = {}
+    folded = []
+    for sig in netlist.signals:
+        origin = getattr(sig, "origin", None)
+        if not sig.hidden or not isinstance(origin, Operator)\
+                or not _isFoldableConst(sig, cache):
+            continue
+
+        if origin.operator in _CONVERSION_OPS:
+            o = origin.operands[0]
+            if not isinstance(o, Value) and not o.hidden:
+                continue
+
+        v = sig.staticEval(epoch)
+        if not v._isFullVld():
+            continue
+
+        sig._const = True
+        sig.origin = v
+        folded.append(sig)
+
+    return folded
 
 
 @internal
@@ -102,11 +232,117 @@ def tryToMerge(procA: HWProcess, procB: HWProcess):
     return procA
 
 
+@internal
+def _stmListStructureSignature(stms):
+    """
+    :return: signature of statements with branches in list
+        (simple statements are ignored as in
+        HdlStatement._is_mergable_statement_list)
+    """
+    if stms is None:
+        return None
+    return tuple(_stmStructureSignature(stm) for stm in stms if stm.rank)
+
+
+@internal
+def _stmStructureSignature(stm: HdlStatement):
+    """
+    :return: hashable signature of structure of the statement,
+        statements with different signature are never mergable
+        (signature equality is a necessary but not sufficient condition)
+    """
+    if isinstance(stm, IfContainer):
+        return (IfContainer,
+                id(stm.cond),
+                _stmListStructureSignature(stm.ifTrue),
+                tuple(id(c) for c, _ in stm.elIfs),
+                _stmListStructureSignature(stm.ifFalse))
+    elif isinstance(stm, SwitchContainer):
+        return (SwitchContainer,
+                id(stm.switchOn),
+                tuple(_stmListStructureSignature(stms)
+                      for _, stms in stm.cases),
+                _stmListStructureSignature(stm.default))
+    else:
+        # other statements with branches are never merged
+        return (stm.__class__, id(stm))
+
+
+@internal
+def procStructureSignature(proc: HWProcess):
+    """
+    :return: signature of process used to find candidates for merging,
+        None if process should not be merged at all
+    :note: merging does not change the signature of the process
+    """
+    if checkIfIsTooSimple(proc):
+        return None
+    return _stmListStructureSignature(proc.statements)
+
+
+@internal
+def _reduceProcessesInBucket(procs: List[HWProcess], bucket: List[int]):
+    """
+    Greedy merge of processes with same structure signature
+
+    :param procs: list of all processes, merged processes are replaced
+        by None
+    :param bucket: indexes of processes in procs with same signature
+    """
+    # {signal: indexes in bucket of processes which are sensitive on it}
+    sensIndex = {}
+    # {signal: indexes in bucket of processes which are driving it}
+    outIndex = {}
+    for i, pI in enumerate(bucket):
+        p = procs[pI]
+        for s in p.sensitivityList:
+            sensIndex.setdefault(s, []).append(i)
+        for s in p.outputs:
+            outIndex.setdefault(s, []).append(i)
+
+    def dependentProcs(p):
+        dep = set()
+        for s in p.outputs:
+            dep.update(sensIndex.get(s, ()))
+        for s in p.sensitivityList:
+            dep.update(outIndex.get(s, ()))
+        return dep
+
+    for iA, pAI in enumerate(bucket):
+        pA = procs[pAI]
+        if pA is None:
+            continue
+        dep = None
+        for iB in range(iA + 1, len(bucket)):
+            pBI = bucket[iB]
+            pB = procs[pBI]
+            if pB is None:
+                continue
+            if dep is None:
+                dep = dependentProcs(pA)
+            if iB in dep:
+                continue
+
+            try:
+                pA = tryToMerge(pA, pB)
+            except IncompatibleStructure:
+                continue
+            procs[pBI] = None
+            dep.update(dependentProcs(pB))
+
+
 @internal
 def reduceProcesses(processes):
     """
     Try to merge processes as much is possible
 
+    Processes are bucketed by rank and structure signature
+    (conditions and shape of branches), merge is tried only between
+    processes in same bucket and only if they are not dependent
+    on each other (resolved from index of outputs and sensitivity),
+    result is same as from try to merge each pair of processes
+    with same rank.
+
     :param processes: list of processes instances
     """
     # sort to make order of merging same deterministic
@@ -114,19 +350,10 @@ def reduceProcesses(processes):
     # now try to reduce processes with nearly same structure of statements into one
     # to minimize number of processes
     for _, procs in groupedby(processes, lambda p: p.rank):
-        for iA, pA in enumerate(procs):
-            if pA is None:
-                continue
-            for iB, pB in enumerate(islice(procs, iA + 1, None)):
-                if pB is None:
-                    continue
-
-                try:
-                    pA = tryToMerge(pA, pB)
-                except IncompatibleStructure:
-                    continue
-                procs[iA + 1 + iB] = None
-                # procs[iA] = pA
+        for sig, bucket in groupedby(range(len(procs)),
+                                     lambda i: procStructureSignature(procs[i])):
+            if sig is not None and len(bucket) > 1:
+                _reduceProcessesInBucket(procs, bucket)
 
         for p in procs:
             if p is not None:
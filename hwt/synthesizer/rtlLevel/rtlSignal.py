@@ -6,7 +6,7 @@ from hwt.hdl.statements import HdlStatement
 from hwt.hdl.types.hdlType import HdlType
 from hwt.hdl.value import Value
 from hwt.hdl.variables import SignalItem
-from hwt.pyUtils.uniqList import UniqList
+from hwt.pyUtils.orderedSet import OrderedSet
 from hwt.simulator.exceptions import SimException
 from hwt.synthesizer.rtlLevel.mainBases import RtlSignalBase
 from hwt.synthesizer.rtlLevel.signalUtils.exceptions import MultipleDriversErr,\
@@ -20,19 +20,27 @@ class RtlSignal(RtlSignalBase, SignalItem, RtlSignalOps):
     between statements and operators
 
     :ivar _usedOps: dictionary of used operators which can be reused
-    :ivar endpoints: UniqList of operators and statements
+        (None until first operator with this signal is created)
+    :ivar endpoints: OrderedSet of operators and statements
         for which this signal is driver.
-    :ivar drivers: UniqList of operators and statements
+    :ivar drivers: OrderedSet of operators and statements
         which can drive this signal.
     :ivar hiden: means that this signal is part of expression
         and should not be rendered
     :ivar processCrossing: means that this signal is crossing process boundary
 
     :cvar __instCntr: counter used for generating instance ids
+    :cvar __staticEvalEpochCntr: counter used for generating epochs
+        of static evaluation
     :ivar _instId: internally used only for intuitive sorting of statements
         in serialized code
+    :ivar _staticEvalEpoch: epoch of last static evaluation of this signal
     """
     __instCntr = 0
+    __staticEvalEpochCntr = 0
+    __slots__ = ["ctx", "endpoints", "drivers", "_usedOps", "hidden",
+                 "hasGenericName", "_instId", "_nopVal", "_useNopVal",
+                 "_const", "_staticEvalEpoch", "origin", "_interface"]
 
     def __init__(self, ctx, name, dtype, defVal=None, nopVal=None,
                  useNopVal=False, virtualOnly=False):
@@ -62,16 +70,17 @@ class RtlSignal(RtlSignalBase, SignalItem, RtlSignalOps):
             # and it is assigned after param is bounded to unit or interface
             ctx.signals.add(self)
 
-        # set can not be used because hash of items are changing
-        self.endpoints = UniqList()
-        self.drivers = UniqList()
-        self._usedOps = {}
+        # ordered set is used to keep order of items deterministic
+        self.endpoints = OrderedSet()
+        self.drivers = OrderedSet()
+        self._usedOps = None
         self.hidden = True
         self._instId = RtlSignal._nextInstId()
 
         self._nopVal = nopVal
         self._useNopVal = useNopVal
         self._const = False
+        self._staticEvalEpoch = None
 
     @internal
     @classmethod
@@ -83,11 +92,34 @@ class RtlSignal(RtlSignalBase, SignalItem, RtlSignalOps):
         cls.__instCntr += 1
         return i
 
-    def staticEval(self):
+    @internal
+    @classmethod
+    def _nextStaticEvalEpoch(cls):
+        """
+        Get new epoch of static evaluation
+        """
+        e = cls.__staticEvalEpochCntr
+        cls.__staticEvalEpochCntr += 1
+        return e
+
+    def staticEval(self, _epoch=None):
+        """
+        Recursively statically evaluate value of this signal
+
+        :param _epoch: epoch of evaluation, signals are evaluated only once
+            in same epoch (shared subexpressions are not evaluated
+            again), new epoch is used if None
+        """
+        if _epoch is None:
+            _epoch = RtlSignal._nextStaticEvalEpoch()
+        elif self._staticEvalEpoch == _epoch:
+            return self._val
+        self._staticEvalEpoch = _epoch
+
         # operator writes in self._val new value
         if self.drivers:
             for d in self.drivers:
-                d.staticEval()
+                d.staticEval(_epoch)
         else:
             if isinstance(self.defVal, RtlSignal):
                 self._val = self.defVal._val.staticEval()
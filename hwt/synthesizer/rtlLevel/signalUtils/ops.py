@@ -23,7 +23,9 @@ class RtlSignalOps():
     Definitions of operators and other operator functions for RtlSignal
 
     :ivar _usedOps: cache for expressions with this signal
+        (None until first operator is created)
     """
+    __slots__ = []
 
     def _auto_cast(self, toT):
         return self._dtype.auto_cast(self, toT)
@@ -45,10 +47,14 @@ class RtlSignalOps():
         """
         k = (operator, *otherOps)
         used = self._usedOps
-        try:
-            return used[k]
-        except KeyError:
-            pass
+        if used is None:
+            # most of signals are never used as operand
+            used = self._usedOps = {}
+        else:
+            try:
+                return used[k]
+            except KeyError:
+                pass
 
         o = opCreateDelegate(self, *otherOps)
 
@@ -63,7 +69,7 @@ class RtlSignalOps():
         if op_instanciated:
             k_real = (operator, *o.origin.operands[1:])
             real_o = used.get(k_real, None)
-            if real_o is not None:
+            if real_o is not None and real_o is not o:
                 # destroy newly created operator and result, because it is same
                 # as
                 ctx = self.ctx
@@ -1,10 +1,19 @@
+from typing import Optional
+
+from hwt.hdl.architecture import Architecture
+from hwt.hdl.constants import DIRECTION
+from hwt.hdl.entity import Entity
+from hwt.hdl.portItem import PortItem
+from hwt.hdl.value import Value
 from hwt.synthesizer.dummyPlatform import DummyPlatform
 from hwt.synthesizer.exceptions import IntfLvlConfErr
-from hwt.synthesizer.interfaceLevel.interfaceUtils.utils import walkParams
+from hwt.synthesizer.interfaceLevel.interfaceUtils.utils import walkParams, \
+    walkPhysInterfaces
 from hwt.synthesizer.interfaceLevel.mainBases import UnitBase
 from hwt.synthesizer.interfaceLevel.propDeclrCollector import PropDeclrCollector
 from hwt.synthesizer.interfaceLevel.unitImplHelpers import UnitImplHelpers, \
     _default_param_updater
+from hwt.synthesizer.param import Param, evalParam
 from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
 from hwt.doc_markers import internal
 
@@ -27,13 +36,17 @@ class Unit(UnitBase, PropDeclrCollector, UnitImplHelpers):
         in implementation phase (this object has to be returned
         from _toRtl of parent before it it's own objects)
     :ivar _targetPlatform: metainformations about target platform
+    :ivar _elaborationCache: dictionary {(unit class, param values,
+        target platform): unit} of already elaborated units (or None)
+        shared by all units in hierarchy during _toRtl
     """
 
     _serializeDecision = None
     _PROTECTED_NAMES = set(["_PROTECTED_NAMES", "_interfaces",
                             "_units", "_params", "_parent",
                             "_lazyLoaded", "_ctx",
-                            "_externInterf", "_targetPlatform"])
+                            "_externInterf", "_targetPlatform",
+                            "_elaborationCache"])
 
     def __init__(self):
         self._parent = None
@@ -43,10 +56,21 @@ class Unit(UnitBase, PropDeclrCollector, UnitImplHelpers):
         self._loadConfig()
 
     @internal
-    def _toRtl(self, targetPlatform: DummyPlatform):
+    def _toRtl(self, targetPlatform: DummyPlatform,
+               elaborationCache: Optional[dict]=None):
         """
         synthesize all subunits, make connections between them,
         build entity and component for this unit
+
+        :param elaborationCache: optional dictionary for
+            Unit._elaborationCache, if specified the units which
+            are not serialized because of serialization mode
+            of their class (hwt.serializer.mode) are elaborated only once
+            for each configuration, other instances reuse the ports
+            of the entity of first instance
+        :attention: units with reused elaboration do not have netlist
+            and callbacks of targetPlatform are not called for them
+            (toRtl does not reuse elaboration if the platform has any)
         """
         assert not self._wasSynthetised()
 
@@ -54,6 +78,14 @@ class Unit(UnitBase, PropDeclrCollector, UnitImplHelpers):
         if not hasattr(self, "_name"):
             self._name = self._getDefaultName()
 
+        cacheKey = self._getElaborationCacheKey(elaborationCache)
+        if cacheKey is not None:
+            template = elaborationCache.get(cacheKey, None)
+            if template is not None:
+                yield from self._reuseElaboration(template)
+                return
+        self._elaborationCache = elaborationCache
+
         for proc in targetPlatform.beforeToRtl:
             proc(self)
 
@@ -62,7 +94,7 @@ class Unit(UnitBase, PropDeclrCollector, UnitImplHelpers):
 
         # prepare subunits
         for u in self._units:
-            yield from u._toRtl(targetPlatform)
+            yield from u._toRtl(targetPlatform, elaborationCache)
 
         for u in self._units:
             subUnitName = u._name
@@ -94,6 +126,88 @@ class Unit(UnitBase, PropDeclrCollector, UnitImplHelpers):
         for proc in targetPlatform.afterToRtl:
             proc(self)
 
+        if cacheKey is not None:
+            elaborationCache[cacheKey] = self
+
+    @internal
+    def _getElaborationCacheKey(self, elaborationCache: Optional[dict]):
+        """
+        :return: key for elaborationCache or None if this unit
+            can not be reused
+        """
+        if elaborationCache is None or self._serializeDecision is None:
+            # unit is always serialized and requires its own architecture
+            return None
+
+        params = []
+        for p in self._params:
+            name = p.getName(self)
+            # param can be replaced by value in attribute of unit
+            v = getattr(self, name, p)
+            if isinstance(v, Param):
+                v = evalParam(v)
+            if isinstance(v, Value):
+                v = (v._dtype.__class__, v.val, v.vldMask)
+            params.append((name, v))
+
+        key = (self.__class__, tuple(params), self._targetPlatform)
+        try:
+            hash(key)
+        except TypeError:
+            # param value which can not be compared
+            return None
+
+        return key
+
+    @internal
+    def _reuseElaboration(self, template: "Unit"):
+        """
+        Build entity for this unit from the entity of already synthesized
+        unit with same class and configuration, the implementation
+        of this unit is not elaborated
+        """
+        self._ctx.params = self._buildParams()
+        tEnt = template._entity
+        ent = Entity(tEnt.name)
+        ent._name = self._name + "_inst"  # instance name
+        ent.__doc__ = self.__doc__
+        ent.origin = self
+        ent.generics.extend(self._ctx.params.values())
+        for name, p in template._ctx.params.items():
+            # types of ports of template are using params of template,
+            # they have to be resolved as params of this unit
+            p._registerScope(name, self)
+
+        # map physical interfaces of template to interfaces of this unit
+        intfMap = {}
+        for ti, i in zip(template._interfaces, self._interfaces):
+            if i._isExtern:
+                intfMap.update(zip(walkPhysInterfaces(ti),
+                                   walkPhysInterfaces(i)))
+
+        for tp in tEnt.ports:
+            p = PortItem(tp.name, tp.direction, tp._dtype, ent)
+            p._interface = intfMap[tp._interface]
+            if tp.direction != DIRECTION.INOUT:
+                # internal signal of template is used only to resolve
+                # the name of the port, it is not connected to this unit
+                p.registerInternSig(tp.getInternSig())
+            ent.ports.append(p)
+
+        self._entity = ent
+        for intf in self._interfaces:
+            if intf._isExtern:
+                # reverse because other components
+                # looks at this one from outside
+                intf._reverseDirection()
+
+        self._boundInterfacesToEntity(self._interfaces)
+        # architecture is empty and it is not serialized
+        self._architecture = Architecture(ent)
+        self._ctx.synthesised = True
+        yield ent
+        yield self._architecture
+
     def _wasSynthetised(self):
         return self._ctx.synthesised
 
@@ -1,22 +1,39 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import multiprocessing
 import os
 import shutil
+from typing import List, Optional, Union
 
+from hwt.doc_markers import internal
 from hwt.hdl.architecture import Architecture
 from hwt.hdl.entity import Entity
 from hwt.serializer.exceptions import SerializerException
 from hwt.serializer.generic.serializer import GenericSerializer
-from hwt.serializer.vhdl.serializer import VhdlSerializer
+from hwt.serializer.registry import getSerializer
 from hwt.pyUtils.uniqList import UniqList
 from hwt.synthesizer.unit import Unit
 from hwt.synthesizer.dummyPlatform import DummyPlatform
 
 
+@internal
+def _hasToRtlHooks(targetPlatform) -> bool:
+    """
+    :return: True if target platform has callbacks which are called
+        for each elaborated unit (units with reused elaboration
+        are not elaborated and the callbacks would not be called for them)
+    """
+    return bool(targetPlatform.beforeToRtl or
+                targetPlatform.beforeToRtlImpl or
+                targetPlatform.afterToRtlImpl or
+                targetPlatform.afterToRtl)
+
+
 def toRtl(unitOrCls: Unit, name: str=None,
-          serializer: GenericSerializer=VhdlSerializer,
-          targetPlatform=DummyPlatform(), saveTo: str=None):
+          serializer: Union[str, GenericSerializer]="vhdl",
+          targetPlatform=DummyPlatform(), saveTo: str=None,
+          workers: Optional[int]=1):
     """
     Convert unit to RTL using specified serializer
 
@@ -24,14 +41,23 @@ def toRtl(unitOrCls: Unit, name: str=None,
     :param name: name override of top unit (if is None name is derived
         form class name)
     :param serializer: serializer which should be used for to RTL conversion
+        (class or name from hwt.serializer.registry.SERIALIZERS)
     :param targetPlatform: metainformatins about target platform, distributed
         on every unit under _targetPlatform attribute
         before Unit._impl() is called
     :param saveTo: directory where files should be stored
         If None RTL is returned as string.
+    :param workers: number of processes used for serialization
+        of architectures (None means os.cpu_count()), if > 1 the unit
+        is elaborated and names are resolved first and then
+        architectures are serialized in parallel, output is same
+        as from sequential serialization
+        (requires "fork" start method of multiprocessing,
+        otherwise the serialization is sequential)
     :raturn: if saveTo returns RTL string else returns list of file names
         which were created
     """
+    serializer = getSerializer(serializer)
     if not isinstance(unitOrCls, Unit):
         u = unitOrCls()
     else:
@@ -61,7 +87,18 @@ def toRtl(unitOrCls: Unit, name: str=None,
     else:
         codeBuff = []
 
-    for obj in u._toRtl(targetPlatform):
+    if serializer.reuseElaboration and not _hasToRtlHooks(targetPlatform):
+        elaborationCache = {}
+    else:
+        elaborationCache = None
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # list of tuples (architecture, ctx, file name or index in codeBuff)
+    # for parallel serialization
+    archJobs = [] if workers > 1 else None
+
+    for obj in u._toRtl(targetPlatform, elaborationCache):
         doSerialize = serializer.serializationDecision(
             obj,
             serializedClasses,
@@ -89,6 +126,18 @@ def toRtl(unitOrCls: Unit, name: str=None,
                         " before architecture of %s"
                         % (obj.getEntityName()))
 
+                if archJobs is not None:
+                    # serialized later in parallel
+                    if createFiles:
+                        dst = os.path.join(
+                            saveTo,
+                            obj.getEntityName() + serializer.fileExtension)
+                    else:
+                        dst = len(codeBuff)
+                        codeBuff.append(None)
+                    archJobs.append((obj, ctx, dst))
+                    continue
+
                 sc = serializer.Architecture(obj, ctx)
                 if createFiles:
                     fName = obj.getEntityName() + serializer.fileExtension
@@ -126,20 +175,76 @@ def toRtl(unitOrCls: Unit, name: str=None,
                 "Object of class %s, %s was not serialized as specified" % (
                     obj.__class__.__name__, name)))
 
+    if archJobs:
+        for (_, _, dst), sc in zip(archJobs,
+                                   _serializeArchitectures(serializer,
+                                                           archJobs,
+                                                           workers)):
+            if not sc:
+                continue
+            if createFiles:
+                files.append(dst)
+                with open(dst, 'a') as f:
+                    f.write("\n")
+                    f.write(serializer.formatter(sc))
+            else:
+                codeBuff[dst] = sc
+
     if createFiles:
         return files
     else:
         return serializer.formatter(
-            "\n".join(codeBuff)
+            "\n".join(sc for sc in codeBuff if sc is not None)
         )
 
 
+# (serializer, archJobs) inherited by forked workers
+_parallelSerializationJobs = None
+
+
+@internal
+def _serializeArchitectureJob(index: int) -> str:
+    serializer, jobs = _parallelSerializationJobs
+    arch, ctx, _ = jobs[index]
+    return serializer.Architecture(arch, ctx)
+
+
+@internal
+def _serializeArchitectures(serializer: GenericSerializer, archJobs: list,
+                            workers: int) -> List[str]:
+    """
+    Serialize architectures in pool of forked processes
+
+    :note: names of entities are already resolved and serialization
+        of architecture modifies only objects in its own name scope,
+        because of this architectures can be serialized independently
+    :return: list of serialized architectures in order of archJobs
+    """
+    global _parallelSerializationJobs
+    try:
+        mpCtx = multiprocessing.get_context("fork")
+    except ValueError:
+        mpCtx = None
+
+    if mpCtx is None or len(archJobs) < 2:
+        # objects of netlist can not be send to spawned process
+        return [serializer.Architecture(arch, ctx)
+                for arch, ctx, _ in archJobs]
+
+    _parallelSerializationJobs = (serializer, archJobs)
+    try:
+        with mpCtx.Pool(min(workers, len(archJobs))) as pool:
+            return pool.map(_serializeArchitectureJob, range(len(archJobs)))
+    finally:
+        _parallelSerializationJobs = None
+
+
 def serializeAsIpcore(unit, folderName=".", name=None,
-                      serializer: GenericSerializer=VhdlSerializer,
+                      serializer: Union[str, GenericSerializer]="vhdl",
                       targetPlatform=DummyPlatform()):
     from hwt.serializer.ip_packager import IpPackager
     p = IpPackager(unit, name=name,
-                   serializer=serializer,
+                   serializer=getSerializer(serializer),
                    targetPlatform=targetPlatform)
     p.createPackage(folderName)
     return p
@@ -35,6 +35,9 @@ setup(name="hwt",
           "pyDigitalWaveTools>=0.3",  # simulator output dumping
           "ipCorePackager>=0.2"
       ],
+      extras_require={
+          "batch_sim": ["numpy"],  # hwt.simulator.batchSim
+      },
       license="MIT",
       packages=find_packages(),
       package_data={"hwt": ["*.vhd", "*.v",
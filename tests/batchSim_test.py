@@ -0,0 +1,102 @@
+import unittest
+
+from hwt.code import If
+from hwt.hdl.constants import Time
+from hwt.hdl.types.bits import Bits
+from hwt.interfaces.std import Signal, VectSignal
+from hwt.interfaces.utils import addClkRstn
+from hwt.simulator.batchSim import batchSimPrepare
+from hwt.simulator.hdlSimulator import HdlSimulator
+from hwt.simulator.shortcuts import simPrepare
+from hwt.synthesizer.param import Param
+from hwt.synthesizer.unit import Unit
+
+
+class CntrWithEn(Unit):
+    def _config(self):
+        self.DATA_WIDTH = Param(8)
+
+    def _declr(self):
+        addClkRstn(self)
+        self.en = Signal()
+        self.val = VectSignal(self.DATA_WIDTH)._m()
+
+    def _impl(self):
+        r = self._reg("r", Bits(self.DATA_WIDTH), defVal=0)
+        If(self.en,
+           r(r + 1)
+        ).Else(
+           r(r)
+        )
+        self.val(r)
+
+
+class CntrWithEn2(CntrWithEn):
+    pass
+
+
+# en for each clk period, None = invalid
+EN_STIMULI = [
+    [1, 1, 0, 1, None, None, 1, 1, 1],
+    [1, 0, 1, 1, 1, 1, 0, 1, 1],
+]
+
+
+def enDriver(u, stimuli):
+    def proc(sim):
+        # change en between clk edges
+        yield sim.wait(Time.ns)
+        for en in stimuli:
+            sim.write(en, u.en)
+            yield sim.wait(10 * Time.ns)
+
+    return proc
+
+
+def valMonitor(u, res):
+    def proc(sim):
+        yield sim.wait(6 * Time.ns)
+        while True:
+            v = sim.read(u.val)
+            res.append(int(v.val) if v._isFullVld() else None)
+            yield sim.wait(10 * Time.ns)
+
+    return proc
+
+
+class BatchSimTC(unittest.TestCase):
+    SIM_TIME = (len(EN_STIMULI[0]) + 1) * 10 * Time.ns
+
+    def simScalar(self, stimuli):
+        u = CntrWithEn()
+        _, model, procs = simPrepare(u)
+        res = []
+        procs.extend([enDriver(u, stimuli), valMonitor(u, res)])
+        HdlSimulator().simUnit(model, self.SIM_TIME, extraProcesses=procs)
+        return res
+
+    def test_invalidCondition(self):
+        units = [CntrWithEn() for _ in EN_STIMULI]
+        model, procs = batchSimPrepare(units)
+        res = [[] for _ in units]
+        for u, stimuli, r in zip(units, EN_STIMULI, res):
+            procs.extend([enDriver(u, stimuli), valMonitor(u, r)])
+        HdlSimulator().simUnit(model, self.SIM_TIME, extraProcesses=procs)
+
+        for stimuli, r in zip(EN_STIMULI, res):
+            self.assertEqual(r, self.simScalar(stimuli))
+
+    def test_differentParams(self):
+        units = [CntrWithEn() for _ in range(2)]
+        units[1].DATA_WIDTH.set(16)
+        with self.assertRaises(ValueError) as ctx:
+            batchSimPrepare(units)
+        self.assertIn(["DATA_WIDTH"], ctx.exception.args)
+
+    def test_differentClasses(self):
+        with self.assertRaises(ValueError):
+            batchSimPrepare([CntrWithEn(), CntrWithEn2()])
+
+
+if __name__ == "__main__":
+    unittest.main()
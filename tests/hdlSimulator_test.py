@@ -0,0 +1,89 @@
+import unittest
+
+from hwt.hdl.constants import Time
+from hwt.interfaces.agents.handshaked import HandshakedAgent
+from hwt.interfaces.std import Handshaked
+from hwt.interfaces.utils import addClkRstn
+from hwt.simulator.hdlSimulator import HdlSimulator
+from hwt.simulator.shortcuts import simPrepare
+from hwt.synthesizer.unit import Unit
+
+
+class GeneratorMonitorAgent(HandshakedAgent):
+    """
+    Agent with overridden monitor which is a generator
+    """
+
+    def __init__(self, intf, allowNoReset=False):
+        self.monitorTimes = []
+        super().__init__(intf, allowNoReset=allowNoReset)
+
+    def monitor(self, sim):
+        super().monitor(sim)
+        yield sim.waitOnCombUpdate()
+        self.monitorTimes.append(sim.now)
+
+
+class HandshakedWithGeneratorMonitor(Handshaked):
+    def _initSimAgent(self):
+        self._ag = GeneratorMonitorAgent(self)
+
+
+class HsWire(Unit):
+    def _declr(self):
+        addClkRstn(self)
+        self.a = Handshaked()
+        self.b = HandshakedWithGeneratorMonitor()._m()
+
+    def _impl(self):
+        self.b(self.a)
+
+
+class HdlSimulatorTC(unittest.TestCase):
+
+    def test_callbackReturningGenerator(self):
+        log = []
+
+        def proc(sim):
+            log.append(("proc", sim.now))
+            yield sim.wait(Time.ns)
+            log.append(("proc", sim.now))
+
+        def callback(sim):
+            log.append(("callback", sim.now))
+            return proc(sim)
+
+        def combCallback(sim):
+            log.append(("comb", sim.now))
+            yield sim.wait(2 * Time.ns)
+            log.append(("comb", sim.now))
+
+        def starter(sim):
+            sim.callOnCombUpdate(combCallback)
+
+        sim = HdlSimulator()
+        sim.add_process(callback)
+        sim.add_process(starter)
+        sim.run(10 * Time.ns)
+
+        self.assertEqual(log, [
+            ("callback", 0),
+            ("proc", 0),
+            ("comb", 0),
+            ("proc", Time.ns),
+            ("comb", 2 * Time.ns),
+        ])
+
+    def test_generatorAgentHook(self):
+        u = HsWire()
+        _, model, procs = simPrepare(u)
+        u.a._ag.data.extend(range(4))
+
+        HdlSimulator().simUnit(model, 100 * Time.ns, extraProcesses=procs)
+
+        self.assertEqual([int(d) for d in u.b._ag.data], list(range(4)))
+        self.assertTrue(u.b._ag.monitorTimes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from hwt.hdl.constants import Time
+from hwt.hdl.operatorDefs import AllOps
+from hwt.interfaces.std import VectSignal
+from hwt.serializer.simModel.intOps import SimModelSerializer_intOps
+from hwt.simulator.hdlSimulator import HdlSimulator
+from hwt.simulator.shortcuts import simPrepare
+from hwt.synthesizer.rtlLevel.netlist import RtlNetlist
+from hwt.synthesizer.unit import Unit
+
+
+ARITH_OPS = {
+    AllOps.ADD: lambda a, b: a + b,
+    AllOps.SUB: lambda a, b: a - b,
+    AllOps.MUL: lambda a, b: a * b,
+}
+
+
+class ArithOps(Unit):
+    """
+    Output for each arithmetic operator, with signal and with integer
+    constant as second operand
+    """
+
+    def _declr(self):
+        self.a = VectSignal(8)
+        self.b = VectSignal(8)
+        n = RtlNetlist()
+        a = n.sig("a", self.a._dtype)
+        for op, fn in ARITH_OPS.items():
+            t = fn(a, a)._dtype
+            setattr(self, "o_%s" % op.id,
+                    VectSignal(t.bit_length())._m())
+            t = fn(a, 1)._dtype
+            setattr(self, "oc_%s" % op.id,
+                    VectSignal(t.bit_length())._m())
+
+    def _impl(self):
+        for op, fn in ARITH_OPS.items():
+            getattr(self, "o_%s" % op.id)(fn(self.a, self.b))
+            getattr(self, "oc_%s" % op.id)(fn(self.a, 0x33))
+
+
+STIMULI = [(0, 0), (1, 2), (0xF0, 0x0E), (0xFF, 0xFF), (3, 250),
+           (None, 5), (7, None)]
+
+
+class IntSimModelTC(unittest.TestCase):
+
+    def test_allArithOpsCovered(self):
+        self.assertEqual(set(SimModelSerializer_intOps._intArithOps),
+                         set(ARITH_OPS))
+
+    def sim(self, serializer):
+        u = ArithOps()
+        _, model, procs = simPrepare(u, serializer=serializer)
+        outputs = [i for i in u._interfaces if i._name.startswith("o")]
+        res = []
+
+        def stimul(sim):
+            for a, b in STIMULI:
+                sim.write(a, u.a)
+                sim.write(b, u.b)
+                yield sim.wait(Time.ns)
+                for o in outputs:
+                    v = sim.read(o)
+                    res.append((a, b, o._name,
+                                v.val if v._isFullVld() else None))
+
+        procs.append(stimul)
+        HdlSimulator().simUnit(model, (len(STIMULI) + 1) * Time.ns,
+                               extraProcesses=procs)
+        return res
+
+    def test_sameAsSimModel(self):
+        self.assertEqual(self.sim("intSimModel"), self.sim("simModel"))
+
+
+if __name__ == "__main__":
+    unittest.main()